@@ -33,8 +33,10 @@ __version__ = "0.6.5"
 from . import examples  # noqa
 from . import quadrature  # noqa
 from . import random_fields  # noqa
+from .convolution import DiscreteContinuousConv2d  # noqa
 from .convolution import DiscreteContinuousConvS2  # noqa
 from .convolution import DiscreteContinuousConvTransposeS2  # noqa
+from .convolution import MultiResolutionDiscreteContinuousConvS2  # noqa
 from .sht import InverseRealSHT  # noqa
 from .sht import InverseRealVectorSHT  # noqa
 from .sht import RealSHT  # noqa
@@ -29,6 +29,15 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 #
 
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Callable
+from typing import Optional
+from typing import Tuple
+
+import numpy as np
 import paddle
 import triton
 import triton.language as tl
@@ -39,6 +48,216 @@ BLOCK_SIZE_BATCH = 4
 BLOCK_SIZE_NZ = 8
 BLOCK_SIZE_POUT = 8
 
+# candidate block sizes for the autotuning of the triton kernels
+AUTOTUNE_BLOCK_SIZES_BATCH = [1, 2, 4, 8, 16]
+AUTOTUNE_BLOCK_SIZES_NZ = [4, 8, 16, 32]
+AUTOTUNE_BLOCK_SIZES_POUT = [8, 16, 32, 64]
+
+# maximum number of elements a single program may process per iteration
+AUTOTUNE_MAX_BLOCK_ELEMENTS = 4096
+
+# maximum number of elements of the gathered input per chunk in the fused contraction
+MAX_CHUNK_ELEMENTS = 2**24
+
+
+def _get_accumulation_dtype(dtype):
+    """
+    Returns the dtype in which the contractions accumulate. Low precision inputs are accumulated in float32.
+    """
+    return paddle.float64 if dtype == paddle.float64 else paddle.float32
+
+
+def _to_dtype(x: paddle.Tensor, dtype):
+    return x if x.dtype == dtype else x.astype(dtype)
+
+
+def _next_power_of_2(n: int):
+    return 1 << max(int(n) - 1, 0).bit_length()
+
+
+def _get_device_name():
+    try:
+        return paddle.device.cuda.get_device_name()
+    except Exception:
+        return "cpu"
+
+
+def _benchmark_launch(launch: Callable, out: paddle.Tensor, block_sizes):
+    """
+    Times a kernel launch with the given block sizes. The launch writes to a scratch copy of the output, as the kernels
+    accumulate into it.
+    """
+    scratch = paddle.zeros_like(out)
+    return triton.testing.do_bench(lambda: launch(scratch, block_sizes))
+
+
+class _DiscoAutotuner:
+    """
+    Selects the block sizes of the DISCO triton kernels for each problem shape. Shapes are bucketed to powers of two
+    and the winning configurations are cached in memory and on disk, such that tuning only happens once per bucket.
+
+    The mode determines how candidates are ranked: "benchmark" times them with the benchmark function passed by the
+    caller, "interpret" ranks them with a cost model of the kernels, which does not require a GPU, and "heuristic"
+    skips tuning altogether. If benchmarking is not possible or fails, the heuristic configuration is used.
+    """
+
+    def __init__(
+        self,
+        cache_path: Optional[str] = None,
+        mode: Optional[str] = None,
+        num_parallel_programs: Optional[int] = None,
+    ):
+        if cache_path is None:
+            cache_dir = os.environ.get(
+                "PADDLE_HARMONICS_CACHE_DIR",
+                os.path.join(os.path.expanduser("~"), ".cache", "paddle_harmonics"),
+            )
+            cache_path = os.path.join(cache_dir, "disco_autotune.json")
+        if mode is None:
+            mode = os.environ.get("PADDLE_HARMONICS_DISCO_AUTOTUNE", "benchmark")
+        if mode not in ["benchmark", "interpret", "heuristic"]:
+            raise ValueError(f"Unknown autotuning mode {mode}.")
+
+        self.cache_path = cache_path
+        self.mode = mode
+        # number of programs which run concurrently, used by the cost model
+        self.num_parallel_programs = num_parallel_programs or 128
+        self._cache = None
+
+    @staticmethod
+    def make_key(kernel: str, batch_size: int, nnz: int, nlon_out: int, num_rows: int, device: str):
+        return (
+            f"{kernel}:{device}:b{_next_power_of_2(batch_size)}:nz{_next_power_of_2(nnz)}"
+            f":p{_next_power_of_2(nlon_out)}:r{_next_power_of_2(num_rows)}"
+        )
+
+    @staticmethod
+    def candidates(batch_size: int, nlon_out: int):
+        """
+        Enumerates the candidate configurations. Blocks which exceed the batch size or the number of output longitudes
+        only add masked lanes and are therefore skipped.
+        """
+        configs = []
+        for block_size_batch in AUTOTUNE_BLOCK_SIZES_BATCH:
+            if block_size_batch > max(_next_power_of_2(batch_size), AUTOTUNE_BLOCK_SIZES_BATCH[0]):
+                continue
+            for block_size_pout in AUTOTUNE_BLOCK_SIZES_POUT:
+                if block_size_pout > max(_next_power_of_2(nlon_out), AUTOTUNE_BLOCK_SIZES_POUT[0]):
+                    continue
+                for block_size_nz in AUTOTUNE_BLOCK_SIZES_NZ:
+                    if (
+                        block_size_batch * block_size_nz * block_size_pout
+                        <= AUTOTUNE_MAX_BLOCK_ELEMENTS
+                    ):
+                        configs.append((block_size_batch, block_size_nz, block_size_pout))
+        return configs
+
+    @staticmethod
+    def heuristic(batch_size: int, nnz: int, nlon_out: int, num_rows: int = 1):
+        """
+        Default configuration, which widens the longitude block for large grids to obtain coalesced accesses.
+        """
+        block_size_batch = min(BLOCK_SIZE_BATCH, _next_power_of_2(batch_size))
+        block_size_pout = min(max(_next_power_of_2(nlon_out), BLOCK_SIZE_POUT), 32)
+        return (block_size_batch, BLOCK_SIZE_NZ, block_size_pout)
+
+    def cost_model(self, block_sizes, batch_size: int, nnz: int, nlon_out: int, num_rows: int = 1):
+        """
+        Estimates the runtime of a configuration in units of processed elements. Each program iterates over the
+        non-zeros of its row and processes a full block per iteration, including masked lanes, at a fixed overhead
+        per iteration. Memory accesses along the longitudes are counted in cache lines of 32 elements, which penalizes
+        narrow longitude blocks. Programs run in waves of num_parallel_programs.
+        """
+        block_size_batch, block_size_nz, block_size_pout = block_sizes
+        num_programs = (
+            triton.cdiv(batch_size, block_size_batch)
+            * num_rows
+            * triton.cdiv(nlon_out, block_size_pout)
+        )
+        num_iters = triton.cdiv(triton.cdiv(nnz, num_rows), block_size_nz)
+        num_waves = triton.cdiv(num_programs, self.num_parallel_programs)
+        iter_cost = (
+            block_size_batch * block_size_nz * block_size_pout
+            + block_size_batch * block_size_nz * triton.cdiv(block_size_pout, 32) * 32
+            + 64
+        )
+        return float(num_waves * num_iters * iter_cost)
+
+    def _load_cache(self):
+        if self._cache is None:
+            self._cache = {}
+            if self.cache_path is not None and os.path.isfile(self.cache_path):
+                try:
+                    with open(self.cache_path, "r") as f:
+                        self._cache = json.load(f)
+                except (OSError, ValueError):
+                    self._cache = {}
+        return self._cache
+
+    def _save_cache(self):
+        if self.cache_path is None:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.cache_path) or ".", exist_ok=True)
+            tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(self._cache, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.cache_path)
+        except OSError:
+            pass
+
+    def get_block_sizes(
+        self,
+        kernel: str,
+        batch_size: int,
+        nnz: int,
+        nlon_out: int,
+        num_rows: int = 1,
+        benchmark: Optional[Callable] = None,
+        device: Optional[str] = None,
+    ):
+        """
+        Returns the block sizes (batch, nz, pout) for the given kernel and problem shape.
+        """
+        if self.mode == "heuristic":
+            return self.heuristic(batch_size, nnz, nlon_out, num_rows)
+
+        if device is None:
+            device = "interpret" if self.mode == "interpret" else _get_device_name()
+        key = self.make_key(kernel, batch_size, nnz, nlon_out, num_rows, device)
+
+        cache = self._load_cache()
+        if key in cache:
+            return tuple(cache[key])
+
+        if self.mode == "interpret":
+            timings = {
+                config: self.cost_model(config, batch_size, nnz, nlon_out, num_rows)
+                for config in self.candidates(batch_size, nlon_out)
+            }
+        elif benchmark is not None:
+            timings = {}
+            for config in self.candidates(batch_size, nlon_out):
+                # configurations which fail to compile or launch are skipped
+                try:
+                    timings[config] = float(benchmark(config))
+                except Exception:
+                    continue
+        else:
+            timings = {}
+
+        if len(timings) == 0:
+            return self.heuristic(batch_size, nnz, nlon_out, num_rows)
+
+        best = min(timings, key=timings.get)
+        cache[key] = list(best)
+        self._save_cache()
+
+        return best
+
+
+_DISCO_AUTOTUNER = _DiscoAutotuner()
+
 
 @triton.jit
 def _disco_s2_contraction_kernel(
@@ -134,15 +353,16 @@ def _disco_s2_contraction_kernel(
         )
 
         # do the actual computation. Backward is essentially just the same operation with swapped tensors.
+        # Products are formed in the dtype of the output buffer, which holds the accumulation precision.
         if not backward:
-            x = tl.load(x_ptrs, mask=mask, other=0.0)
-            y = vals[None, :, None] * x
+            x = tl.load(x_ptrs, mask=mask, other=0.0).to(y_ptr.dtype.element_ty)
+            y = vals[None, :, None].to(y_ptr.dtype.element_ty) * x
 
             # store it to the output array
             tl.atomic_add(y_ptrs, y, mask=mask)
         else:
-            y = tl.load(y_ptrs, mask=mask, other=0.0)
-            x = vals[None, :, None] * y
+            y = tl.load(y_ptrs, mask=mask, other=0.0).to(x_ptr.dtype.element_ty)
+            x = vals[None, :, None].to(x_ptr.dtype.element_ty) * y
 
             # store it to the output array
             tl.atomic_add(x_ptrs, x, mask=mask)
@@ -184,50 +404,67 @@ def _disco_s2_contraction_fwd(x: paddle.Tensor, psi: paddle.Tensor, nlon_out: in
     # to simplify things, we merge batch and channel dimensions
     x = x.reshape(batch_size * n_chans, nlat_in, nlon_in)
 
-    # prepare the output tensor
-    y = paddle.zeros(shape=[batch_size * n_chans, kernel_size, nlat_out, nlon_out], dtype=x.dtype)
-
-    # determine the grid for the computation
-    grid = (
-        triton.cdiv(batch_size * n_chans, BLOCK_SIZE_BATCH),
-        1,
-        triton.cdiv(nlon_out, BLOCK_SIZE_POUT),
+    # prepare the output tensor, which accumulates in at least single precision
+    y = paddle.zeros(
+        shape=[batch_size * n_chans, kernel_size, nlat_out, nlon_out],
+        dtype=_get_accumulation_dtype(x.dtype),
     )
 
-    # launch the kernel
-    _disco_s2_contraction_kernel[grid](
-        psi.indices(),
-        psi.values(),
-        nnz,
-        psi.indices().get_strides()[-2],
-        psi.indices().get_strides()[-1],
-        psi.values().get_strides()[-1],
-        x,
+    def _launch(out, block_sizes):
+        block_size_batch, block_size_nz, block_size_pout = block_sizes
+
+        # determine the grid for the computation
+        grid = (
+            triton.cdiv(batch_size * n_chans, block_size_batch),
+            1,
+            triton.cdiv(nlon_out, block_size_pout),
+        )
+
+        # launch the kernel
+        _disco_s2_contraction_kernel[grid](
+            psi.indices(),
+            psi.values(),
+            nnz,
+            psi.indices().get_strides()[-2],
+            psi.indices().get_strides()[-1],
+            psi.values().get_strides()[-1],
+            x,
+            batch_size * n_chans,
+            nlat_in,
+            nlon_in,
+            x.get_strides()[0],
+            x.get_strides()[-2],
+            x.get_strides()[-1],
+            out,
+            kernel_size,
+            nlat_out,
+            nlon_out,
+            out.get_strides()[0],
+            out.get_strides()[1],
+            out.get_strides()[-2],
+            out.get_strides()[-1],
+            pscale,
+            False,
+            block_size_batch,
+            block_size_nz,
+            block_size_pout,
+        )
+
+    # select the block sizes for this problem shape and launch the kernel
+    block_sizes = _DISCO_AUTOTUNER.get_block_sizes(
+        "fwd",
         batch_size * n_chans,
-        nlat_in,
-        nlon_in,
-        x.get_strides()[0],
-        x.get_strides()[-2],
-        x.get_strides()[-1],
-        y,
-        kernel_size,
-        nlat_out,
+        nnz,
         nlon_out,
-        y.get_strides()[0],
-        y.get_strides()[1],
-        y.get_strides()[-2],
-        y.get_strides()[-1],
-        pscale,
-        False,
-        BLOCK_SIZE_BATCH,
-        BLOCK_SIZE_NZ,
-        BLOCK_SIZE_POUT,
+        num_rows=1,
+        benchmark=partial(_benchmark_launch, _launch, y),
     )
+    _launch(y, block_sizes)
 
     # reshape y back to expose the correct dimensions
     y = y.reshape(batch_size, n_chans, kernel_size, nlat_out, nlon_out)
 
-    return y
+    return _to_dtype(y, x.dtype)
 
 
 def _disco_s2_contraction_bwd(grad_y: paddle.Tensor, psi: paddle.Tensor, nlon_in: int):
@@ -267,49 +504,248 @@ def _disco_s2_contraction_bwd(grad_y: paddle.Tensor, psi: paddle.Tensor, nlon_in
     # to simplify things, we merge batch and channel dimensions
     grad_y = grad_y.reshape(batch_size * n_chans, kernel_size, nlat_out, nlon_out)
 
-    # prepare the output tensor
-    grad_x = paddle.zeros(shape=[batch_size * n_chans, nlat_in, nlon_in], dtype=grad_y.dtype)
-
-    # determine the grid for the computation
-    grid = (
-        triton.cdiv(batch_size * n_chans, BLOCK_SIZE_BATCH),
-        1,
-        triton.cdiv(nlon_out, BLOCK_SIZE_POUT),
+    # prepare the output tensor, which accumulates in at least single precision
+    grad_x = paddle.zeros(
+        shape=[batch_size * n_chans, nlat_in, nlon_in], dtype=_get_accumulation_dtype(grad_y.dtype)
     )
 
-    # launch the kernel
-    _disco_s2_contraction_kernel[grid](
-        psi.indices(),
-        psi.values(),
-        nnz,
-        psi.indices().get_strides()[-2],
-        psi.indices().get_strides()[-1],
-        psi.values().get_strides()[-1],
-        grad_x,
+    def _launch(out, block_sizes):
+        block_size_batch, block_size_nz, block_size_pout = block_sizes
+
+        # determine the grid for the computation
+        grid = (
+            triton.cdiv(batch_size * n_chans, block_size_batch),
+            1,
+            triton.cdiv(nlon_out, block_size_pout),
+        )
+
+        # launch the kernel
+        _disco_s2_contraction_kernel[grid](
+            psi.indices(),
+            psi.values(),
+            nnz,
+            psi.indices().get_strides()[-2],
+            psi.indices().get_strides()[-1],
+            psi.values().get_strides()[-1],
+            out,
+            batch_size * n_chans,
+            nlat_in,
+            nlon_in,
+            out.get_strides()[0],
+            out.get_strides()[-2],
+            out.get_strides()[-1],
+            grad_y,
+            kernel_size,
+            nlat_out,
+            nlon_out,
+            grad_y.get_strides()[0],
+            grad_y.get_strides()[1],
+            grad_y.get_strides()[-2],
+            grad_y.get_strides()[-1],
+            pscale,
+            True,
+            block_size_batch,
+            block_size_nz,
+            block_size_pout,
+        )
+
+    # select the block sizes for this problem shape and launch the kernel
+    block_sizes = _DISCO_AUTOTUNER.get_block_sizes(
+        "bwd",
         batch_size * n_chans,
-        nlat_in,
-        nlon_in,
-        grad_x.get_strides()[0],
-        grad_x.get_strides()[-2],
-        grad_x.get_strides()[-1],
-        grad_y,
-        kernel_size,
-        nlat_out,
+        nnz,
         nlon_out,
-        grad_y.get_strides()[0],
-        grad_y.get_strides()[1],
-        grad_y.get_strides()[-2],
-        grad_y.get_strides()[-1],
-        pscale,
-        True,
-        BLOCK_SIZE_BATCH,
-        BLOCK_SIZE_NZ,
-        BLOCK_SIZE_POUT,
+        num_rows=1,
+        benchmark=partial(_benchmark_launch, _launch, grad_x),
     )
+    _launch(grad_x, block_sizes)
 
     # reshape y back to expose the correct dimensions
     grad_x = grad_x.reshape(batch_size, n_chans, nlat_in, nlon_in)
 
+    return _to_dtype(grad_x, grad_y.dtype)
+
+
+@triton.jit
+def _disco_s2_contraction_bwd_gather_kernel(
+    ptr_ptr,
+    inz_ptr,
+    vnz_ptr,
+    inz_stride_ii,
+    inz_stride_nz,
+    vnz_stride,
+    y_ptr,
+    batch_size,
+    nlat_out,
+    nlon_out,
+    y_stride_b,
+    y_stride_f,
+    y_stride_t,
+    y_stride_p,
+    x_ptr,
+    nlat_in,
+    nlon_in,
+    x_stride_b,
+    x_stride_t,
+    x_stride_p,
+    pscale,
+    BLOCK_SIZE_BATCH: tl.constexpr,
+    BLOCK_SIZE_NZ: tl.constexpr,
+    BLOCK_SIZE_POUT: tl.constexpr,
+):
+    """
+    Kernel for the backward pass of the S2 DISCO contraction, which gathers the gradient with respect to the input
+    using the transposed psi. Each program owns a block of input longitudes pin = r + j * pscale of a single input
+    latitude and residue r, reduces all contributions in a fixed order and writes them once, without atomics.
+    """
+
+    pid_batch = tl.program_id(0)
+    pid_row = tl.program_id(1)
+    pid_pout = tl.program_id(2)
+
+    # the rows of the transposed psi enumerate input latitudes and longitude residues
+    tin = pid_row // pscale
+    r = pid_row % pscale
+
+    j = pid_pout * BLOCK_SIZE_POUT + tl.arange(0, BLOCK_SIZE_POUT)
+    b = pid_batch * BLOCK_SIZE_BATCH + tl.arange(0, BLOCK_SIZE_BATCH)
+    iinz = tl.arange(0, BLOCK_SIZE_NZ)
+
+    start = tl.load(ptr_ptr + pid_row)
+    end = tl.load(ptr_ptr + pid_row + 1)
+
+    acc = tl.zeros([BLOCK_SIZE_BATCH, BLOCK_SIZE_POUT], dtype=tl.float32)
+
+    # iterate in a blocked fashion over the non-zero entries of this row
+    for offs_nz in range(start, end, BLOCK_SIZE_NZ):
+        nz_mask = offs_nz + iinz < end
+        fout = tl.load(inz_ptr + (offs_nz + iinz) * inz_stride_nz, mask=nz_mask, other=0)
+        tout = tl.load(
+            inz_ptr + (offs_nz + iinz) * inz_stride_nz + inz_stride_ii, mask=nz_mask, other=0
+        )
+        qnz = tl.load(
+            inz_ptr + (offs_nz + iinz) * inz_stride_nz + 2 * inz_stride_ii, mask=nz_mask, other=0
+        )
+        vals = tl.load(vnz_ptr + (offs_nz + iinz) * vnz_stride, mask=nz_mask, other=0.0)
+
+        # the output longitude which reads the input longitude pin through this non-zero
+        pout = (j[None, None, :] - qnz[None, :, None] + nlon_out) % nlon_out
+
+        y_ptrs = (
+            y_ptr
+            + fout[None, :, None] * y_stride_f
+            + tout[None, :, None] * y_stride_t
+            + pout * y_stride_p
+            + b[:, None, None] * y_stride_b
+        )
+        mask = ((b[:, None, None] < batch_size) and nz_mask[None, :, None]) and (
+            j[None, None, :] < nlon_out
+        )
+
+        y = tl.load(y_ptrs, mask=mask, other=0.0).to(tl.float32)
+        acc += tl.sum(vals[None, :, None].to(tl.float32) * y, axis=1)
+
+    pin = r + j * pscale
+    x_ptrs = x_ptr + tin * x_stride_t + pin[None, :] * x_stride_p + b[:, None] * x_stride_b
+    tl.store(
+        x_ptrs,
+        acc.to(x_ptr.dtype.element_ty),
+        mask=(b[:, None] < batch_size) and (j[None, :] < nlon_out),
+    )
+
+
+def _disco_s2_contraction_bwd_deterministic(
+    grad_y: paddle.Tensor,
+    psi_t_ptr: paddle.Tensor,
+    psi_t_idx: paddle.Tensor,
+    psi_t_vals: paddle.Tensor,
+    nlat_in: int,
+    nlon_in: int,
+):
+    """
+    Deterministic backward pass for the triton implementation of the DISCO convolution on the sphere. Uses the
+    transposed psi to gather the gradient, rather than scattering it with atomics.
+
+    Parameters
+    ----------
+    grad_y: paddle.Tensor
+        Input gradient on the sphere. Expects a tensor of shape batch_size x channels x kernel_size x nlat_out x nlon_out.
+    psi_t_ptr: paddle.Tensor
+        Row pointers of the transposed psi as returned by _disco_s2_transpose_index.
+    psi_t_idx: paddle.Tensor
+        Indices of the transposed psi as returned by _disco_s2_transpose_index.
+    psi_t_vals: paddle.Tensor
+        Values of the transposed psi.
+    nlat_in: int
+        Number of latitude points the input used.
+    nlon_in: int
+        Number of longitude points the input used.
+    """
+
+    assert len(grad_y.shape) == 5
+
+    batch_size, n_chans, kernel_size, nlat_out, nlon_out = grad_y.shape
+    assert nlon_in % nlon_out == 0
+    pscale = nlon_in // nlon_out
+    assert psi_t_ptr.shape[0] == nlat_in * pscale + 1
+
+    # to simplify things, we merge batch and channel dimensions
+    grad_y = grad_y.reshape(batch_size * n_chans, kernel_size, nlat_out, nlon_out)
+
+    # every entry of the output is written exactly once, so it does not need to be initialized
+    grad_x = paddle.empty(shape=[batch_size * n_chans, nlat_in, nlon_in], dtype=grad_y.dtype)
+
+    def _launch(out, block_sizes):
+        block_size_batch, block_size_nz, block_size_pout = block_sizes
+
+        # determine the grid for the computation
+        grid = (
+            triton.cdiv(batch_size * n_chans, block_size_batch),
+            nlat_in * pscale,
+            triton.cdiv(nlon_out, block_size_pout),
+        )
+
+        # launch the kernel
+        _disco_s2_contraction_bwd_gather_kernel[grid](
+            psi_t_ptr,
+            psi_t_idx,
+            psi_t_vals,
+            psi_t_idx.get_strides()[-2],
+            psi_t_idx.get_strides()[-1],
+            psi_t_vals.get_strides()[-1],
+            grad_y,
+            batch_size * n_chans,
+            nlat_out,
+            nlon_out,
+            grad_y.get_strides()[0],
+            grad_y.get_strides()[1],
+            grad_y.get_strides()[-2],
+            grad_y.get_strides()[-1],
+            out,
+            nlat_in,
+            nlon_in,
+            out.get_strides()[0],
+            out.get_strides()[-2],
+            out.get_strides()[-1],
+            pscale,
+            block_size_batch,
+            block_size_nz,
+            block_size_pout,
+        )
+
+    # select the block sizes for this problem shape and launch the kernel
+    block_sizes = _DISCO_AUTOTUNER.get_block_sizes(
+        "bwd_gather",
+        batch_size * n_chans,
+        psi_t_idx.shape[-1],
+        nlon_out,
+        num_rows=nlat_in * pscale,
+        benchmark=partial(_benchmark_launch, _launch, grad_x),
+    )
+    _launch(grad_x, block_sizes)
+
+    grad_x = grad_x.reshape(batch_size, n_chans, nlat_in, nlon_in)
+
     return grad_x
 
 
@@ -357,6 +793,38 @@ class _DiscoS2TransposeContractionTriton(paddle.autograd.PyLayer):
         return grad_input, None
 
 
+class _DiscoS2ContractionTritonDeterministic(paddle.autograd.PyLayer):
+    """
+    Helper function to make the triton implementation with the deterministic backward pass work with Paddle autograd
+    functionality
+    """
+
+    @staticmethod
+    def forward(
+        ctx,
+        x: paddle.Tensor,
+        psi: paddle.Tensor,
+        psi_t_ptr: paddle.Tensor,
+        psi_t_idx: paddle.Tensor,
+        psi_t_vals: paddle.Tensor,
+        nlon_out: int,
+    ):
+        ctx.save_for_backward(psi_t_ptr, psi_t_idx, psi_t_vals)
+        ctx.nlat_in = x.shape[-2]
+        ctx.nlon_in = x.shape[-1]
+
+        return _disco_s2_contraction_fwd(x, psi, nlon_out)
+
+    @staticmethod
+    def backward(ctx, grad_output):
+        psi_t_ptr, psi_t_idx, psi_t_vals = ctx.saved_tensor()
+        grad_input = _disco_s2_contraction_bwd_deterministic(
+            grad_output, psi_t_ptr, psi_t_idx, psi_t_vals, ctx.nlat_in, ctx.nlon_in
+        )
+
+        return grad_input, None, None, None, None
+
+
 def _disco_s2_contraction_triton(x: paddle.Tensor, psi: paddle.Tensor, nlon_out: int):
     return _DiscoS2ContractionTriton.apply(x, psi, nlon_out)
 
@@ -365,6 +833,19 @@ def _disco_s2_transpose_contraction_triton(x: paddle.Tensor, psi: paddle.Tensor,
     return _DiscoS2TransposeContractionTriton.apply(x, psi, nlon_out)
 
 
+def _disco_s2_contraction_triton_deterministic(
+    x: paddle.Tensor,
+    psi: paddle.Tensor,
+    psi_t_ptr: paddle.Tensor,
+    psi_t_idx: paddle.Tensor,
+    psi_t_vals: paddle.Tensor,
+    nlon_out: int,
+):
+    return _DiscoS2ContractionTritonDeterministic.apply(
+        x, psi, psi_t_ptr, psi_t_idx, psi_t_vals, nlon_out
+    )
+
+
 def _disco_s2_contraction_paddle(x: paddle.Tensor, psi: paddle.Tensor, nlon_out: int):
     """
     Reference implementation of the custom contraction as described in [1]. This requires repeated
@@ -457,3 +938,1185 @@ def _disco_s2_transpose_contraction_paddle(x: paddle.Tensor, psi: paddle.Tensor,
     y = y.sum(axis=0).transpose([2, 1, 0]).reshape(batch_size, n_chans, nlat_out, nlon_out)
 
     return y
+
+
+def _disco_s2_transpose_index(psi_idx: paddle.Tensor, nlat_in: int, nlon_in: int, nlon_out: int):
+    """
+    Computes the transposed psi used by the deterministic backward pass in CSR format. The rows enumerate the input
+    latitudes tin and longitude residues r = pin % pscale, which are the only input longitudes a non-zero can reach.
+    For each non-zero, the kernel index, the output latitude and the input longitude offset pin // pscale are kept.
+    Returns the row pointers, the indices of shape 3 x nnz and the permutation which has to be applied to the values.
+    """
+
+    assert nlon_in % nlon_out == 0
+    pscale = nlon_in // nlon_out
+
+    ker, tout, col = psi_idx[0], psi_idx[1], psi_idx[2]
+    tin = col // nlon_in
+    pin = col % nlon_in
+
+    rows = tin * pscale + pin % pscale
+    perm = paddle.argsort(rows, stable=True)
+
+    counts = np.bincount(rows.numpy(), minlength=nlat_in * pscale)
+    psi_t_ptr = paddle.to_tensor(np.concatenate([[0], np.cumsum(counts)]), dtype="int64")
+    psi_t_idx = paddle.stack([ker, tout, pin // pscale], axis=0)
+    psi_t_idx = paddle.gather(psi_t_idx, perm, axis=1)
+
+    return psi_t_ptr, psi_t_idx, perm
+
+
+def _disco_s2_contraction_bwd_gather_paddle(
+    grad_y: paddle.Tensor,
+    psi_t_ptr: paddle.Tensor,
+    psi_t_idx: paddle.Tensor,
+    psi_t_vals: paddle.Tensor,
+    nlat_in: int,
+    nlon_in: int,
+):
+    """
+    Reference implementation of the deterministic backward pass, which follows the gather formulation of the triton
+    kernel. The contributions to each row of the transposed psi are reduced with a segment sum.
+    """
+
+    assert len(grad_y.shape) == 5
+
+    batch_size, n_chans, _, nlat_out, nlon_out = grad_y.shape
+    pscale = nlon_in // nlon_out
+    nrows = nlat_in * pscale
+
+    grad_y_cl = grad_y.reshape([batch_size * n_chans, -1]).transpose([1, 0])
+
+    ker, tout, qnz = psi_t_idx[0], psi_t_idx[1], psi_t_idx[2]
+    row_ids = np.repeat(np.arange(nrows), np.diff(psi_t_ptr.numpy()))
+    j = paddle.arange(nlon_out, dtype=qnz.dtype)
+
+    acc_dtype = _get_accumulation_dtype(grad_y.dtype)
+    psi_t_vals = _to_dtype(psi_t_vals, acc_dtype)
+
+    grad_x = paddle.zeros([nrows, nlon_out, batch_size * n_chans], dtype=acc_dtype)
+
+    max_nnz = max(1, MAX_CHUNK_ELEMENTS // (nlon_out * batch_size * n_chans))
+    for r0, _, s, e in _get_latitude_chunks(_get_latitude_offsets(row_ids, nrows), max_nnz):
+        if s == e:
+            continue
+        pout = (j - qnz[s:e].unsqueeze(-1)) % nlon_out
+        cols = ((ker[s:e] * nlat_out + tout[s:e]) * nlon_out).unsqueeze(-1) + pout
+        gy = _to_dtype(paddle.gather(grad_y_cl, cols.flatten(), axis=0), acc_dtype)
+        gy = gy.reshape([e - s, nlon_out, batch_size * n_chans]) * psi_t_vals[s:e].reshape(
+            [-1, 1, 1]
+        )
+        seg = paddle.geometric.segment_sum(gy, paddle.to_tensor(row_ids[s:e] - r0))
+        grad_x[r0 : r0 + seg.shape[0]] = seg
+
+    # the rows hold the input longitudes pin = r + j * pscale
+    grad_x = grad_x.reshape([nlat_in, pscale, nlon_out, batch_size * n_chans])
+    grad_x = grad_x.transpose([3, 0, 2, 1]).reshape([batch_size, n_chans, nlat_in, nlon_in])
+
+    return _to_dtype(grad_x, grad_y.dtype)
+
+
+def _get_latitude_offsets(tout: np.ndarray, nlat_out: int):
+    """
+    Helper routine which returns the offsets of the output latitudes in the non-zero arrays of psi, such that the
+    non-zeros of output latitude t are [offsets[t], offsets[t + 1]). Expects the non-zeros to be sorted by output
+    latitude. As the offsets only depend on psi, the layers compute them once along with their basis.
+    """
+    return np.concatenate([[0], np.cumsum(np.bincount(tout, minlength=nlat_out))])
+
+
+def _get_latitude_chunks(offsets: np.ndarray, max_nnz: int):
+    """
+    Helper routine which partitions the output latitudes into contiguous chunks [t0, t1), such that each chunk contains
+    at most max_nnz non-zero entries of psi. Expects the offsets of the output latitudes as returned by
+    _get_latitude_offsets and returns the chunks together with the corresponding ranges [s, e) in the non-zero arrays.
+    """
+
+    nlat_out = len(offsets) - 1
+
+    chunks = []
+    t0 = 0
+    while t0 < nlat_out:
+        # always take at least one latitude, then add more until the budget is exceeded
+        t1 = t0 + 1
+        while t1 < nlat_out and offsets[t1 + 1] - offsets[t0] <= max_nnz:
+            t1 += 1
+        chunks.append((t0, t1, int(offsets[t0]), int(offsets[t1])))
+        t0 = t1
+
+    return chunks
+
+
+def _disco_s2_fused_gather(x_cl, tin, pin, nlon_in, nlon_out, pscale, s, e):
+    """
+    Gathers the shifted input values x[tin, (pin + pout * pscale) % nlon_in] for the non-zeros in [s, e) and all output
+    longitudes. x_cl is expected in channels-last layout (nlat_in * nlon_in, batch_size * n_chans).
+    """
+    pshift = paddle.arange(nlon_out, dtype=pin.dtype) * pscale
+    cols = tin[s:e].unsqueeze(-1) * nlon_in + (pin[s:e].unsqueeze(-1) + pshift) % nlon_in
+    xg = paddle.gather(x_cl, cols.flatten(), axis=0)
+    return cols, xg.reshape([e - s, nlon_out, x_cl.shape[-1]])
+
+
+def _disco_s2_contraction_fused_fwd(
+    x: paddle.Tensor,
+    weight: paddle.Tensor,
+    psi_idx: paddle.Tensor,
+    psi_vals: paddle.Tensor,
+    nlat_out: int,
+    nlon_out: int,
+    groups: int,
+    lat_offsets: Optional[np.ndarray] = None,
+):
+    """
+    Forward pass of the fused DISCO convolution. The sparse contraction with psi and the contraction with the weights
+    are carried out chunk by chunk along the output latitudes, such that the intermediate with the kernel dimension
+    only ever exists for a single chunk.
+
+    Parameters
+    ----------
+    x: paddle.Tensor
+        Input signal on the sphere. Expects a tensor of shape batch_size x n_chans x nlat_in x nlon_in.
+    weight: paddle.Tensor
+        Weight tensor of shape out_chans x (n_chans // groups) x kernel_size.
+    psi_idx: paddle.Tensor
+        Indices of the pre-computed convolution tensor of shape 3 x nnz. Expects the non-zeros to be sorted by output latitude.
+    psi_vals: paddle.Tensor
+        Values of the pre-computed convolution tensor, including the quadrature weights.
+    nlat_out: int
+        Number of latitude points the output should have.
+    nlon_out: int
+        Number of longitude points the output should have.
+    groups: int
+        Number of groups of the convolution.
+    lat_offsets: Optional[np.ndarray]
+        Offsets of the output latitudes in the non-zero arrays as returned by _get_latitude_offsets. Computed from
+        the indices if not given, which requires a copy to the host.
+    """
+
+    assert len(x.shape) == 4
+    assert len(weight.shape) == 3
+
+    batch_size, n_chans, nlat_in, nlon_in = x.shape
+    out_chans, groupsize, kernel_size = weight.shape
+
+    assert n_chans == groups * groupsize
+    assert nlon_in % nlon_out == 0
+    pscale = nlon_in // nlon_out
+
+    # the input is gathered in its own dtype, but accumulated in higher precision
+    acc_dtype = _get_accumulation_dtype(x.dtype)
+
+    # channels-last layout for the gather
+    x_cl = x.reshape([batch_size * n_chans, nlat_in * nlon_in]).transpose([1, 0])
+    w = _to_dtype(weight, acc_dtype).reshape([groups, out_chans // groups, groupsize, kernel_size])
+    psi_vals = _to_dtype(psi_vals, acc_dtype)
+
+    ker, tout, col = psi_idx[0], psi_idx[1], psi_idx[2]
+    tin = col // nlon_in
+    pin = col % nlon_in
+
+    out = paddle.zeros([batch_size, out_chans, nlat_out, nlon_out], dtype=acc_dtype)
+
+    max_nnz = max(1, MAX_CHUNK_ELEMENTS // (nlon_out * batch_size * n_chans))
+    if lat_offsets is None:
+        lat_offsets = _get_latitude_offsets(tout.numpy(), nlat_out)
+    for t0, t1, s, e in _get_latitude_chunks(lat_offsets, max_nnz):
+        # sparse contraction for this chunk of output latitudes
+        _, xg = _disco_s2_fused_gather(x_cl, tin, pin, nlon_in, nlon_out, pscale, s, e)
+        xg = _to_dtype(xg, acc_dtype) * psi_vals[s:e].reshape([-1, 1, 1])
+        rows = (tout[s:e] - t0) * kernel_size + ker[s:e]
+        y = paddle.zeros([(t1 - t0) * kernel_size, nlon_out, batch_size * n_chans], dtype=acc_dtype)
+        y = paddle.index_add(y, rows, 0, xg)
+        y = y.reshape([t1 - t0, kernel_size, nlon_out, batch_size, groups, groupsize])
+
+        # contraction with the weights
+        out[:, :, t0:t1, :] = paddle.einsum("hkpbgc,gock->bgohp", y, w).reshape(
+            [batch_size, out_chans, t1 - t0, nlon_out]
+        )
+
+    return _to_dtype(out, x.dtype)
+
+
+def _disco_s2_contraction_fused_bwd(
+    grad_out: paddle.Tensor,
+    x: paddle.Tensor,
+    weight: paddle.Tensor,
+    psi_idx: paddle.Tensor,
+    psi_vals: paddle.Tensor,
+    groups: int,
+    compute_weight_grad: bool = True,
+    lat_offsets: Optional[np.ndarray] = None,
+):
+    """
+    Backward pass of the fused DISCO convolution. The chunked sparse contraction is recomputed, rather than stored
+    during the forward pass, to obtain the gradient with respect to the weights.
+    """
+
+    batch_size, n_chans, nlat_in, nlon_in = x.shape
+    out_chans, groupsize, kernel_size = weight.shape
+    _, _, nlat_out, nlon_out = grad_out.shape
+    pscale = nlon_in // nlon_out
+
+    acc_dtype = _get_accumulation_dtype(x.dtype)
+
+    x_cl = x.reshape([batch_size * n_chans, nlat_in * nlon_in]).transpose([1, 0])
+    w = _to_dtype(weight, acc_dtype).reshape([groups, out_chans // groups, groupsize, kernel_size])
+    psi_vals = _to_dtype(psi_vals, acc_dtype)
+    grad_out = _to_dtype(grad_out, acc_dtype)
+
+    ker, tout, col = psi_idx[0], psi_idx[1], psi_idx[2]
+    tin = col // nlon_in
+    pin = col % nlon_in
+
+    grad_x_cl = paddle.zeros([nlat_in * nlon_in, batch_size * n_chans], dtype=acc_dtype)
+    grad_w = paddle.zeros(w.shape, dtype=acc_dtype)
+
+    max_nnz = max(1, MAX_CHUNK_ELEMENTS // (nlon_out * batch_size * n_chans))
+    if lat_offsets is None:
+        lat_offsets = _get_latitude_offsets(tout.numpy(), nlat_out)
+    for t0, t1, s, e in _get_latitude_chunks(lat_offsets, max_nnz):
+        cols, xg = _disco_s2_fused_gather(x_cl, tin, pin, nlon_in, nlon_out, pscale, s, e)
+        xg = _to_dtype(xg, acc_dtype)
+        vals = psi_vals[s:e].reshape([-1, 1, 1])
+        rows = (tout[s:e] - t0) * kernel_size + ker[s:e]
+
+        go = grad_out[:, :, t0:t1, :].reshape(
+            [batch_size, groups, out_chans // groups, t1 - t0, nlon_out]
+        )
+
+        # gradient with respect to the weights requires the recomputed intermediate
+        if compute_weight_grad:
+            y = paddle.zeros(
+                [(t1 - t0) * kernel_size, nlon_out, batch_size * n_chans], dtype=acc_dtype
+            )
+            y = paddle.index_add(y, rows, 0, xg * vals)
+            y = y.reshape([t1 - t0, kernel_size, nlon_out, batch_size, groups, groupsize])
+            grad_w += paddle.einsum("hkpbgc,bgohp->gock", y, go)
+
+        # gradient with respect to the input is the transposed sparse contraction
+        gy = paddle.einsum("bgohp,gock->hkpbgc", go, w).reshape(
+            [(t1 - t0) * kernel_size, nlon_out, batch_size * n_chans]
+        )
+        gxg = paddle.gather(gy, rows, axis=0) * vals
+        grad_x_cl = paddle.index_add(
+            grad_x_cl, cols.flatten(), 0, gxg.reshape([-1, batch_size * n_chans])
+        )
+
+    grad_x = grad_x_cl.transpose([1, 0]).reshape([batch_size, n_chans, nlat_in, nlon_in])
+    grad_x = _to_dtype(grad_x, x.dtype)
+    grad_weight = _to_dtype(grad_w.reshape([out_chans, groupsize, kernel_size]), weight.dtype)
+
+    return grad_x, grad_weight
+
+
+class _DiscoS2ContractionFused(paddle.autograd.PyLayer):
+    """
+    Helper function to make the fused implementation work with Paddle autograd functionality
+    """
+
+    @staticmethod
+    def forward(
+        ctx,
+        x: paddle.Tensor,
+        weight: paddle.Tensor,
+        psi_idx: paddle.Tensor,
+        psi_vals: paddle.Tensor,
+        nlat_out: int,
+        nlon_out: int,
+        groups: int,
+        lat_offsets: Optional[np.ndarray] = None,
+    ):
+        ctx.save_for_backward(x, weight, psi_idx, psi_vals)
+        ctx.groups = groups
+        ctx.lat_offsets = lat_offsets
+
+        return _disco_s2_contraction_fused_fwd(
+            x, weight, psi_idx, psi_vals, nlat_out, nlon_out, groups, lat_offsets
+        )
+
+    @staticmethod
+    def backward(ctx, grad_output):
+        x, weight, psi_idx, psi_vals = ctx.saved_tensor()
+        grad_x, grad_weight = _disco_s2_contraction_fused_bwd(
+            grad_output,
+            x,
+            weight,
+            psi_idx,
+            psi_vals,
+            ctx.groups,
+            compute_weight_grad=not weight.stop_gradient,
+            lat_offsets=ctx.lat_offsets,
+        )
+
+        return grad_x, grad_weight, None, None
+
+
+def _disco_s2_contraction_fused(
+    x: paddle.Tensor,
+    weight: paddle.Tensor,
+    psi_idx: paddle.Tensor,
+    psi_vals: paddle.Tensor,
+    nlat_out: int,
+    nlon_out: int,
+    groups: int = 1,
+    lat_offsets: Optional[np.ndarray] = None,
+):
+    return _DiscoS2ContractionFused.apply(
+        x, weight, psi_idx, psi_vals, nlat_out, nlon_out, groups, lat_offsets
+    )
+
+
+def _get_psi_chunks(
+    psi_idx: paddle.Tensor,
+    lat_offsets: np.ndarray,
+    max_lats: int,
+    transpose_shape: Optional[Tuple[int, int, int]] = None,
+):
+    """
+    Splits psi into chunks of at most max_lats contiguous output latitudes. Expects the offsets of the output latitudes
+    as returned by _get_latitude_offsets and returns the chunks as tuples (t0, t1, s, e, idx, psi_t), where [t0, t1)
+    are the output latitudes, [s, e) the range in the non-zero arrays and idx the indices of the chunk relative to t0.
+    If transpose_shape (nlat_in, nlon_in, nlon_out) is given, psi_t is the transposed index of the chunk as returned by
+    _disco_s2_transpose_index, otherwise it is None. Chunks without non-zeros are skipped. The chunks only depend on
+    the basis and are therefore kept together with it.
+    """
+
+    nlat_out = len(lat_offsets) - 1
+    shift = paddle.to_tensor([[0], [1], [0]], dtype=psi_idx.dtype)
+
+    chunks = []
+    for t0 in range(0, nlat_out, max_lats):
+        t1 = min(t0 + max_lats, nlat_out)
+        s, e = int(lat_offsets[t0]), int(lat_offsets[t1])
+        if s == e:
+            continue
+        idx = psi_idx[:, s:e] - shift * t0
+        psi_t = (
+            None if transpose_shape is None else _disco_s2_transpose_index(idx, *transpose_shape)
+        )
+        chunks.append((t0, t1, s, e, idx, psi_t))
+
+    return chunks
+
+
+def _disco_s2_contraction_triton_chunked_fwd(
+    x: paddle.Tensor,
+    weight: paddle.Tensor,
+    psi_vals: paddle.Tensor,
+    psi_chunks: list,
+    nlat_out: int,
+    nlon_out: int,
+    groups: int,
+):
+    """
+    Forward pass of the triton implementation of the DISCO convolution, which applies the sparse contraction and the
+    contraction with the weights chunk by chunk along the output latitudes. This bounds the intermediate with the kernel
+    dimension to MAX_CHUNK_ELEMENTS, rather than materializing it for the full output grid.
+
+    Parameters
+    ----------
+    x: paddle.Tensor
+        Input signal on the sphere. Expects a tensor of shape batch_size x n_chans x nlat_in x nlon_in.
+    weight: paddle.Tensor
+        Weight tensor of shape out_chans x (n_chans // groups) x kernel_size.
+    psi_vals: paddle.Tensor
+        Values of the pre-computed convolution tensor, including the quadrature weights.
+    psi_chunks: list
+        Chunks of the pre-computed convolution tensor as returned by _get_psi_chunks.
+    nlat_out: int
+        Number of latitude points the output should have.
+    nlon_out: int
+        Number of longitude points the output should have.
+    groups: int
+        Number of groups of the convolution.
+    """
+
+    batch_size, n_chans, nlat_in, nlon_in = x.shape
+    out_chans, groupsize, kernel_size = weight.shape
+    assert n_chans == groups * groupsize
+
+    acc_dtype = _get_accumulation_dtype(x.dtype)
+    w = _to_dtype(weight, acc_dtype).reshape([groups, out_chans // groups, groupsize, kernel_size])
+
+    out = paddle.zeros([batch_size, out_chans, nlat_out, nlon_out], dtype=acc_dtype)
+
+    for t0, t1, s, e, idx, _ in psi_chunks:
+        # sparse contraction for this chunk of output latitudes
+        psi = paddle.sparse.sparse_coo_tensor(
+            idx, psi_vals[s:e], shape=[kernel_size, t1 - t0, nlat_in * nlon_in]
+        )
+        y = _to_dtype(_disco_s2_contraction_fwd(x, psi, nlon_out), acc_dtype)
+        y = y.reshape([batch_size, groups, groupsize, kernel_size, t1 - t0, nlon_out])
+
+        # contraction with the weights
+        out[:, :, t0:t1, :] = paddle.einsum("bgckxy,gock->bgoxy", y, w).reshape(
+            [batch_size, out_chans, t1 - t0, nlon_out]
+        )
+
+    return _to_dtype(out, x.dtype)
+
+
+def _disco_s2_contraction_triton_chunked_bwd(
+    grad_out: paddle.Tensor,
+    x: paddle.Tensor,
+    weight: paddle.Tensor,
+    psi_vals: paddle.Tensor,
+    psi_chunks: list,
+    groups: int,
+    compute_weight_grad: bool = True,
+):
+    """
+    Backward pass of the chunked triton implementation. The sparse contraction is recomputed per chunk to obtain the
+    gradient with respect to the weights. If the chunks carry their transposed index, the gradient with respect to the
+    input is gathered with it and the chunks are accumulated in a fixed order, rather than using atomics.
+    """
+
+    batch_size, n_chans, nlat_in, nlon_in = x.shape
+    out_chans, groupsize, kernel_size = weight.shape
+    *_, nlon_out = grad_out.shape
+
+    acc_dtype = _get_accumulation_dtype(x.dtype)
+    w = _to_dtype(weight, acc_dtype).reshape([groups, out_chans // groups, groupsize, kernel_size])
+    grad_out = _to_dtype(grad_out, acc_dtype)
+
+    grad_x = paddle.zeros([batch_size, n_chans, nlat_in, nlon_in], dtype=acc_dtype)
+    grad_w = paddle.zeros(w.shape, dtype=acc_dtype)
+
+    for t0, t1, s, e, idx, psi_t in psi_chunks:
+        psi = paddle.sparse.sparse_coo_tensor(
+            idx, psi_vals[s:e], shape=[kernel_size, t1 - t0, nlat_in * nlon_in]
+        )
+        go = grad_out[:, :, t0:t1, :].reshape(
+            [batch_size, groups, out_chans // groups, t1 - t0, nlon_out]
+        )
+
+        # gradient with respect to the weights requires the recomputed intermediate
+        if compute_weight_grad:
+            y = _to_dtype(_disco_s2_contraction_fwd(x, psi, nlon_out), acc_dtype)
+            y = y.reshape([batch_size, groups, groupsize, kernel_size, t1 - t0, nlon_out])
+            grad_w += paddle.einsum("bgckxy,bgoxy->gock", y, go)
+
+        # gradient with respect to the input is the transposed sparse contraction
+        gy = paddle.einsum("bgoxy,gock->bgckxy", go, w).reshape(
+            [batch_size, n_chans, kernel_size, t1 - t0, nlon_out]
+        )
+        if psi_t is not None:
+            psi_t_ptr, psi_t_idx, psi_t_perm = psi_t
+            psi_t_vals = paddle.gather(psi_vals[s:e], psi_t_perm)
+            grad_x += _disco_s2_contraction_bwd_deterministic(
+                gy, psi_t_ptr, psi_t_idx, psi_t_vals, nlat_in, nlon_in
+            )
+        else:
+            grad_x += _disco_s2_contraction_bwd(gy, psi, nlon_in)
+
+    grad_x = _to_dtype(grad_x, x.dtype)
+    grad_weight = _to_dtype(grad_w.reshape([out_chans, groupsize, kernel_size]), weight.dtype)
+
+    return grad_x, grad_weight
+
+
+class _DiscoS2ContractionTritonChunked(paddle.autograd.PyLayer):
+    """
+    Helper function to make the chunked triton implementation work with Paddle autograd functionality
+    """
+
+    @staticmethod
+    def forward(
+        ctx,
+        x: paddle.Tensor,
+        weight: paddle.Tensor,
+        psi_vals: paddle.Tensor,
+        psi_chunks: list,
+        nlat_out: int,
+        nlon_out: int,
+        groups: int,
+    ):
+        ctx.save_for_backward(x, weight, psi_vals)
+        ctx.psi_chunks = psi_chunks
+        ctx.groups = groups
+
+        return _disco_s2_contraction_triton_chunked_fwd(
+            x, weight, psi_vals, psi_chunks, nlat_out, nlon_out, groups
+        )
+
+    @staticmethod
+    def backward(ctx, grad_output):
+        x, weight, psi_vals = ctx.saved_tensor()
+        grad_x, grad_weight = _disco_s2_contraction_triton_chunked_bwd(
+            grad_output,
+            x,
+            weight,
+            psi_vals,
+            ctx.psi_chunks,
+            ctx.groups,
+            compute_weight_grad=not weight.stop_gradient,
+        )
+
+        return grad_x, grad_weight, None
+
+
+def _disco_s2_contraction_triton_chunked(
+    x: paddle.Tensor,
+    weight: paddle.Tensor,
+    psi_vals: paddle.Tensor,
+    psi_chunks: list,
+    nlat_out: int,
+    nlon_out: int,
+    groups: int = 1,
+):
+    return _DiscoS2ContractionTritonChunked.apply(
+        x, weight, psi_vals, psi_chunks, nlat_out, nlon_out, groups
+    )
+
+
+def _disco_s2_transpose_psi_mod(psi_idx: paddle.Tensor, nlat_in: int, nlon_out: int):
+    """
+    Computes the semi-transposed representation of psi used by the fused transpose contraction. For each non-zero, it
+    holds the row (kernel index, input latitude) of the input, as well as the output latitude and the longitude offset
+    of the output. The non-zeros are sorted by output latitude, such that chunks of output latitudes can be computed
+    independently. Returns the modified indices of shape 3 x nnz and the permutation which has to be applied to the values.
+    """
+
+    ker, tin, col = psi_idx[0], psi_idx[1], psi_idx[2]
+    tout = col // nlon_out
+    pout = col % nlon_out
+
+    perm = paddle.argsort(tout, stable=True)
+    psi_mod_idx = paddle.stack([ker * nlat_in + tin, tout, pout], axis=0)
+    psi_mod_idx = paddle.gather(psi_mod_idx, perm, axis=1)
+
+    return psi_mod_idx, perm
+
+
+def _disco_s2_transpose_fused_cols(tout, pout, nlon_in, nlon_out, pscale, s, e):
+    """
+    Computes the output positions tout * nlon_out + (pout + pin * pscale) % nlon_out, to which the non-zeros in [s, e)
+    scatter the input longitudes pin.
+    """
+    pshift = paddle.arange(nlon_in, dtype=pout.dtype) * pscale
+    return tout[s:e].unsqueeze(-1) * nlon_out + (pout[s:e].unsqueeze(-1) + pshift) % nlon_out
+
+
+def _disco_s2_transpose_contraction_fused_fwd(
+    x: paddle.Tensor,
+    psi_mod_idx: paddle.Tensor,
+    psi_mod_vals: paddle.Tensor,
+    nlat_out: int,
+    nlon_out: int,
+    kernel_size: Optional[int] = None,
+    lat_offsets: Optional[np.ndarray] = None,
+):
+    """
+    Forward pass of the fused transpose DISCO contraction. Rather than interleaving the input with zeros and rolling it
+    nlon_out times, each non-zero scatters the compact input directly to the shifted output longitudes. The output is
+    computed chunk by chunk along the output latitudes.
+
+    Parameters
+    ----------
+    x: paddle.Tensor
+        Input signal of shape batch_size x n_chans x kernel_size x nlat_in x nlon_in, which is summed over the kernel
+        dimension. If kernel_size is passed, the input has shape batch_size x n_chans x nlat_in x nlon_in instead and
+        the output keeps the kernel dimension.
+    psi_mod_idx: paddle.Tensor
+        Semi-transposed indices of the pre-computed convolution tensor as returned by _disco_s2_transpose_psi_mod.
+    psi_mod_vals: paddle.Tensor
+        Values of the pre-computed convolution tensor in the same order, including the quadrature weights.
+    nlat_out: int
+        Number of latitude points the output should have.
+    nlon_out: int
+        Number of longitude points the output should have.
+    kernel_size: Optional[int]
+        Size of the kernel dimension which is kept in the output.
+    lat_offsets: Optional[np.ndarray]
+        Offsets of the output latitudes in the non-zero arrays as returned by _get_latitude_offsets. Computed from
+        the indices if not given, which requires a copy to the host.
+    """
+
+    keep_kernel_dim = kernel_size is not None
+    if keep_kernel_dim:
+        assert len(x.shape) == 4
+        batch_size, n_chans, nlat_in, nlon_in = x.shape
+        kernel_size_in, kernel_size_out = 1, kernel_size
+    else:
+        assert len(x.shape) == 5
+        batch_size, n_chans, kernel_size_in, nlat_in, nlon_in = x.shape
+        kernel_size_out = 1
+
+    assert nlon_out % nlon_in == 0
+    pscale = nlon_out // nlon_in
+
+    acc_dtype = _get_accumulation_dtype(x.dtype)
+    psi_mod_vals = _to_dtype(psi_mod_vals, acc_dtype)
+
+    # channels-last layout for the gather
+    x_cl = x.reshape([batch_size * n_chans, kernel_size_in * nlat_in, nlon_in]).transpose([1, 2, 0])
+
+    row, tout, pout = psi_mod_idx[0], psi_mod_idx[1], psi_mod_idx[2]
+    if keep_kernel_dim:
+        ker, row = row // nlat_in, row % nlat_in
+
+    out = paddle.zeros([kernel_size_out, nlat_out, nlon_out, batch_size * n_chans], dtype=acc_dtype)
+
+    max_nnz = max(1, MAX_CHUNK_ELEMENTS // (nlon_in * batch_size * n_chans))
+    if lat_offsets is None:
+        lat_offsets = _get_latitude_offsets(tout.numpy(), nlat_out)
+    for t0, t1, s, e in _get_latitude_chunks(lat_offsets, max_nnz):
+        if s == e:
+            continue
+        cols = _disco_s2_transpose_fused_cols(tout, pout, nlon_in, nlon_out, pscale, s, e)
+        cols = cols - t0 * nlon_out
+        if keep_kernel_dim:
+            cols = cols + (ker[s:e] * (t1 - t0) * nlon_out).unsqueeze(-1)
+        xg = paddle.gather(x_cl, row[s:e], axis=0)
+        xg = _to_dtype(xg, acc_dtype) * psi_mod_vals[s:e].reshape([-1, 1, 1])
+
+        y = paddle.zeros(
+            [kernel_size_out * (t1 - t0) * nlon_out, batch_size * n_chans], dtype=acc_dtype
+        )
+        y = paddle.index_add(y, cols.flatten(), 0, xg.reshape([-1, batch_size * n_chans]))
+        out[:, t0:t1] = y.reshape([kernel_size_out, t1 - t0, nlon_out, batch_size * n_chans])
+
+    out = out.transpose([3, 0, 1, 2])
+    if keep_kernel_dim:
+        out = out.reshape([batch_size, n_chans, kernel_size_out, nlat_out, nlon_out])
+    else:
+        out = out.reshape([batch_size, n_chans, nlat_out, nlon_out])
+
+    return _to_dtype(out, x.dtype)
+
+
+def _disco_s2_transpose_contraction_fused_bwd(
+    grad_out: paddle.Tensor,
+    psi_mod_idx: paddle.Tensor,
+    psi_mod_vals: paddle.Tensor,
+    kernel_size: int,
+    nlat_in: int,
+    nlon_in: int,
+    keep_kernel_dim: bool = False,
+    lat_offsets: Optional[np.ndarray] = None,
+):
+    """
+    Backward pass of the fused transpose DISCO contraction, which gathers the output gradient at the shifted positions.
+    """
+
+    if keep_kernel_dim:
+        batch_size, n_chans, _, nlat_out, nlon_out = grad_out.shape
+        kernel_size_in = 1
+    else:
+        batch_size, n_chans, nlat_out, nlon_out = grad_out.shape
+        kernel_size_in = kernel_size
+    pscale = nlon_out // nlon_in
+
+    grad_out_cl = grad_out.reshape([batch_size * n_chans, -1]).transpose([1, 0])
+
+    row, tout, pout = psi_mod_idx[0], psi_mod_idx[1], psi_mod_idx[2]
+    if keep_kernel_dim:
+        ker, row = row // nlat_in, row % nlat_in
+
+    acc_dtype = _get_accumulation_dtype(grad_out.dtype)
+    psi_mod_vals = _to_dtype(psi_mod_vals, acc_dtype)
+
+    grad_x_cl = paddle.zeros(
+        [kernel_size_in * nlat_in, nlon_in, batch_size * n_chans], dtype=acc_dtype
+    )
+
+    max_nnz = max(1, MAX_CHUNK_ELEMENTS // (nlon_in * batch_size * n_chans))
+    if lat_offsets is None:
+        lat_offsets = _get_latitude_offsets(tout.numpy(), nlat_out)
+    for t0, t1, s, e in _get_latitude_chunks(lat_offsets, max_nnz):
+        if s == e:
+            continue
+        cols = _disco_s2_transpose_fused_cols(tout, pout, nlon_in, nlon_out, pscale, s, e)
+        if keep_kernel_dim:
+            cols = cols + (ker[s:e] * nlat_out * nlon_out).unsqueeze(-1)
+        gy = _to_dtype(paddle.gather(grad_out_cl, cols.flatten(), axis=0), acc_dtype)
+        gy = gy.reshape([e - s, nlon_in, batch_size * n_chans]) * psi_mod_vals[s:e].reshape(
+            [-1, 1, 1]
+        )
+        grad_x_cl = paddle.index_add(grad_x_cl, row[s:e], 0, gy)
+
+    grad_x = grad_x_cl.transpose([2, 0, 1])
+    if keep_kernel_dim:
+        grad_x = grad_x.reshape([batch_size, n_chans, nlat_in, nlon_in])
+    else:
+        grad_x = grad_x.reshape([batch_size, n_chans, kernel_size, nlat_in, nlon_in])
+
+    return _to_dtype(grad_x, grad_out.dtype)
+
+
+class _DiscoS2TransposeContractionFused(paddle.autograd.PyLayer):
+    """
+    Helper function to make the fused transpose implementation work with Paddle autograd functionality
+    """
+
+    @staticmethod
+    def forward(
+        ctx,
+        x: paddle.Tensor,
+        psi_mod_idx: paddle.Tensor,
+        psi_mod_vals: paddle.Tensor,
+        nlat_out: int,
+        nlon_out: int,
+        kernel_size: Optional[int] = None,
+        lat_offsets: Optional[np.ndarray] = None,
+    ):
+        ctx.save_for_backward(psi_mod_idx, psi_mod_vals)
+        ctx.keep_kernel_dim = kernel_size is not None
+        ctx.kernel_size = kernel_size if ctx.keep_kernel_dim else x.shape[2]
+        ctx.nlat_in, ctx.nlon_in = x.shape[-2], x.shape[-1]
+        ctx.lat_offsets = lat_offsets
+
+        return _disco_s2_transpose_contraction_fused_fwd(
+            x, psi_mod_idx, psi_mod_vals, nlat_out, nlon_out, kernel_size, lat_offsets
+        )
+
+    @staticmethod
+    def backward(ctx, grad_output):
+        psi_mod_idx, psi_mod_vals = ctx.saved_tensor()
+        grad_x = _disco_s2_transpose_contraction_fused_bwd(
+            grad_output,
+            psi_mod_idx,
+            psi_mod_vals,
+            ctx.kernel_size,
+            ctx.nlat_in,
+            ctx.nlon_in,
+            keep_kernel_dim=ctx.keep_kernel_dim,
+            lat_offsets=ctx.lat_offsets,
+        )
+
+        return grad_x, None, None
+
+
+def _disco_s2_transpose_contraction_fused(
+    x: paddle.Tensor,
+    psi_mod_idx: paddle.Tensor,
+    psi_mod_vals: paddle.Tensor,
+    nlat_out: int,
+    nlon_out: int,
+    kernel_size: Optional[int] = None,
+    lat_offsets: Optional[np.ndarray] = None,
+):
+    return _DiscoS2TransposeContractionFused.apply(
+        x, psi_mod_idx, psi_mod_vals, nlat_out, nlon_out, kernel_size, lat_offsets
+    )
+
+
+def _disco_s2_contraction_ksum_fwd(
+    x: paddle.Tensor,
+    psi_idx: paddle.Tensor,
+    psi_vals: paddle.Tensor,
+    nlat_out: int,
+    nlon_out: int,
+    lat_offsets: Optional[np.ndarray] = None,
+):
+    """
+    Forward pass of the DISCO contraction for inputs which have already been contracted with the weights. Each
+    non-zero reads the channel of its own kernel index, such that the kernel dimension is summed over.
+
+    Parameters
+    ----------
+    x: paddle.Tensor
+        Input signal of shape batch_size x n_chans x kernel_size x nlat_in x nlon_in.
+    psi_idx: paddle.Tensor
+        Indices of the pre-computed convolution tensor of shape 3 x nnz. Expects the non-zeros to be sorted by output latitude.
+    psi_vals: paddle.Tensor
+        Values of the pre-computed convolution tensor, including the quadrature weights.
+    nlat_out: int
+        Number of latitude points the output should have.
+    nlon_out: int
+        Number of longitude points the output should have.
+    lat_offsets: Optional[np.ndarray]
+        Offsets of the output latitudes in the non-zero arrays as returned by _get_latitude_offsets. Computed from
+        the indices if not given, which requires a copy to the host.
+    """
+
+    assert len(x.shape) == 5
+
+    batch_size, n_chans, kernel_size, nlat_in, nlon_in = x.shape
+    assert nlon_in % nlon_out == 0
+    pscale = nlon_in // nlon_out
+
+    acc_dtype = _get_accumulation_dtype(x.dtype)
+    psi_vals = _to_dtype(psi_vals, acc_dtype)
+
+    # channels-last layout for the gather, with the kernel index folded into the latitudes
+    x_cl = x.reshape([batch_size * n_chans, kernel_size * nlat_in * nlon_in]).transpose([1, 0])
+
+    ker, tout, col = psi_idx[0], psi_idx[1], psi_idx[2]
+    tin = ker * nlat_in + col // nlon_in
+    pin = col % nlon_in
+
+    out = paddle.zeros([nlat_out, nlon_out, batch_size * n_chans], dtype=acc_dtype)
+
+    max_nnz = max(1, MAX_CHUNK_ELEMENTS // (nlon_out * batch_size * n_chans))
+    if lat_offsets is None:
+        lat_offsets = _get_latitude_offsets(tout.numpy(), nlat_out)
+    for t0, t1, s, e in _get_latitude_chunks(lat_offsets, max_nnz):
+        if s == e:
+            continue
+        _, xg = _disco_s2_fused_gather(x_cl, tin, pin, nlon_in, nlon_out, pscale, s, e)
+        xg = _to_dtype(xg, acc_dtype) * psi_vals[s:e].reshape([-1, 1, 1])
+        y = paddle.zeros([t1 - t0, nlon_out, batch_size * n_chans], dtype=acc_dtype)
+        out[t0:t1] = paddle.index_add(y, tout[s:e] - t0, 0, xg)
+
+    out = out.transpose([2, 0, 1]).reshape([batch_size, n_chans, nlat_out, nlon_out])
+
+    return _to_dtype(out, x.dtype)
+
+
+def _disco_s2_contraction_ksum_bwd(
+    grad_out: paddle.Tensor,
+    psi_idx: paddle.Tensor,
+    psi_vals: paddle.Tensor,
+    kernel_size: int,
+    nlat_in: int,
+    nlon_in: int,
+    lat_offsets: Optional[np.ndarray] = None,
+):
+    """
+    Backward pass of the DISCO contraction for inputs which have already been contracted with the weights.
+    """
+
+    batch_size, n_chans, nlat_out, nlon_out = grad_out.shape
+    pscale = nlon_in // nlon_out
+
+    grad_out_cl = grad_out.reshape([batch_size * n_chans, nlat_out, nlon_out]).transpose([1, 2, 0])
+
+    ker, tout, col = psi_idx[0], psi_idx[1], psi_idx[2]
+    tin = ker * nlat_in + col // nlon_in
+    pin = col % nlon_in
+
+    acc_dtype = _get_accumulation_dtype(grad_out.dtype)
+    psi_vals = _to_dtype(psi_vals, acc_dtype)
+
+    grad_x_cl = paddle.zeros(
+        [kernel_size * nlat_in * nlon_in, batch_size * n_chans], dtype=acc_dtype
+    )
+
+    max_nnz = max(1, MAX_CHUNK_ELEMENTS // (nlon_out * batch_size * n_chans))
+    if lat_offsets is None:
+        lat_offsets = _get_latitude_offsets(tout.numpy(), nlat_out)
+    for t0, t1, s, e in _get_latitude_chunks(lat_offsets, max_nnz):
+        if s == e:
+            continue
+        pshift = paddle.arange(nlon_out, dtype=pin.dtype) * pscale
+        cols = tin[s:e].unsqueeze(-1) * nlon_in + (pin[s:e].unsqueeze(-1) + pshift) % nlon_in
+        gy = _to_dtype(paddle.gather(grad_out_cl, tout[s:e], axis=0), acc_dtype)
+        gy = gy * psi_vals[s:e].reshape([-1, 1, 1])
+        grad_x_cl = paddle.index_add(
+            grad_x_cl, cols.flatten(), 0, gy.reshape([-1, batch_size * n_chans])
+        )
+
+    grad_x = grad_x_cl.transpose([1, 0]).reshape(
+        [batch_size, n_chans, kernel_size, nlat_in, nlon_in]
+    )
+
+    return _to_dtype(grad_x, grad_out.dtype)
+
+
+class _DiscoS2ContractionKSum(paddle.autograd.PyLayer):
+    """
+    Helper function to make the contraction of weighted inputs work with Paddle autograd functionality
+    """
+
+    @staticmethod
+    def forward(
+        ctx,
+        x: paddle.Tensor,
+        psi_idx: paddle.Tensor,
+        psi_vals: paddle.Tensor,
+        nlat_out: int,
+        nlon_out: int,
+        lat_offsets: Optional[np.ndarray] = None,
+    ):
+        ctx.save_for_backward(psi_idx, psi_vals)
+        ctx.kernel_size, ctx.nlat_in, ctx.nlon_in = x.shape[2], x.shape[3], x.shape[4]
+        ctx.lat_offsets = lat_offsets
+
+        return _disco_s2_contraction_ksum_fwd(x, psi_idx, psi_vals, nlat_out, nlon_out, lat_offsets)
+
+    @staticmethod
+    def backward(ctx, grad_output):
+        psi_idx, psi_vals = ctx.saved_tensor()
+        grad_x = _disco_s2_contraction_ksum_bwd(
+            grad_output,
+            psi_idx,
+            psi_vals,
+            ctx.kernel_size,
+            ctx.nlat_in,
+            ctx.nlon_in,
+            lat_offsets=ctx.lat_offsets,
+        )
+
+        return grad_x, None, None
+
+
+def _disco_s2_contraction_ksum(
+    x: paddle.Tensor,
+    psi_idx: paddle.Tensor,
+    psi_vals: paddle.Tensor,
+    nlat_out: int,
+    nlon_out: int,
+    lat_offsets: Optional[np.ndarray] = None,
+):
+    return _DiscoS2ContractionKSum.apply(x, psi_idx, psi_vals, nlat_out, nlon_out, lat_offsets)
+
+
+def _segment_sum(vals: np.ndarray, segment_ids: np.ndarray, num_segments: int):
+    """
+    Sums the rows of vals which share the same, ascendingly sorted, segment id.
+    """
+    out = np.zeros((num_segments,) + vals.shape[1:], dtype=vals.dtype)
+    if len(segment_ids) > 0:
+        starts = np.flatnonzero(np.diff(segment_ids, prepend=-1))
+        out[segment_ids[starts]] = np.add.reduceat(vals, starts, axis=0)
+    return out
+
+
+def _disco_s2_cpu_gather(x_cl, tin, pin, nlon_in, nlon_out, pscale, s, e):
+    """
+    NumPy counterpart of _disco_s2_fused_gather.
+    """
+    pshift = np.arange(nlon_out, dtype=pin.dtype) * pscale
+    cols = tin[s:e, None] * nlon_in + (pin[s:e, None] + pshift) % nlon_in
+    return cols, x_cl[cols]
+
+
+def _disco_s2_cpu_chunks(lat_offsets: np.ndarray, row_elements: int, num_threads: int):
+    """
+    Chunks the output latitudes such that each chunk respects MAX_CHUNK_ELEMENTS and there are enough chunks to keep
+    all threads busy. Expects the offsets of the output latitudes as returned by _get_latitude_offsets.
+    """
+    nnz = int(lat_offsets[-1])
+    max_nnz = max(1, MAX_CHUNK_ELEMENTS // row_elements)
+    max_nnz = max(1, min(max_nnz, -(-nnz // (2 * num_threads))))
+    return _get_latitude_chunks(lat_offsets, max_nnz)
+
+
+def _disco_s2_contraction_cpu_fwd(
+    x: np.ndarray,
+    weight: np.ndarray,
+    psi_idx: np.ndarray,
+    psi_vals: np.ndarray,
+    nlat_out: int,
+    nlon_out: int,
+    groups: int,
+    num_threads: int,
+    lat_offsets: np.ndarray,
+):
+    """
+    CPU implementation of the fused DISCO convolution. Works on NumPy arrays in a channels-last layout and processes
+    chunks of output latitudes in parallel using a thread pool. As the chunks write to disjoint parts of the output,
+    no synchronization is required.
+    """
+
+    batch_size, n_chans, nlat_in, nlon_in = x.shape
+    out_chans, groupsize, kernel_size = weight.shape
+    ngroup_out = out_chans // groups
+
+    assert n_chans == groups * groupsize
+    assert nlon_in % nlon_out == 0
+    pscale = nlon_in // nlon_out
+
+    x_cl = np.ascontiguousarray(x.reshape(batch_size * n_chans, nlat_in * nlon_in).T)
+    w = weight.reshape(groups, ngroup_out, groupsize, kernel_size)
+
+    ker, tout, col = psi_idx
+    tin = col // nlon_in
+    pin = col % nlon_in
+
+    out = np.zeros((batch_size, out_chans, nlat_out, nlon_out), dtype=x.dtype)
+
+    def _process_chunk(chunk):
+        t0, t1, s, e = chunk
+        _, xg = _disco_s2_cpu_gather(x_cl, tin, pin, nlon_in, nlon_out, pscale, s, e)
+        xg *= psi_vals[s:e, None, None]
+        rows = (tout[s:e] - t0) * kernel_size + ker[s:e]
+        y = _segment_sum(xg, rows, (t1 - t0) * kernel_size)
+        y = y.reshape(t1 - t0, kernel_size, nlon_out, batch_size, groups, groupsize)
+        out[:, :, t0:t1, :] = np.einsum("hkpbgc,gock->bgohp", y, w, optimize=True).reshape(
+            batch_size, out_chans, t1 - t0, nlon_out
+        )
+
+    chunks = _disco_s2_cpu_chunks(lat_offsets, nlon_out * batch_size * n_chans, num_threads)
+    with ThreadPoolExecutor(max_workers=num_threads) as executor:
+        list(executor.map(_process_chunk, chunks))
+
+    return out
+
+
+def _disco_s2_contraction_cpu_bwd(
+    grad_out: np.ndarray,
+    x: np.ndarray,
+    weight: np.ndarray,
+    psi_idx: np.ndarray,
+    psi_vals: np.ndarray,
+    groups: int,
+    num_threads: int,
+    lat_offsets: np.ndarray,
+    compute_weight_grad: bool = True,
+):
+    """
+    Backward pass of the CPU implementation. Each chunk accumulates its contribution to the input gradient on the band
+    of input latitudes it touches, and the bands are summed up once all threads are done.
+    """
+
+    batch_size, n_chans, nlat_in, nlon_in = x.shape
+    out_chans, groupsize, kernel_size = weight.shape
+    ngroup_out = out_chans // groups
+    *_, nlon_out = grad_out.shape
+    pscale = nlon_in // nlon_out
+
+    x_cl = np.ascontiguousarray(x.reshape(batch_size * n_chans, nlat_in * nlon_in).T)
+    w = weight.reshape(groups, ngroup_out, groupsize, kernel_size)
+
+    ker, tout, col = psi_idx
+    tin = col // nlon_in
+    pin = col % nlon_in
+
+    def _process_chunk(chunk):
+        t0, t1, s, e = chunk
+        cols, xg = _disco_s2_cpu_gather(x_cl, tin, pin, nlon_in, nlon_out, pscale, s, e)
+        vals = psi_vals[s:e, None, None]
+        rows = (tout[s:e] - t0) * kernel_size + ker[s:e]
+
+        go = grad_out[:, :, t0:t1, :].reshape(batch_size, groups, ngroup_out, t1 - t0, nlon_out)
+
+        grad_w = None
+        if compute_weight_grad:
+            y = _segment_sum(vals * xg, rows, (t1 - t0) * kernel_size)
+            y = y.reshape(t1 - t0, kernel_size, nlon_out, batch_size, groups, groupsize)
+            grad_w = np.einsum("hkpbgc,bgohp->gock", y, go, optimize=True)
+
+        gy = np.einsum("bgohp,gock->hkpbgc", go, w, optimize=True).reshape(
+            (t1 - t0) * kernel_size, nlon_out, batch_size * n_chans
+        )
+        gxg = (vals * gy[rows]).reshape(-1, batch_size * n_chans)
+
+        # scatter into the band of input latitudes touched by this chunk
+        cols = cols.reshape(-1)
+        if len(cols) == 0:
+            return grad_w, 0, None
+        offset = (cols.min() // nlon_in) * nlon_in
+        order = np.argsort(cols, kind="stable")
+        band = _segment_sum(gxg[order], cols[order] - offset, cols.max() - offset + 1)
+
+        return grad_w, offset, band
+
+    chunks = _disco_s2_cpu_chunks(lat_offsets, nlon_out * batch_size * n_chans, num_threads)
+    with ThreadPoolExecutor(max_workers=num_threads) as executor:
+        results = list(executor.map(_process_chunk, chunks))
+
+    grad_x_cl = np.zeros((nlat_in * nlon_in, batch_size * n_chans), dtype=x.dtype)
+    grad_w = np.zeros_like(w)
+    for gw, offset, band in results:
+        if gw is not None:
+            grad_w += gw
+        if band is not None:
+            grad_x_cl[offset : offset + band.shape[0]] += band
+
+    grad_x = grad_x_cl.T.reshape(batch_size, n_chans, nlat_in, nlon_in)
+    grad_weight = grad_w.reshape(out_chans, groupsize, kernel_size)
+
+    return grad_x, grad_weight
+
+
+class _DiscoS2ContractionCPU(paddle.autograd.PyLayer):
+    """
+    Helper function to make the CPU implementation work with Paddle autograd functionality
+    """
+
+    @staticmethod
+    def forward(
+        ctx,
+        x: paddle.Tensor,
+        weight: paddle.Tensor,
+        psi_idx: paddle.Tensor,
+        psi_vals: paddle.Tensor,
+        nlat_out: int,
+        nlon_out: int,
+        groups: int,
+        num_threads: int,
+        psi_idx_host: Optional[np.ndarray] = None,
+        lat_offsets: Optional[np.ndarray] = None,
+    ):
+        # the index and the offsets only depend on psi, so they are copied to the host at most once per call
+        if psi_idx_host is None:
+            psi_idx_host = psi_idx.numpy()
+        if lat_offsets is None:
+            lat_offsets = _get_latitude_offsets(psi_idx_host[1], nlat_out)
+
+        ctx.save_for_backward(x, weight, psi_vals)
+        ctx.groups = groups
+        ctx.num_threads = num_threads
+        ctx.psi_idx_host = psi_idx_host
+        ctx.lat_offsets = lat_offsets
+
+        # numpy has no 16-bit float types we can rely on, so compute in the accumulation dtype
+        acc_dtype = _get_accumulation_dtype(x.dtype)
+        x_np = _to_dtype(x, acc_dtype).numpy()
+        out = _disco_s2_contraction_cpu_fwd(
+            x_np,
+            _to_dtype(weight, acc_dtype).numpy(),
+            psi_idx_host,
+            _to_dtype(psi_vals, acc_dtype).numpy(),
+            nlat_out,
+            nlon_out,
+            groups,
+            num_threads,
+            lat_offsets,
+        )
+        return _to_dtype(paddle.to_tensor(out, place=x.place), x.dtype)
+
+    @staticmethod
+    def backward(ctx, grad_output):
+        x, weight, psi_vals = ctx.saved_tensor()
+        acc_dtype = _get_accumulation_dtype(x.dtype)
+        x_np = _to_dtype(x, acc_dtype).numpy()
+        grad_x, grad_weight = _disco_s2_contraction_cpu_bwd(
+            _to_dtype(grad_output, acc_dtype).numpy(),
+            x_np,
+            _to_dtype(weight, acc_dtype).numpy(),
+            ctx.psi_idx_host,
+            _to_dtype(psi_vals, acc_dtype).numpy(),
+            ctx.groups,
+            ctx.num_threads,
+            ctx.lat_offsets,
+            compute_weight_grad=not weight.stop_gradient,
+        )
+
+        return (
+            _to_dtype(paddle.to_tensor(grad_x, place=x.place), x.dtype),
+            paddle.to_tensor(grad_weight, place=weight.place).astype(weight.dtype),
+            None,
+            None,
+        )
+
+
+def _disco_s2_contraction_cpu(
+    x: paddle.Tensor,
+    weight: paddle.Tensor,
+    psi_idx: paddle.Tensor,
+    psi_vals: paddle.Tensor,
+    nlat_out: int,
+    nlon_out: int,
+    groups: int = 1,
+    num_threads: Optional[int] = None,
+    psi_idx_host: Optional[np.ndarray] = None,
+    lat_offsets: Optional[np.ndarray] = None,
+):
+    if num_threads is None:
+        num_threads = os.cpu_count() or 1
+    return _DiscoS2ContractionCPU.apply(
+        x,
+        weight,
+        psi_idx,
+        psi_vals,
+        nlat_out,
+        nlon_out,
+        groups,
+        num_threads,
+        psi_idx_host,
+        lat_offsets,
+    )
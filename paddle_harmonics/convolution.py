@@ -30,7 +30,10 @@
 #
 
 import abc
+import itertools
 import math
+import time
+import weakref
 from functools import partial
 from typing import List
 from typing import Optional
@@ -41,26 +44,31 @@ import numpy as np
 import paddle
 import paddle.nn as nn
 
-from paddle_harmonics._disco_convolution import _disco_s2_contraction_paddle
+from paddle_harmonics._disco_convolution import MAX_CHUNK_ELEMENTS
+from paddle_harmonics._disco_convolution import _disco_s2_contraction_cpu
+from paddle_harmonics._disco_convolution import _disco_s2_contraction_fused
+from paddle_harmonics._disco_convolution import _disco_s2_contraction_ksum
 from paddle_harmonics._disco_convolution import _disco_s2_contraction_triton
-from paddle_harmonics._disco_convolution import _disco_s2_transpose_contraction_paddle
+from paddle_harmonics._disco_convolution import _disco_s2_contraction_triton_chunked
+from paddle_harmonics._disco_convolution import _disco_s2_contraction_triton_deterministic
+from paddle_harmonics._disco_convolution import _disco_s2_transpose_contraction_fused
 from paddle_harmonics._disco_convolution import _disco_s2_transpose_contraction_triton
+from paddle_harmonics._disco_convolution import _disco_s2_transpose_index
+from paddle_harmonics._disco_convolution import _disco_s2_transpose_psi_mod
+from paddle_harmonics._disco_convolution import _get_latitude_offsets
+from paddle_harmonics._disco_convolution import _get_psi_chunks
+from paddle_harmonics._disco_convolution import _to_dtype
 from paddle_harmonics.quadrature import _precompute_grid  # noqa
 from paddle_harmonics.quadrature import _precompute_latitudes
 from paddle_harmonics.utils import paddle_aux  # noqa
 
 
-def _compute_support_vals_isotropic(
-    r: paddle.Tensor, phi: paddle.Tensor, nr: int, r_cutoff: float, norm: str = "s2"
-):
+def _compute_norm_factor(nr: int, r_cutoff: float, norm: str = "s2"):
     """
-    Computes the index set that falls into the isotropic kernel's support and returns both indices and values.
+    Computes the normalization factor of the piecewise linear filter basis.
     """
 
-    # compute the support
     dr = (r_cutoff - 0.0) / nr
-    ikernel = paddle.arange(nr).reshape(-1, 1, 1)
-    ir = ikernel * dr
 
     if norm == "none":
         norm_factor = 1.0
@@ -83,10 +91,72 @@ def _compute_support_vals_isotropic(
     else:
         raise ValueError(f"Unknown normalization mode {norm}.")
 
-    # find the indices where the rotated position falls into the support of the kernel
-    iidx = paddle.nonzero(((r - ir).abs() <= dr) & (r <= r_cutoff))
-    vals = (1 - (r[iidx[:, 1], iidx[:, 2]] - ir[iidx[:, 0], 0, 0]).abs() / dr) / norm_factor
-    return iidx, vals
+    return norm_factor
+
+
+def _get_support_candidates(r: paddle.Tensor, phi: paddle.Tensor, r_cutoff: float):
+    """
+    Returns the indices of the points which fall within the cutoff radius, together with their radii and angles.
+    Only these points can be in the support of any of the basis functions.
+    """
+
+    cidx = paddle.nonzero(r <= r_cutoff)
+    return cidx, paddle.gather_nd(r, cidx), paddle.gather_nd(phi, cidx)
+
+
+def _assemble_support(ikernel, iidx, vals, shape):
+    """
+    Concatenates the contributions of the individual rings and sectors and sorts them by kernel index and position,
+    which is the order paddle.nonzero would produce on the corresponding dense mask.
+    """
+
+    if len(ikernel) == 0:
+        return paddle.empty([0, 3], dtype="int64"), paddle.empty([0], dtype="float32")
+
+    ikernel = paddle.concat(ikernel, axis=0)
+    iidx = paddle.concat(iidx, axis=0)
+    vals = paddle.concat(vals, axis=0)
+
+    order = paddle.argsort((ikernel * shape[0] + iidx[:, 0]) * shape[1] + iidx[:, 1], stable=True)
+    ikernel = paddle.gather(ikernel, order)
+    iidx = paddle.gather(iidx, order)
+    vals = paddle.gather(vals, order)
+
+    return paddle.concat([ikernel.unsqueeze(-1), iidx], axis=-1), vals
+
+
+def _compute_support_vals_isotropic(
+    r: paddle.Tensor, phi: paddle.Tensor, nr: int, r_cutoff: float, norm: str = "s2"
+):
+    """
+    Computes the index set that falls into the isotropic kernel's support and returns both indices and values.
+    """
+
+    # compute the support
+    dr = (r_cutoff - 0.0) / nr
+    norm_factor = _compute_norm_factor(nr, r_cutoff, norm=norm)
+
+    # only points within the cutoff radius can be in the support
+    cidx, rc, _ = _get_support_candidates(r, phi, r_cutoff)
+    if cidx.shape[0] == 0:
+        return _assemble_support([], [], [], r.shape)
+
+    # each point falls into the support of at most two adjacent rings. The ring below is checked as well,
+    # as rounding may place the point onto the next ring
+    ir0 = paddle.floor(rc / dr).astype("int64")
+
+    ikernel, iidx, vals = [], [], []
+    for roff in [-1, 0, 1]:
+        iring = ir0 + roff
+        rvals = 1 - (rc - iring.astype(rc.dtype) * dr).abs() / dr
+        mask = (iring >= 0) & (iring < nr) & (rvals >= 0)
+
+        sel = paddle.nonzero(mask).flatten()
+        ikernel.append(paddle.gather(iring, sel))
+        iidx.append(paddle.gather(cidx, sel))
+        vals.append(paddle.gather(rvals, sel) / norm_factor)
+
+    return _assemble_support(ikernel, iidx, vals, r.shape)
 
 
 def _compute_support_vals_anisotropic(
@@ -99,59 +169,76 @@ def _compute_support_vals_anisotropic(
 ):
     """
     Computes the index set that falls into the anisotropic kernel's support and returns both indices and values.
+    Rather than comparing all points against all kernel_size basis functions, the adjacent rings and sectors are
+    computed directly from the position of each point within the cutoff radius.
     """
 
     # compute the support
     dr = (r_cutoff - 0.0) / nr
     dphi = 2.0 * math.pi / nphi
-    kernel_size = (nr - 1) * nphi + 1
-    ikernel = paddle.arange(kernel_size).reshape(-1, 1, 1)
-    ir = ((ikernel - 1) // nphi + 1) * dr
-    iphi = ((ikernel - 1) % nphi) * dphi
+    norm_factor = _compute_norm_factor(nr, r_cutoff, norm=norm)
+
+    # only points within the cutoff radius can be in the support
+    cidx, rc, phic = _get_support_candidates(r, phi, r_cutoff)
+    if cidx.shape[0] == 0:
+        return _assemble_support([], [], [], r.shape)
+
+    # each point falls into the support of at most two adjacent rings and two adjacent sectors. The ring and sector
+    # below are checked as well, as rounding may place the point onto the next one
+    ir0 = paddle.floor(rc / dr).astype("int64")
+    iphi0 = paddle.floor(phic / dphi).astype("int64")
+    poffs = [0] if nphi == 1 else [0, 1] if nphi == 2 else [-1, 0, 1]
+
+    ikernel, iidx, vals = [], [], []
+    for roff in [-1, 0, 1]:
+        iring = ir0 + roff
+        rvals = (1 - (rc - iring.astype(rc.dtype) * dr).abs() / dr) / norm_factor
+        rmask = (iring >= 0) & (iring < nr) & (rvals >= 0)
+
+        # the central basis function has no angular dependence
+        mask = rmask & (iring == 0)
+        sel = paddle.nonzero(mask).flatten()
+        ikernel.append(paddle.gather(iring, sel))
+        iidx.append(paddle.gather(cidx, sel))
+        vals.append(paddle.gather(rvals, sel))
+
+        for poff in poffs:
+            isector = (iphi0 + poff) % nphi
+            dist = (phic - isector.astype(phic.dtype) * dphi).abs()
+            pvals = 1 - paddle.minimum(dist, 2 * math.pi - dist) / dphi
+            mask = rmask & (iring > 0) & (pvals >= 0)
+
+            sel = paddle.nonzero(mask).flatten()
+            ikernel.append(paddle.gather((iring - 1) * nphi + isector + 1, sel))
+            iidx.append(paddle.gather(cidx, sel))
+            vals.append(paddle.gather(rvals * pvals, sel))
+
+    return _assemble_support(ikernel, iidx, vals, r.shape)
+
+
+def _precompute_latitude_bands(
+    lats_in: np.ndarray, lats_out: np.ndarray, theta_cutoff: float, eps: float = 1e-4
+):
+    """
+    Computes for each output latitude the range [start, end) of input latitudes which lie within theta_cutoff of it.
+    As the geodesic distance between two points is bounded from below by the difference of their colatitudes, input
+    latitudes outside of this band cannot fall into the support of the filter. Expects colatitudes in ascending order.
+    The band is widened by eps to account for the single precision evaluation of the distances.
+    """
 
-    if norm == "none":
-        norm_factor = 1.0
-    elif norm == "2d":
-        norm_factor = (
-            math.pi * (r_cutoff * nr / (nr + 1)) ** 2
-            + math.pi * r_cutoff**2 * (2 * nr / (nr + 1) + 1) / (nr + 1) / 3
-        )
-    elif norm == "s2":
-        norm_factor = (
-            2
-            * math.pi
-            * (
-                1
-                - math.cos(r_cutoff - dr)
-                + math.cos(r_cutoff - dr)
-                + (math.sin(r_cutoff - dr) - math.sin(r_cutoff)) / dr
-            )
-        )
-    else:
-        raise ValueError(f"Unknown normalization mode {norm}.")
+    lat_start = np.searchsorted(lats_in, lats_out - theta_cutoff - eps, side="left")
+    lat_end = np.searchsorted(lats_in, lats_out + theta_cutoff + eps, side="right")
 
-    # find the indices where the rotated position falls into the support of the kernel
-    cond_r = ((r - ir).abs() <= dr) & (r <= r_cutoff)
-    cond_phi = (
-        (ikernel == 0) | ((phi - iphi).abs() <= dphi) | ((2 * math.pi - (phi - iphi).abs()) <= dphi)
-    )
-    iidx = paddle.nonzero(cond_r & cond_phi)
-    vals = (1 - (r[iidx[:, 1], iidx[:, 2]] - ir[iidx[:, 0], 0, 0]).abs() / dr) / norm_factor
-    vals *= paddle.where(
-        iidx[:, 0] > 0,
-        (
-            1
-            - paddle.minimum(
-                (phi[iidx[:, 1], iidx[:, 2]] - iphi[iidx[:, 0], 0, 0]).abs(),
-                (2 * math.pi - (phi[iidx[:, 1], iidx[:, 2]] - iphi[iidx[:, 0], 0, 0]).abs()),
-            )
-            / dphi
-        ),
-        1.0,
-    ).astype(
-        vals.dtype
-    )  # 202411: add astype
-    return iidx, vals
+    return lat_start, lat_end
+
+
+def _get_longitude_blocks(nlon_in: int, nlon_out: int):
+    """
+    Returns the number of distinct fractional longitude shifts between an input and an output grid. Output longitude
+    pout = q * nblocks + r is reached from output longitude r by an integer shift of q * nlon_in / gcd(nlon_in, nlon_out)
+    input longitudes, such that a separate block of the filter basis is only required for each residue r.
+    """
+    return nlon_out // math.gcd(nlon_in, nlon_out)
 
 
 def _precompute_convolution_tensor_s2(
@@ -161,11 +248,16 @@ def _precompute_convolution_tensor_s2(
     grid_in="equiangular",
     grid_out="equiangular",
     theta_cutoff=0.01 * math.pi,
+    lat_range_out=None,
 ):
     """
     Precomputes the rotated filters at positions $R^{-1}_j \omega_i = R^{-1}_j R_i \nu = Y(-\theta_j)Z(\phi_i - \phi_j)Y(\theta_j)\nu$.
     Assumes a tensorized grid on the sphere with an equidistant sampling in longitude as described in Ocampo et al.
-    The output tensor has shape kernel_shape x nlat_out x (nlat_in * nlon_in).
+    The output tensor has shape kernel_shape x (nlat_out * nblocks) x (nlat_in * nlon_in), where nblocks is given by
+    _get_longitude_blocks. Row t * nblocks + r holds the filters of output latitude t at output longitude r, which
+    covers resolution ratios where the output longitudes do not fall onto input longitudes. If nlon_out divides nlon_in,
+    there is a single block. If lat_range_out = (start, end) is given, only the filters of these output latitudes are
+    computed, while the indices still refer to the full grids.
 
     The rotation of the Euler angles uses the YZY convention, which applied to the northpole $(0,0,1)^T$ yields
     $$
@@ -203,23 +295,36 @@ def _precompute_convolution_tensor_s2(
     nlat_out, nlon_out = out_shape
 
     lats_in, _ = _precompute_latitudes(nlat_in, grid=grid_in)
-    lats_in = paddle.to_tensor(lats_in).astype(dtype="float32")
     lats_out, _ = _precompute_latitudes(nlat_out, grid=grid_out)
+
+    # restrict the search to the input latitudes which can be reached from each output latitude
+    lat_start, lat_end = _precompute_latitude_bands(lats_in, lats_out, theta_cutoff)
+
+    lats_in = paddle.to_tensor(lats_in).astype(dtype="float32")
     lats_out = paddle.to_tensor(lats_out).astype(dtype="float32")
 
-    # array for accumulating non-zero indices
-    out_idx = paddle.empty([3, 0], dtype="int64")
-    out_vals = paddle.empty([0], dtype="int64")
+    # lists for accumulating non-zero indices
+    out_idx = [paddle.empty([3, 0], dtype="int64")]
+    out_vals = [paddle.empty([0], dtype="float32")]
 
     # compute the phi differences
     # It's imporatant to not include the 2 pi point in the longitudes, as it is equivalent to lon=0
     lons_in = paddle.linspace(0, 2 * math.pi, nlon_in + 1)[:-1]
 
-    for t in range(nlat_out):
+    # one block of filters for each fractional longitude shift of the output grid
+    nblocks = _get_longitude_blocks(nlon_in, nlon_out)
+
+    lat_range_out = (0, nlat_out) if lat_range_out is None else lat_range_out
+
+    for t, r in itertools.product(range(*lat_range_out), range(nblocks)):
+        start, end = int(lat_start[t]), int(lat_end[t])
+        if start == end:
+            continue
+
         # the last angle has a negative sign as it is a passive rotation, which rotates the filter around the y-axis
         alpha = -lats_out[t]
-        beta = lons_in
-        gamma = lats_in.reshape(-1, 1)
+        beta = lons_in - 2 * math.pi * r / nlon_out
+        gamma = lats_in[start:end].reshape(-1, 1)
 
         # compute cartesian coordinates of the rotated position
         # This uses the YZY convention of Euler angles, where the last angle (alpha) is a passive rotation,
@@ -246,29 +351,236 @@ def _precompute_convolution_tensor_s2(
         # find the indices where the rotated position falls into the support of the kernel
         iidx, vals = kernel_handle(theta, phi)
 
-        # add the output latitude and reshape such that psi has dimensions kernel_shape x nlat_out x (nlat_in*nlon_in)
+        # add the output row and reshape such that psi has dimensions kernel_shape x nlat_out * nblocks x (nlat_in*nlon_in)
         idx = paddle.stack(
             [
                 iidx[:, 0],
-                t * paddle.ones_like(iidx[:, 0]),
-                iidx[:, 1] * nlon_in + iidx[:, 2],
+                (t * nblocks + r) * paddle.ones_like(iidx[:, 0]),
+                (iidx[:, 1] + start) * nlon_in + iidx[:, 2],
             ],
             axis=0,
         )
 
         # append indices and values to the COO datastructure
-        out_idx = paddle.concat([out_idx, idx], axis=-1)
-        out_vals = paddle.concat([out_vals, vals], axis=-1)
+        out_idx.append(idx)
+        out_vals.append(vals)
+
+    out_idx = paddle.concat(out_idx, axis=-1)
+    out_vals = paddle.concat(out_vals, axis=-1)
 
     return out_idx, out_vals
 
 
+class _PsiBasis:
+    """
+    Holder for the COO representation of a precomputed filter basis. Layers keep a reference to it, such that
+    the entry in the basis store lives exactly as long as the last layer which uses it.
+    """
+
+    def __init__(self, idx: paddle.Tensor, vals: paddle.Tensor):
+        self.idx = idx
+        self.vals = vals
+        self._vals = {vals.dtype: vals}
+        self._idx_host = None
+        self._psi_mod = {}
+        self._psi_t = {}
+        self._lat_offsets = {}
+        self._psi_chunks = {}
+
+    def get_vals(self, dtype=None):
+        """
+        Returns the values of the basis in the given storage dtype. Low precision copies are cast from the single
+        precision values on first use and then kept together with the basis.
+        """
+        dtype = self.vals.dtype if dtype is None else dtype
+        if dtype not in self._vals:
+            self._vals[dtype] = self.vals.astype(dtype)
+        return self._vals[dtype]
+
+    def get_idx_host(self):
+        """
+        Returns a copy of the indices of the basis on the host, as used by the CPU contraction. It is copied on first
+        use and then kept together with the basis.
+        """
+        if self._idx_host is None:
+            self._idx_host = self.idx.numpy()
+        return self._idx_host
+
+    def get_psi_mod(self, nlat_in: int, nlon_out: int, dtype=None):
+        """
+        Returns the semi-transposed representation of the basis used by the transpose convolution. It is computed on
+        first use and then kept together with the basis.
+        """
+        dtype = self.vals.dtype if dtype is None else dtype
+        key = (nlat_in, nlon_out, dtype)
+        if key not in self._psi_mod:
+            psi_mod_idx, perm = _disco_s2_transpose_psi_mod(self.idx, nlat_in, nlon_out)
+            self._psi_mod[key] = (psi_mod_idx, paddle.gather(self.vals, perm).astype(dtype))
+        return self._psi_mod[key]
+
+    def get_psi_t(self, nlat_in: int, nlon_in: int, nlon_out: int):
+        """
+        Returns the transposed representation of the basis used by the deterministic backward pass, together with the
+        permutation of the values. It is computed on first use and then kept together with the basis.
+        """
+        key = (nlat_in, nlon_in, nlon_out)
+        if key not in self._psi_t:
+            self._psi_t[key] = _disco_s2_transpose_index(self.idx, nlat_in, nlon_in, nlon_out)
+        return self._psi_t[key]
+
+    def get_lat_offsets(self, nlat_out: int, nlon_out: Optional[int] = None):
+        """
+        Returns the offsets of the output latitudes in the non-zero arrays, see _get_latitude_offsets. The output
+        latitudes are the rows of the basis or, if nlon_out is given, the output latitudes of the transpose
+        convolution, by which its semi-transposed representation is sorted. They are computed on first use and then
+        kept together with the basis.
+        """
+        key = (nlat_out, nlon_out)
+        if key not in self._lat_offsets:
+            idx = self.get_idx_host()
+            tout = idx[1] if nlon_out is None else idx[2] // nlon_out
+            self._lat_offsets[key] = _get_latitude_offsets(tout, nlat_out)
+        return self._lat_offsets[key]
+
+    def get_psi_chunks(
+        self, idx: paddle.Tensor, nlat_out: int, max_lats: int, transpose_shape=None
+    ):
+        """
+        Returns the chunks of the basis along the output latitudes used by the chunked triton contraction, see
+        _get_psi_chunks. idx is the index buffer of the calling layer, such that the chunks reside on the device the
+        layer has been moved to. They are computed on first use of the chunk bounds on a device and then kept together
+        with the basis.
+        """
+        key = (str(idx.place), nlat_out, max_lats, transpose_shape)
+        if key not in self._psi_chunks:
+            self._psi_chunks[key] = _get_psi_chunks(
+                idx, self.get_lat_offsets(nlat_out), max_lats, transpose_shape
+            )
+        return self._psi_chunks[key]
+
+
+# store of the precomputed filter bases, keyed by the geometry and the device they were computed for
+_PSI_BASIS_STORE = weakref.WeakValueDictionary()
+
+
+def _get_psi_basis(
+    in_shape,
+    out_shape,
+    kernel_shape,
+    grid_in="equiangular",
+    grid_out="equiangular",
+    theta_cutoff=0.01 * math.pi,
+):
+    """
+    Returns the filter basis for the given geometry on the current device. If another layer already holds a basis with
+    identical geometry on this device, the same tensors are returned, otherwise the basis is computed via
+    _precompute_convolution_tensor_s2 and added to the store.
+    """
+
+    key = (
+        tuple(in_shape),
+        tuple(out_shape),
+        tuple(kernel_shape),
+        grid_in,
+        grid_out,
+        float(theta_cutoff),
+        paddle.get_device(),
+    )
+
+    basis = _PSI_BASIS_STORE.get(key)
+    if basis is None:
+        idx, vals = _precompute_convolution_tensor_s2(
+            in_shape,
+            out_shape,
+            kernel_shape,
+            grid_in=grid_in,
+            grid_out=grid_out,
+            theta_cutoff=theta_cutoff,
+        )
+        basis = _PsiBasis(idx, vals)
+        _PSI_BASIS_STORE[key] = basis
+
+    return basis
+
+
+def _find_neighbors_2d(
+    grid_in: np.ndarray,
+    grid_out: np.ndarray,
+    radius_cutoff: float,
+    periodic: bool = False,
+):
+    """
+    Finds all pairs of input and output points which are potentially within radius_cutoff of each other, using a
+    uniform grid as spatial hash. The cells are at least radius_cutoff wide, such that only the 3x3 neighbouring cells
+    of each output point need to be searched. In the periodic case, the points are assumed to lie in the unit square
+    and the cells wrap around its boundary. Returns the candidate output and input indices, ordered by output point.
+    """
+
+    if periodic:
+        ncells = np.full(2, max(int(math.floor(1.0 / radius_cutoff)), 1), dtype=np.int64)
+        cell_size = 1.0 / ncells[0]
+        origin = np.zeros(2)
+    else:
+        cell_size = radius_cutoff
+        origin = np.minimum(grid_in.min(axis=1), grid_out.min(axis=1))
+        extent = np.maximum(grid_in.max(axis=1), grid_out.max(axis=1)) - origin
+        ncells = np.floor(extent / cell_size).astype(np.int64) + 1
+
+    def _cell_coords(points):
+        coords = np.floor((points - origin[:, None]) / cell_size).astype(np.int64)
+        return np.clip(coords, 0, ncells[:, None] - 1)
+
+    # sort the input points by cell, such that each cell corresponds to a contiguous range
+    cin = _cell_coords(grid_in)
+    keys_in = cin[0] * ncells[1] + cin[1]
+    order = np.argsort(keys_in, kind="stable")
+    keys_in = keys_in[order]
+
+    # offsets of the neighbouring cells. If the periodic domain has less than three cells per dimension, offsets which
+    # wrap around onto the same cell are only considered once
+    if periodic:
+        offsets = [sorted(set(o % n for o in (-1, 0, 1))) for n in ncells]
+    else:
+        offsets = [[-1, 0, 1], [-1, 0, 1]]
+
+    cout = _cell_coords(grid_out)
+    starts, ends = [], []
+    for ox in offsets[0]:
+        for oy in offsets[1]:
+            cx = cout[0] + ox
+            cy = cout[1] + oy
+            if periodic:
+                valid = np.ones_like(cx, dtype=bool)
+                cx, cy = cx % ncells[0], cy % ncells[1]
+            else:
+                valid = (cx >= 0) & (cx < ncells[0]) & (cy >= 0) & (cy < ncells[1])
+            keys_out = cx * ncells[1] + cy
+            start = np.searchsorted(keys_in, keys_out, side="left")
+            end = np.searchsorted(keys_in, keys_out, side="right")
+            starts.append(start)
+            ends.append(np.where(valid, end, start))
+
+    starts = np.stack(starts, axis=1).reshape(-1)
+    ends = np.stack(ends, axis=1).reshape(-1)
+
+    # expand the ranges of all neighbouring cells into the list of candidate pairs
+    counts = ends - starts
+    noffsets = len(offsets[0]) * len(offsets[1])
+    out_idx = np.repeat(np.repeat(np.arange(grid_out.shape[1]), noffsets), counts)
+    pos = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts - starts, counts)
+    in_idx = order[pos]
+
+    return out_idx, in_idx
+
+
 def _precompute_convolution_tensor_2d(
     grid_in, grid_out, kernel_shape, radius_cutoff=0.01, periodic=False
 ):
     """
     Precomputes the translated filters at positions $T^{-1}_j \omega_i = T^{-1}_j T_i \nu$. Similar to the S2 routine,
-    only that it assumes a non-periodic subset of the euclidean plane
+    only that it assumes a subset of the euclidean plane, which is periodic on the unit square if periodic is set.
+    Rather than evaluating all pairs of input and output points, only the pairs found by the neighbour search are
+    considered. The output tensor has shape kernel_shape x n_out x n_in, with the non-zeros ordered by output point.
     """
 
     # check that input arrays are valid point clouds in 2D
@@ -277,9 +589,6 @@ def _precompute_convolution_tensor_2d(
     assert grid_in.shape[0] == 2
     assert grid_out.shape[0] == 2
 
-    n_in = grid_in.shape[-1]
-    n_out = grid_out.shape[-1]
-
     if len(kernel_shape) == 1:
         kernel_handle = partial(
             _compute_support_vals_isotropic,
@@ -298,28 +607,142 @@ def _precompute_convolution_tensor_2d(
     else:
         raise ValueError("kernel_shape should be either one- or two-dimensional.")
 
-    grid_in = grid_in.reshape(2, 1, n_in)
-    grid_out = grid_out.reshape(2, n_out, 1)
+    if isinstance(grid_in, paddle.Tensor):
+        grid_in = grid_in.numpy()
+    if isinstance(grid_out, paddle.Tensor):
+        grid_out = grid_out.numpy()
+    grid_in = np.asarray(grid_in, dtype=np.float64)
+    grid_out = np.asarray(grid_out, dtype=np.float64)
+
+    # restrict the evaluation to pairs of points in neighbouring cells
+    out_idx, in_idx = _find_neighbors_2d(grid_in, grid_out, radius_cutoff, periodic=periodic)
 
-    diffs = grid_in - grid_out
+    diffs = grid_in[:, in_idx] - grid_out[:, out_idx]
     if periodic:
-        periodic_diffs = paddle.where(diffs > 0.0, diffs - 1, diffs + 1)
-        diffs = paddle.where(diffs.abs() < periodic_diffs.abs(), diffs, periodic_diffs)
+        periodic_diffs = np.where(diffs > 0.0, diffs - 1, diffs + 1)
+        diffs = np.where(np.abs(diffs) < np.abs(periodic_diffs), diffs, periodic_diffs)
 
-    r = paddle.sqrt(diffs[0] ** 2 + diffs[1] ** 2)
-    phi = paddle.atan2(diffs[1], diffs[0]) + np.pi
+    r = paddle.to_tensor(np.sqrt(diffs[0] ** 2 + diffs[1] ** 2)).astype("float32").reshape([1, -1])
+    phi = (
+        paddle.to_tensor(np.arctan2(diffs[1], diffs[0]) + np.pi).astype("float32").reshape([1, -1])
+    )
+
+    iidx, vals = kernel_handle(r, phi)
+    if iidx.shape[0] == 0:
+        return paddle.empty([3, 0], dtype="int64"), vals
+
+    # map the candidate pairs back to the points and order the non-zeros by output point and kernel index
+    ikernel = iidx[:, 0].numpy()
+    ipair = iidx[:, 2].numpy()
+    iout = out_idx[ipair]
+    iin = in_idx[ipair]
+    perm = np.lexsort((iin, ikernel, iout))
 
-    idx, vals = kernel_handle(r, phi)
-    idx = idx.permute(1, 0)
+    idx = paddle.to_tensor(np.stack([ikernel[perm], iout[perm], iin[perm]], axis=0)).astype("int64")
+    vals = paddle.gather(vals, paddle.to_tensor(perm))
 
     return idx, vals
 
 
+def _get_contraction_flops(
+    batch_size: int,
+    in_channels: int,
+    out_channels: int,
+    groups: int,
+    kernel_size: int,
+    nnz: int,
+    nlon: int,
+    npoints_in: int,
+    npoints_out: int,
+):
+    """
+    Returns the floating point operations of the sparse contraction with psi and of the dense contraction with the
+    weights for both orders of the contractions. Psi-first applies psi to all in_channels and keeps the kernel
+    dimension, before the weights are applied on the npoints_out points of the output grid. Weights-first applies the
+    weights on the npoints_in points of the input grid, such that psi is applied to out_channels and sums over the
+    kernel dimension. Each of the nnz non-zeros of psi is applied to nlon longitudes.
+    """
+
+    groupsize = in_channels // groups
+    dense_flops = 2 * batch_size * out_channels * groupsize * kernel_size
+
+    return {
+        "psi_first": (2 * nnz * nlon * batch_size * in_channels, dense_flops * npoints_out),
+        "weights_first": (2 * nnz * nlon * batch_size * out_channels, dense_flops * npoints_in),
+    }
+
+
+def _get_contraction_memory(
+    batch_size: int,
+    in_channels: int,
+    out_channels: int,
+    kernel_size: int,
+    npoints_in: int,
+    npoints_out: int,
+):
+    """
+    Returns the number of elements of the intermediate tensor between the two contractions for both orders. Psi-first
+    keeps the kernel dimension of all in_channels on the output grid, weights-first the kernel dimension of all
+    out_channels on the input grid. Fused implementations may only hold a part of it at a time.
+    """
+    return {
+        "psi_first": batch_size * in_channels * kernel_size * npoints_out,
+        "weights_first": batch_size * out_channels * kernel_size * npoints_in,
+    }
+
+
+def _get_contraction_order(
+    batch_size: int,
+    in_channels: int,
+    out_channels: int,
+    groups: int,
+    kernel_size: int,
+    nnz: int,
+    nlon: int,
+    npoints_in: int,
+    npoints_out: int,
+    max_intermediate: Optional[int] = None,
+):
+    """
+    Selects the cheaper order of the sparse contraction with psi and the dense contraction with the weights, based on
+    their floating point operations as given by _get_contraction_flops. If max_intermediate is given, only orders
+    whose intermediate tensor has at most this many elements are considered. If there is none, the order with the
+    smaller intermediate tensor is selected.
+    """
+
+    flops = _get_contraction_flops(
+        batch_size,
+        in_channels,
+        out_channels,
+        groups,
+        kernel_size,
+        nnz,
+        nlon,
+        npoints_in,
+        npoints_out,
+    )
+    orders = ["psi_first", "weights_first"]
+
+    if max_intermediate is not None:
+        memory = _get_contraction_memory(
+            batch_size, in_channels, out_channels, kernel_size, npoints_in, npoints_out
+        )
+        feasible = [order for order in orders if memory[order] <= max_intermediate]
+        if not feasible:
+            return min(orders, key=memory.get)
+        orders = feasible
+
+    return min(orders, key=lambda order: sum(flops[order]))
+
+
 class DiscreteContinuousConv(nn.Layer, metaclass=abc.ABCMeta):
     """
     Abstract base class for DISCO convolutions
     """
 
+    # bytes the intermediate tensor between the contractions may take up when the order is selected automatically
+    contraction_memory_budget: Optional[int] = 2**30
+
     def __init__(
         self,
         in_channels: int,
@@ -327,9 +750,16 @@ class DiscreteContinuousConv(nn.Layer, metaclass=abc.ABCMeta):
         kernel_shape: Union[int, List[int]],
         groups: Optional[int] = 1,
         bias: Optional[bool] = True,
+        precision: Optional[str] = None,
     ):
         super().__init__()
 
+        # storage precision of the activations and the filter basis. The contractions always accumulate in at least
+        # single precision and the weights are kept in single precision.
+        if precision not in [None, "float32", "bfloat16", "float16"]:
+            raise ValueError(f"Unknown precision {precision}.")
+        self.precision = precision
+
         if isinstance(kernel_shape, int):
             self.kernel_shape = [kernel_shape]
         else:
@@ -367,35 +797,262 @@ class DiscreteContinuousConv(nn.Layer, metaclass=abc.ABCMeta):
         else:
             self.bias = None
 
+        # wall-clock profiling of the forward calls, see enable_profiling
+        self.profile_records = []
+        self._profiling_hooks = None
+
+    def get_basis_dtype(self):
+        """
+        Returns the dtype in which the values of the filter basis are stored.
+        """
+        return paddle.float32 if self.precision is None else getattr(paddle, self.precision)
+
+    def _cast_input(self, x: paddle.Tensor):
+        if self.precision is None:
+            return x
+        dtype = getattr(paddle, self.precision)
+        return x if x.dtype == dtype else x.astype(dtype)
+
+    def _weight_contraction(self, equation: str, x: paddle.Tensor, weight: paddle.Tensor):
+        # the contraction with the weights is carried out in the precision of the weights
+        out = paddle.einsum(
+            equation, x.astype(weight.dtype) if x.dtype != weight.dtype else x, weight
+        )
+        return out if out.dtype == x.dtype else out.astype(x.dtype)
+
+    def _add_bias(self, out: paddle.Tensor):
+        if self.bias is None:
+            return out
+        # the bias is added in the precision of the weights, as low precision arithmetic is not available everywhere
+        bias = self.bias.reshape([1, -1] + [1] * (len(out.shape) - 2))
+        return _to_dtype(_to_dtype(out, bias.dtype) + bias, out.dtype)
+
+    def get_contraction_order(self, batch_size: int, nlon: int, npoints_in: int, npoints_out: int):
+        """
+        Returns the order in which psi and the weights are applied, either as set at construction or, if set to "auto",
+        selected per call by _get_contraction_order within the contraction_memory_budget of the layer.
+        """
+        if self.contraction_order != "auto":
+            return self.contraction_order
+
+        max_intermediate = None
+        if self.contraction_memory_budget is not None:
+            max_intermediate = self.contraction_memory_budget // self._get_activation_size()
+
+        out_channels, groupsize, _ = self.weight.shape
+        return _get_contraction_order(
+            batch_size,
+            groupsize * self.groups,
+            out_channels,
+            self.groups,
+            self.kernel_size,
+            self.psi_idx.shape[-1],
+            nlon,
+            npoints_in,
+            npoints_out,
+            max_intermediate=max_intermediate,
+        )
+
+    def _get_activation_size(self):
+        # bytes per element of the activations and intermediate tensors
+        return paddle.finfo(self.get_basis_dtype()).bits // 8
+
+    @abc.abstractmethod
+    def get_psi_shape(self):
+        """
+        Returns the dense shape (kernel_size, rows, columns) of the filter basis.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def _get_problem_size(self):
+        """
+        Returns the number of longitudes each non-zero of psi is applied to and the number of points of the input and
+        output grids, as seen by the contractions.
+        """
+        raise NotImplementedError
+
+    def get_basis_stats(self):
+        """
+        Returns statistics of the sparsity of the filter basis. nnz_per_row and density_per_row hold the number and the
+        fraction of non-zeros in each row of the basis for every kernel index, where the rows are the output latitudes
+        (or points) of the layer, see get_psi. Rows which cover a large part of the input grid, as caused by a large
+        theta_cutoff near the poles, dominate the cost of the contraction.
+        """
+        kernel_size, nrows, ncols = self.get_psi_shape()
+        idx = self.psi_idx.numpy()
+        nnz_per_row = np.bincount(idx[0] * nrows + idx[1], minlength=kernel_size * nrows)
+        nnz_per_row = nnz_per_row.reshape(kernel_size, nrows)
+
+        return {
+            "nnz": int(idx.shape[1]),
+            "density": idx.shape[1] / (kernel_size * nrows * ncols),
+            "nnz_per_row": nnz_per_row,
+            "density_per_row": nnz_per_row / ncols,
+            "min_nnz_per_row": int(nnz_per_row.min()),
+            "max_nnz_per_row": int(nnz_per_row.max()),
+            "mean_nnz_per_row": float(nnz_per_row.mean()),
+        }
+
+    def get_flops(self, batch_size: int, contraction_order: Optional[str] = None):
+        """
+        Returns the theoretical floating point operations of the forward and backward pass for the given batch size.
+        Unless given, the contraction order is the one selected for the call. The backward pass repeats both
+        contractions for the gradient of the input and the dense contraction for the gradient of the weights.
+        """
+        nlon, npoints_in, npoints_out = self._get_problem_size()
+        if contraction_order is None:
+            contraction_order = self.get_contraction_order(
+                batch_size, nlon, npoints_in, npoints_out
+            )
+
+        out_channels, groupsize, _ = self.weight.shape
+        sparse_flops, dense_flops = _get_contraction_flops(
+            batch_size,
+            groupsize * self.groups,
+            out_channels,
+            self.groups,
+            self.kernel_size,
+            self.psi_idx.shape[-1],
+            nlon,
+            npoints_in,
+            npoints_out,
+        )[contraction_order]
+
+        return {
+            "forward": sparse_flops + dense_flops,
+            "backward": sparse_flops + 2 * dense_flops,
+        }
+
+    def get_bytes(self, batch_size: int, contraction_order: Optional[str] = None):
+        """
+        Returns an estimate of the bytes moved from and to memory by the forward and backward pass for the given batch
+        size. The estimate assumes that the intermediate tensor between the two contractions is written and read once,
+        which is an upper bound for the fused implementations.
+        """
+        nlon, npoints_in, npoints_out = self._get_problem_size()
+        if contraction_order is None:
+            contraction_order = self.get_contraction_order(
+                batch_size, nlon, npoints_in, npoints_out
+            )
+
+        out_channels, groupsize, _ = self.weight.shape
+        in_channels = groupsize * self.groups
+        act_size = self._get_activation_size()
+
+        x_bytes = batch_size * in_channels * npoints_in * act_size
+        y_bytes = batch_size * out_channels * npoints_out * act_size
+        psi_bytes = self.psi_idx.shape[-1] * (
+            self.psi_idx.shape[0] * self.psi_idx.element_size() + self.psi_vals.element_size()
+        )
+        w_bytes = self.weight.numel().item() * self.weight.element_size()
+        tmp_bytes = (
+            _get_contraction_memory(
+                batch_size, in_channels, out_channels, self.kernel_size, npoints_in, npoints_out
+            )[contraction_order]
+            * act_size
+        )
+
+        # the backward pass reads the output gradient and the input, writes the input gradient and the weight gradient
+        return {
+            "forward": x_bytes + y_bytes + psi_bytes + w_bytes + 2 * tmp_bytes,
+            "backward": 2 * x_bytes + y_bytes + psi_bytes + 2 * w_bytes + 2 * tmp_bytes,
+        }
+
+    def _get_profiled_work(self, x: paddle.Tensor):
+        # theoretical FLOPs and bytes of the forward pass of a call with input x
+        return self.get_flops(x.shape[0])["forward"], self.get_bytes(x.shape[0])["forward"]
+
+    def enable_profiling(self):
+        """
+        Records the wall-clock time of every subsequent forward call in profile_records, together with the input
+        shape, the theoretical FLOPs and bytes and the resulting throughput. The device is synchronized before and
+        after each call, which serializes the execution and should be kept out of production runs.
+        """
+        if self._profiling_hooks is not None:
+            return
+
+        self._profiling_hooks = (
+            self.register_forward_pre_hook(_profiling_pre_hook),
+            self.register_forward_post_hook(_profiling_post_hook),
+        )
+
+    def disable_profiling(self):
+        """
+        Stops recording the forward calls. The records are kept until reset_profiling is called.
+        """
+        if self._profiling_hooks is None:
+            return
+
+        for hook in self._profiling_hooks:
+            hook.remove()
+        self._profiling_hooks = None
+
+    def reset_profiling(self):
+        self.profile_records = []
+
     @abc.abstractmethod
     def forward(self, x: paddle.Tensor):
         raise NotImplementedError
 
 
-class DiscreteContinuousConvS2(DiscreteContinuousConv):
-    """
-    Discrete-continuous convolutions (DISCO) on the 2-Sphere as described in [1].
+def _synchronize():
+    if paddle.is_compiled_with_cuda():
+        paddle.device.synchronize()
 
-    [1] Ocampo, Price, McEwen, Scalable and equivariant spherical CNNs by discrete-continuous (DISCO) convolutions, ICLR (2023), arXiv:2209.13603
+
+def _profiling_pre_hook(layer: DiscreteContinuousConv, inputs):
+    _synchronize()
+    layer._profiling_start = time.perf_counter()
+
+
+def _profiling_post_hook(layer: DiscreteContinuousConv, inputs, output):
+    _synchronize()
+    elapsed = time.perf_counter() - layer._profiling_start
+
+    x = inputs[0]
+    xs = list(x) if isinstance(x, (list, tuple)) else [x]
+    flops = 0
+    nbytes = 0
+    for xi in xs:
+        xi_flops, xi_bytes = layer._get_profiled_work(xi)
+        flops += xi_flops
+        nbytes += xi_bytes
+
+    layer.profile_records.append(
+        {
+            "input_shape": [list(xi.shape) for xi in xs] if len(xs) > 1 else list(xs[0].shape),
+            "time": elapsed,
+            "flops": flops,
+            "bytes": nbytes,
+            "flops_per_second": flops / elapsed,
+            "bytes_per_second": nbytes / elapsed,
+        }
+    )
+
+
+class _DiscreteContinuousBasisS2Mixin:
+    """
+    Filter basis of the DISCO convolution on the 2-Sphere between a pair of grids, registered as buffers of the layer
+    which holds it. The layer provides kernel_shape and kernel_size.
     """
 
-    def __init__(
+    def _init_basis(
         self,
-        in_channels: int,
-        out_channels: int,
         in_shape: Tuple[int],
         out_shape: Tuple[int],
-        kernel_shape: Union[int, List[int]],
-        groups: Optional[int] = 1,
         grid_in: Optional[str] = "equiangular",
         grid_out: Optional[str] = "equiangular",
-        bias: Optional[bool] = True,
         theta_cutoff: Optional[float] = None,
+        deterministic: Optional[bool] = False,
+        basis_dtype=paddle.float32,
     ):
-        super().__init__(in_channels, out_channels, kernel_shape, groups, bias)
-
         self.nlat_in, self.nlon_in = in_shape
         self.nlat_out, self.nlon_out = out_shape
+        self.deterministic = deterministic
+
+        # number of fractional longitude shifts between the grids, see _get_longitude_blocks
+        self.lon_blocks = _get_longitude_blocks(self.nlon_in, self.nlon_out)
 
         # compute theta cutoff based on the bandlimit of the input field
         if theta_cutoff is None:
@@ -414,7 +1071,8 @@ class DiscreteContinuousConvS2(DiscreteContinuousConv):
         )
         self.register_buffer("quad_weights", quad_weights, persistable=False)
 
-        idx, vals = _precompute_convolution_tensor_s2(
+        # layers with identical geometry share the same basis tensors
+        self._psi_basis = _get_psi_basis(
             in_shape,
             out_shape,
             self.kernel_shape,
@@ -423,44 +1081,235 @@ class DiscreteContinuousConvS2(DiscreteContinuousConv):
             theta_cutoff=theta_cutoff,
         )
 
-        self.register_buffer("psi_idx", idx, persistable=False)
-        self.register_buffer("psi_vals", vals, persistable=False)
+        self.register_buffer("psi_idx", self._psi_basis.idx, persistable=False)
+        self.register_buffer("psi_vals", self._psi_basis.get_vals(basis_dtype), persistable=False)
+        self.psi_idx_host = self._psi_basis.get_idx_host()
+        self.psi_lat_offsets = self._psi_basis.get_lat_offsets(self.nlat_out * self.lon_blocks)
+
+        # transposed basis for the atomic-free backward pass of the triton kernel
+        if self.deterministic:
+            psi_t_ptr, psi_t_idx, psi_t_perm = self._psi_basis.get_psi_t(
+                self.nlat_in, self.nlon_in, self.nlon_out // self.lon_blocks
+            )
+            self.register_buffer("psi_t_ptr", psi_t_ptr, persistable=False)
+            self.register_buffer("psi_t_idx", psi_t_idx, persistable=False)
+            self.register_buffer("psi_t_perm", psi_t_perm, persistable=False)
+
+    def get_psi_vals(self):
+        """
+        Returns the values of the filter basis with the quadrature weights of the input grid folded in, such that
+        the input does not have to be pre-multiplied with them.
+        """
+        vals = _to_dtype(self.psi_vals, paddle.float32)
+        vals = vals * self.quad_weights.reshape([-1])[self.psi_idx[2] // self.nlon_in]
+        return _to_dtype(vals, self.psi_vals.dtype)
+
+    def get_psi_t_vals(self):
+        """
+        Returns the values of the transposed filter basis with the quadrature weights of the input grid folded in.
+        """
+        return paddle.gather(self.get_psi_vals(), self.psi_t_perm)
+
+    def get_psi_chunks(self, max_lats: int):
+        """
+        Returns the chunks of at most max_lats output rows of the filter basis for the chunked triton contraction,
+        which carry their transposed index if the layer is deterministic.
+        """
+        nlon_out = self.nlon_out // self.lon_blocks
+        transpose_shape = (self.nlat_in, self.nlon_in, nlon_out) if self.deterministic else None
+        return self._psi_basis.get_psi_chunks(
+            self.psi_idx, self.nlat_out * self.lon_blocks, max_lats, transpose_shape
+        )
+
+    def get_psi_shape(self):
+        return self.kernel_size, self.nlat_out * self.lon_blocks, self.nlat_in * self.nlon_in
+
+    def _get_problem_size(self):
+        return (
+            self.nlon_out // self.lon_blocks,
+            self.nlat_in * self.nlon_in,
+            self.nlat_out * self.nlon_out,
+        )
 
     def get_psi(self):
         psi = paddle.sparse.sparse_coo_tensor(
-            self.psi_idx,
-            self.psi_vals,
-            shape=(self.kernel_size, self.nlat_out, self.nlat_in * self.nlon_in),
+            self.psi_idx, self.get_psi_vals(), shape=self.get_psi_shape()
         ).coalesce()
         return psi
 
-    def forward(self, x: paddle.Tensor, use_triton_kernel: bool = True) -> paddle.Tensor:
-        # pre-multiply x with the quadrature weights
-        x = self.quad_weights * x
 
-        psi = self.get_psi()
+class _DiscreteContinuousBasisS2(_DiscreteContinuousBasisS2Mixin, nn.Layer):
+    """
+    Layer which only holds the filter basis of a DISCO convolution on the 2-Sphere, without weights.
+    """
+
+    def __init__(
+        self,
+        in_shape: Tuple[int],
+        out_shape: Tuple[int],
+        kernel_shape: List[int],
+        kernel_size: int,
+        grid_in: Optional[str] = "equiangular",
+        grid_out: Optional[str] = "equiangular",
+        theta_cutoff: Optional[float] = None,
+        basis_dtype=paddle.float32,
+    ):
+        super().__init__()
+
+        self.kernel_shape = kernel_shape
+        self.kernel_size = kernel_size
+        self._init_basis(
+            in_shape,
+            out_shape,
+            grid_in=grid_in,
+            grid_out=grid_out,
+            theta_cutoff=theta_cutoff,
+            basis_dtype=basis_dtype,
+        )
+
+
+def _disco_s2_forward(
+    conv: DiscreteContinuousConv, basis, x: paddle.Tensor, use_triton_kernel: bool = True
+):
+    """
+    Applies the DISCO convolution on the 2-Sphere with the weights of conv and the filter basis held by basis, which
+    may be conv itself. The bias is not added.
+    """
+
+    # the contraction sees one output row per output latitude and longitude block
+    nlat_out = basis.nlat_out * basis.lon_blocks
+    nlon_out = basis.nlon_out // basis.lon_blocks
+    weight = conv.weight.reshape([conv.groups, -1, conv.weight.shape[1], conv.weight.shape[2]])
 
-        if x.place.is_gpu_place() and use_triton_kernel:
-            x = _disco_s2_contraction_triton(x, psi, self.nlon_out)
+    contraction_order = conv.get_contraction_order(
+        x.shape[0],
+        nlon_out,
+        basis.nlat_in * basis.nlon_in,
+        basis.nlat_out * basis.nlon_out,
+    )
+
+    if contraction_order == "weights_first":
+        # contract with the weights on the input grid first, which is cheaper for narrow outputs
+        B, C, H, W = x.shape
+        x = conv._weight_contraction(
+            "bgcxy,gock->bgokxy", x.reshape([B, conv.groups, conv.groupsize, H, W]), weight
+        )
+        x = x.reshape([B, -1, conv.kernel_size, H, W])
+        out = _disco_s2_contraction_ksum(
+            x, basis.psi_idx, basis.get_psi_vals(), nlat_out, nlon_out, basis.psi_lat_offsets
+        )
+    elif (
+        x.place.is_gpu_place()
+        and use_triton_kernel
+        and x.shape[0] * x.shape[1] * conv.kernel_size * nlat_out * nlon_out > MAX_CHUNK_ELEMENTS
+    ):
+        # the intermediate with the kernel dimension exceeds the chunk budget, so it is only formed chunk by chunk
+        max_lats = max(
+            1, MAX_CHUNK_ELEMENTS // (x.shape[0] * x.shape[1] * conv.kernel_size * nlon_out)
+        )
+        out = _disco_s2_contraction_triton_chunked(
+            x,
+            conv.weight,
+            basis.get_psi_vals(),
+            basis.get_psi_chunks(max_lats),
+            nlat_out,
+            nlon_out,
+            conv.groups,
+        )
+    elif x.place.is_gpu_place() and use_triton_kernel:
+        psi = basis.get_psi()
+        if basis.deterministic:
+            x = _disco_s2_contraction_triton_deterministic(
+                x, psi, basis.psi_t_ptr, basis.psi_t_idx, basis.get_psi_t_vals(), nlon_out
+            )
         else:
-            x = _disco_s2_contraction_paddle(x, psi, self.nlon_out)
+            x = _disco_s2_contraction_triton(x, psi, nlon_out)
 
         # extract shape
         B, C, K, H, W = x.shape
-        x = x.reshape(B, self.groups, self.groupsize, K, H, W)
+        x = x.reshape([B, conv.groups, conv.groupsize, K, H, W])
 
         # do weight multiplication
-        out = paddle.einsum(
-            "bgckxy,gock->bgoxy",
+        out = conv._weight_contraction("bgckxy,gock->bgoxy", x, weight)
+        out = out.reshape([out.shape[0], -1, out.shape[-2], out.shape[-1]])
+    elif x.place.is_cpu_place():
+        # multi-threaded implementation of the fused contraction
+        out = _disco_s2_contraction_cpu(
             x,
-            self.weight.reshape(self.groups, -1, self.weight.shape[1], self.weight.shape[2]),
+            conv.weight,
+            basis.psi_idx,
+            basis.get_psi_vals(),
+            nlat_out,
+            nlon_out,
+            conv.groups,
+            psi_idx_host=basis.psi_idx_host,
+            lat_offsets=basis.psi_lat_offsets,
+        )
+    else:
+        # quadrature, sparse contraction and weight multiplication in one go
+        out = _disco_s2_contraction_fused(
+            x,
+            conv.weight,
+            basis.psi_idx,
+            basis.get_psi_vals(),
+            nlat_out,
+            nlon_out,
+            conv.groups,
+            lat_offsets=basis.psi_lat_offsets,
         )
-        out = out.reshape(out.shape[0], -1, out.shape[-2], out.shape[-1])
 
-        if self.bias is not None:
-            out = out + self.bias.reshape(1, -1, 1, 1)
+    # interleave the longitude blocks, output longitude q * lon_blocks + r is held by row t * lon_blocks + r
+    if basis.lon_blocks > 1:
+        B, O = out.shape[:2]
+        out = out.reshape([B, O, basis.nlat_out, basis.lon_blocks, nlon_out])
+        out = out.transpose([0, 1, 2, 4, 3]).reshape([B, O, basis.nlat_out, basis.nlon_out])
 
-        return out
+    return out
+
+
+class DiscreteContinuousConvS2(_DiscreteContinuousBasisS2Mixin, DiscreteContinuousConv):
+    """
+    Discrete-continuous convolutions (DISCO) on the 2-Sphere as described in [1].
+
+    [1] Ocampo, Price, McEwen, Scalable and equivariant spherical CNNs by discrete-continuous (DISCO) convolutions, ICLR (2023), arXiv:2209.13603
+    """
+
+    def __init__(
+        self,
+        in_channels: int,
+        out_channels: int,
+        in_shape: Tuple[int],
+        out_shape: Tuple[int],
+        kernel_shape: Union[int, List[int]],
+        groups: Optional[int] = 1,
+        grid_in: Optional[str] = "equiangular",
+        grid_out: Optional[str] = "equiangular",
+        bias: Optional[bool] = True,
+        theta_cutoff: Optional[float] = None,
+        deterministic: Optional[bool] = False,
+        contraction_order: Optional[str] = "auto",
+        precision: Optional[str] = None,
+    ):
+        super().__init__(in_channels, out_channels, kernel_shape, groups, bias, precision)
+
+        if contraction_order not in ["auto", "psi_first", "weights_first"]:
+            raise ValueError(f"Unknown contraction order {contraction_order}.")
+        self.contraction_order = contraction_order
+
+        self._init_basis(
+            in_shape,
+            out_shape,
+            grid_in=grid_in,
+            grid_out=grid_out,
+            theta_cutoff=theta_cutoff,
+            deterministic=deterministic,
+            basis_dtype=self.get_basis_dtype(),
+        )
+
+    def forward(self, x: paddle.Tensor, use_triton_kernel: bool = True) -> paddle.Tensor:
+        x = self._cast_input(x)
+        out = _disco_s2_forward(self, self, x, use_triton_kernel)
+        return self._add_bias(out)
 
 
 class DiscreteContinuousConvTransposeS2(DiscreteContinuousConv):
@@ -482,12 +1331,21 @@ class DiscreteContinuousConvTransposeS2(DiscreteContinuousConv):
         grid_out: Optional[str] = "equiangular",
         bias: Optional[bool] = True,
         theta_cutoff: Optional[float] = None,
+        contraction_order: Optional[str] = "auto",
+        precision: Optional[str] = None,
     ):
-        super().__init__(in_channels, out_channels, kernel_shape, groups, bias)
+        super().__init__(in_channels, out_channels, kernel_shape, groups, bias, precision)
 
         self.nlat_in, self.nlon_in = in_shape
         self.nlat_out, self.nlon_out = out_shape
 
+        # number of fractional longitude shifts between the grids of the corresponding forward convolution
+        self.lon_blocks = _get_longitude_blocks(self.nlon_out, self.nlon_in)
+
+        if contraction_order not in ["auto", "psi_first", "weights_first"]:
+            raise ValueError(f"Unknown contraction order {contraction_order}.")
+        self.contraction_order = contraction_order
+
         # bandlimit
         if theta_cutoff is None:
             theta_cutoff = (self.kernel_shape[0] + 1) * np.pi / float(self.nlat_in - 1)
@@ -506,7 +1364,7 @@ class DiscreteContinuousConvTransposeS2(DiscreteContinuousConv):
         self.register_buffer("quad_weights", quad_weights, persistable=False)
 
         # switch in_shape and out_shape since we want transpose conv
-        idx, vals = _precompute_convolution_tensor_s2(
+        self._psi_basis = _get_psi_basis(
             out_shape,
             in_shape,
             self.kernel_shape,
@@ -515,41 +1373,368 @@ class DiscreteContinuousConvTransposeS2(DiscreteContinuousConv):
             theta_cutoff=theta_cutoff,
         )
 
-        self.register_buffer("psi_idx", idx, persistable=False)
-        self.register_buffer("psi_vals", vals, persistable=False)
+        self.register_buffer("psi_idx", self._psi_basis.idx, persistable=False)
+        self.register_buffer(
+            "psi_vals", self._psi_basis.get_vals(self.get_basis_dtype()), persistable=False
+        )
+
+        # semi-transposed basis for the fused transpose contraction
+        psi_mod_idx, psi_mod_vals = self._psi_basis.get_psi_mod(
+            self.nlat_in * self.lon_blocks, self.nlon_out, self.get_basis_dtype()
+        )
+        self.register_buffer("psi_mod_idx", psi_mod_idx, persistable=False)
+        self.register_buffer("psi_mod_vals", psi_mod_vals, persistable=False)
+        self.psi_mod_lat_offsets = self._psi_basis.get_lat_offsets(self.nlat_out, self.nlon_out)
+
+    def get_psi_vals(self):
+        """
+        Returns the values of the filter basis with the quadrature weights of the input grid folded in, such that
+        the input does not have to be pre-multiplied with them.
+        """
+        vals = (
+            _to_dtype(self.psi_vals, paddle.float32)
+            * self.quad_weights.reshape([-1])[self.psi_idx[1] // self.lon_blocks]
+        )
+        return _to_dtype(vals, self.psi_vals.dtype)
+
+    def get_psi_mod_vals(self):
+        """
+        Returns the values of the semi-transposed filter basis with the quadrature weights of the input grid folded in.
+        """
+        vals = _to_dtype(self.psi_mod_vals, paddle.float32)
+        tin = self.psi_mod_idx[0] % (self.nlat_in * self.lon_blocks) // self.lon_blocks
+        vals = vals * self.quad_weights.reshape([-1])[tin]
+        return _to_dtype(vals, self.psi_mod_vals.dtype)
+
+    def get_psi_shape(self):
+        return self.kernel_size, self.nlat_in * self.lon_blocks, self.nlat_out * self.nlon_out
+
+    def _get_problem_size(self):
+        return (
+            self.nlon_in // self.lon_blocks,
+            self.nlat_in * self.nlon_in,
+            self.nlat_out * self.nlon_out,
+        )
 
     def get_psi(self):
         psi = paddle.sparse.sparse_coo_tensor(
-            self.psi_idx,
-            self.psi_vals,
-            shape=(self.kernel_size, self.nlat_in, self.nlat_out * self.nlon_out),
+            self.psi_idx, self.get_psi_vals(), shape=self.get_psi_shape()
         ).coalesce()
         return psi
 
     def forward(self, x: paddle.Tensor, use_triton_kernel: bool = True) -> paddle.Tensor:
+        x = self._cast_input(x)
+
+        # split the input longitudes into blocks, such that input longitude q * lon_blocks + r is held by row
+        # t * lon_blocks + r of the basis
+        if self.lon_blocks > 1:
+            B, C, H, W = x.shape
+            x = x.reshape([B, C, H, W // self.lon_blocks, self.lon_blocks])
+            x = x.transpose([0, 1, 2, 4, 3]).reshape(
+                [B, C, H * self.lon_blocks, W // self.lon_blocks]
+            )
+
         # extract shape
         B, C, H, W = x.shape
         x = x.reshape(B, self.groups, self.groupsize, H, W)
+        weight = self.weight.reshape(self.groups, -1, self.weight.shape[1], self.weight.shape[2])
 
-        # do weight multiplication
-        x = paddle.einsum(
-            "bgcxy,gock->bgokxy",
-            x,
-            self.weight.reshape(self.groups, -1, self.weight.shape[1], self.weight.shape[2]),
+        contraction_order = self.get_contraction_order(
+            B, W, self.nlat_in * self.nlon_in, self.nlat_out * self.nlon_out
         )
-        x = x.reshape(x.shape[0], -1, x.shape[-3], x.shape[-2], x.shape[-1])
 
-        # pre-multiply x with the quadrature weights
-        x = self.quad_weights * x
+        if contraction_order == "psi_first":
+            # scatter the input channels for each kernel index, then contract with the weights on the output grid,
+            # which is cheaper for wide outputs
+            x = _disco_s2_transpose_contraction_fused(
+                x.reshape([B, C, H, W]),
+                self.psi_mod_idx,
+                self.get_psi_mod_vals(),
+                self.nlat_out,
+                self.nlon_out,
+                kernel_size=self.kernel_size,
+                lat_offsets=self.psi_mod_lat_offsets,
+            )
+            x = x.reshape(
+                [B, self.groups, self.groupsize, self.kernel_size, self.nlat_out, self.nlon_out]
+            )
+            out = self._weight_contraction("bgckxy,gock->bgoxy", x, weight)
+            out = out.reshape([B, -1, self.nlat_out, self.nlon_out])
+        else:
+            # do weight multiplication
+            x = self._weight_contraction("bgcxy,gock->bgokxy", x, weight)
+            x = x.reshape(x.shape[0], -1, x.shape[-3], x.shape[-2], x.shape[-1])
+
+            if x.place.is_gpu_place() and use_triton_kernel:
+                psi = self.get_psi()
+                out = _disco_s2_transpose_contraction_triton(x, psi, self.nlon_out)
+            else:
+                # scatter directly from the compact input using the semi-transposed basis
+                out = _disco_s2_transpose_contraction_fused(
+                    x,
+                    self.psi_mod_idx,
+                    self.get_psi_mod_vals(),
+                    self.nlat_out,
+                    self.nlon_out,
+                    lat_offsets=self.psi_mod_lat_offsets,
+                )
+
+        return self._add_bias(out)
+
+
+class DiscreteContinuousConv2d(DiscreteContinuousConv):
+    """
+    Discrete-continuous convolutions (DISCO) on unstructured point clouds in the plane, as described in [1] for the
+    2-Sphere. Input and output are given at arbitrary points, such that the layer maps tensors of shape
+    (batch, in_channels, n_in) to (batch, out_channels, n_out).
 
-        psi = self.get_psi()
+    [1] Ocampo, Price, McEwen, Scalable and equivariant spherical CNNs by discrete-continuous (DISCO) convolutions, ICLR (2023), arXiv:2209.13603
+    """
 
-        if x.place.is_gpu_place() and use_triton_kernel:
-            out = _disco_s2_transpose_contraction_triton(x, psi, self.nlon_out)
+    def __init__(
+        self,
+        in_channels: int,
+        out_channels: int,
+        grid_in: Union[paddle.Tensor, np.ndarray],
+        grid_out: Union[paddle.Tensor, np.ndarray],
+        kernel_shape: Union[int, List[int]],
+        quadrature_weights: Optional[Union[paddle.Tensor, np.ndarray]] = None,
+        periodic: Optional[bool] = False,
+        groups: Optional[int] = 1,
+        bias: Optional[bool] = True,
+        radius_cutoff: Optional[float] = None,
+        precision: Optional[str] = None,
+    ):
+        super().__init__(in_channels, out_channels, kernel_shape, groups, bias, precision)
+
+        self.n_in = grid_in.shape[-1]
+        self.n_out = grid_out.shape[-1]
+
+        # compute the cutoff radius based on the average spacing of the input points
+        if radius_cutoff is None:
+            radius_cutoff = (self.kernel_shape[0] + 1) / math.sqrt(float(self.n_in))
+
+        if radius_cutoff <= 0.0:
+            raise ValueError("Error, radius_cutoff has to be positive.")
+
+        # integration weights, which default to uniform weights on the unit square
+        if quadrature_weights is None:
+            quad_weights = paddle.full([self.n_in], 1.0 / self.n_in, dtype="float32")
         else:
-            out = _disco_s2_transpose_contraction_paddle(x, psi, self.nlon_out)
+            quad_weights = (
+                paddle.to_tensor(quadrature_weights).astype(dtype="float32").reshape([-1])
+            )
+            if quad_weights.shape[0] != self.n_in:
+                raise ValueError(
+                    "Error, the number of quadrature weights has to match the input points."
+                )
+        self.register_buffer("quad_weights", quad_weights, persistable=False)
 
-        if self.bias is not None:
-            out = out + self.bias.reshape(1, -1, 1, 1)
+        idx, vals = _precompute_convolution_tensor_2d(
+            grid_in,
+            grid_out,
+            self.kernel_shape,
+            radius_cutoff=radius_cutoff,
+            periodic=periodic,
+        )
 
-        return out
+        self.register_buffer("psi_idx", idx, persistable=False)
+        self.register_buffer("psi_vals", vals.astype(self.get_basis_dtype()), persistable=False)
+        self.psi_idx_host = idx.numpy()
+        self.psi_lat_offsets = _get_latitude_offsets(self.psi_idx_host[1], self.n_out)
+
+    def get_psi_vals(self):
+        """
+        Returns the values of the filter basis with the quadrature weights of the input points folded in.
+        """
+        vals = _to_dtype(self.psi_vals, paddle.float32) * self.quad_weights[self.psi_idx[2]]
+        return _to_dtype(vals, self.psi_vals.dtype)
+
+    def get_psi_shape(self):
+        return self.kernel_size, self.n_out, self.n_in
+
+    def _get_problem_size(self):
+        return 1, self.n_in, self.n_out
+
+    def get_contraction_order(self, batch_size: int, nlon: int, npoints_in: int, npoints_out: int):
+        # the fused contraction applies psi before the weights
+        return "psi_first"
+
+    def get_psi(self):
+        psi = paddle.sparse.sparse_coo_tensor(
+            self.psi_idx, self.get_psi_vals(), shape=self.get_psi_shape()
+        ).coalesce()
+        return psi
+
+    def forward(self, x: paddle.Tensor) -> paddle.Tensor:
+        # the point cloud is treated as a single longitude, which turns the S2 contraction into a plain sparse one
+        x = self._cast_input(x)
+        B, C, N = x.shape
+        x = x.reshape([B, C, N, 1])
+
+        if x.place.is_cpu_place():
+            out = _disco_s2_contraction_cpu(
+                x,
+                self.weight,
+                self.psi_idx,
+                self.get_psi_vals(),
+                self.n_out,
+                1,
+                self.groups,
+                psi_idx_host=self.psi_idx_host,
+                lat_offsets=self.psi_lat_offsets,
+            )
+        else:
+            out = _disco_s2_contraction_fused(
+                x,
+                self.weight,
+                self.psi_idx,
+                self.get_psi_vals(),
+                self.n_out,
+                1,
+                self.groups,
+                lat_offsets=self.psi_lat_offsets,
+            )
+
+        out = out.reshape([B, -1, self.n_out])
+
+        return self._add_bias(out)
+
+
+class MultiResolutionDiscreteContinuousConvS2(DiscreteContinuousConv):
+    """
+    Discrete-continuous convolutions (DISCO) on the 2-Sphere, which accept inputs of any resolution. The filter basis
+    is built on first use of each input shape and kept in a cache of bounded size, from which the least recently used
+    shape is evicted. All resolutions share the same weight and bias.
+
+    The output is computed on out_shape if given, otherwise on the grid of the input. Unless theta_cutoff is set, the
+    cutoff follows the input resolution as in DiscreteContinuousConvS2. Setting it keeps the extent of the learned
+    filters fixed across resolutions.
+    """
+
+    def __init__(
+        self,
+        in_channels: int,
+        out_channels: int,
+        kernel_shape: Union[int, List[int]],
+        out_shape: Optional[Tuple[int]] = None,
+        groups: Optional[int] = 1,
+        grid_in: Optional[str] = "equiangular",
+        grid_out: Optional[str] = "equiangular",
+        bias: Optional[bool] = True,
+        theta_cutoff: Optional[float] = None,
+        contraction_order: Optional[str] = "auto",
+        precision: Optional[str] = None,
+        max_cached_shapes: Optional[int] = 8,
+    ):
+        super().__init__(in_channels, out_channels, kernel_shape, groups, bias, precision)
+
+        if contraction_order not in ["auto", "psi_first", "weights_first"]:
+            raise ValueError(f"Unknown contraction order {contraction_order}.")
+
+        if max_cached_shapes < 1:
+            raise ValueError("Error, max_cached_shapes has to be positive.")
+
+        self.in_channels = in_channels
+        self.out_channels = out_channels
+        self.out_shape = None if out_shape is None else tuple(out_shape)
+        self.grid_in = grid_in
+        self.grid_out = grid_out
+        self.theta_cutoff = theta_cutoff
+        self.contraction_order = contraction_order
+        self.max_cached_shapes = max_cached_shapes
+
+        # filter bases of the encountered input shapes in order of their last use. They only hold buffers, which
+        # follow the layer across devices, and no parameters.
+        self._bases = nn.LayerDict()
+
+        # basis the geometry is read from while the profiling hook estimates the work of a call. It is held in a list,
+        # such that it is not registered as a sublayer.
+        self._profiled_basis = []
+
+    @property
+    def cached_shapes(self):
+        """
+        Returns the input shapes for which a filter basis is cached, from the least to the most recently used.
+        """
+        return [(basis.nlat_in, basis.nlon_in) for basis in self._bases.values()]
+
+    def _build_basis(self, in_shape: Tuple[int]):
+        return _DiscreteContinuousBasisS2(
+            tuple(in_shape),
+            tuple(in_shape) if self.out_shape is None else self.out_shape,
+            self.kernel_shape,
+            self.kernel_size,
+            grid_in=self.grid_in,
+            grid_out=self.grid_out,
+            theta_cutoff=self.theta_cutoff,
+            basis_dtype=self.get_basis_dtype(),
+        )
+
+    def get_basis(self, in_shape: Tuple[int]):
+        """
+        Returns the layer which holds the filter basis for the given input shape and marks it as most recently used.
+        """
+        key = "x".join(str(size) for size in in_shape)
+        if key in self._bases:
+            basis = self._bases.pop(key)
+        else:
+            basis = self._build_basis(in_shape)
+            if len(self._bases) == self.max_cached_shapes:
+                self._bases.pop(next(iter(self._bases.keys())))
+        self._bases[key] = basis
+
+        return basis
+
+    def _get_basis(self):
+        if self._profiled_basis:
+            return self._profiled_basis[-1]
+
+        # the most recently used basis, which describes the geometry of the last call
+        if len(self._bases) == 0:
+            raise RuntimeError(
+                "Error, the geometry of the layer is only known once it has been called or get_basis has been used."
+            )
+        return list(self._bases.values())[-1]
+
+    @property
+    def psi_idx(self):
+        return self._get_basis().psi_idx
+
+    @property
+    def psi_vals(self):
+        return self._get_basis().psi_vals
+
+    def get_psi_shape(self):
+        """
+        Returns the dense shape of the filter basis of the most recently used input shape.
+        """
+        return self._get_basis().get_psi_shape()
+
+    def _get_problem_size(self):
+        return self._get_basis()._get_problem_size()
+
+    def _get_profiled_work(self, x: paddle.Tensor):
+        # the basis of the input shape is read without marking it as used, such that profiling leaves the cache as it
+        # is. It is only rebuilt if a call with more shapes than max_cached_shapes has evicted it again.
+        key = "x".join(str(size) for size in x.shape[-2:])
+        if key in self._bases:
+            self._profiled_basis.append(self._bases[key])
+        else:
+            self._profiled_basis.append(self._build_basis(x.shape[-2:]))
+        try:
+            return super()._get_profiled_work(x)
+        finally:
+            self._profiled_basis.pop()
+
+    def forward(
+        self, x: Union[paddle.Tensor, List[paddle.Tensor]], use_triton_kernel: bool = True
+    ) -> Union[paddle.Tensor, List[paddle.Tensor]]:
+        # inputs of different resolutions are passed as a list and processed one shape at a time
+        if isinstance(x, (list, tuple)):
+            return [self.forward(xi, use_triton_kernel=use_triton_kernel) for xi in x]
+
+        x = self._cast_input(x)
+        out = _disco_s2_forward(self, self.get_basis(x.shape[-2:]), x, use_triton_kernel)
+
+        return self._add_bias(out)
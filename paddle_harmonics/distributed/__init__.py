@@ -28,12 +28,19 @@
 # OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 #
-# import the sht stuff
+# import the distributed layers
+from .distributed_convolution import DistributedDiscreteContinuousConvS2  # noqa
 from .distributed_sht import DistributedInverseRealSHT  # noqa
 from .distributed_sht import DistributedInverseRealVectorSHT  # noqa
 from .distributed_sht import DistributedRealSHT  # noqa
 from .distributed_sht import DistributedRealVectorSHT  # noqa
+from .distributed_spectral import DistributedDriscollHealyContraction  # noqa
+from .distributed_spectral import DistributedSpectralFilterS2  # noqa
+from .distributed_spectral import DistributedSpectralMultiply  # noqa
+from .primitives import comm_profiler  # noqa
 from .primitives import compute_split_shapes  # noqa
+from .primitives import distributed_halo_exchange_polar  # noqa
+from .primitives import distributed_transpose_async  # noqa
 from .primitives import distributed_transpose_azimuth  # noqa
 from .primitives import distributed_transpose_polar  # noqa
 from .primitives import split_tensor_along_dim  # noqa
@@ -43,7 +50,9 @@ from .utils import azimuth_group  # noqa
 from .utils import azimuth_group_rank  # noqa
 from .utils import azimuth_group_size  # noqa
 from .utils import init  # noqa
+from .utils import init_process_grid  # noqa
 from .utils import is_initialized  # noqa
 from .utils import polar_group  # noqa
 from .utils import polar_group_rank  # noqa
 from .utils import polar_group_size  # noqa
+from .utils import spawn  # noqa
@@ -0,0 +1,247 @@
+# coding=utf-8
+
+# SPDX-FileCopyrightText: Copyright (c) 2022 The torch-harmonics Authors. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+import numpy as np
+import paddle
+
+from paddle_harmonics._disco_convolution import _disco_s2_contraction_ksum
+from paddle_harmonics._disco_convolution import _get_latitude_offsets
+from paddle_harmonics._disco_convolution import _to_dtype
+from paddle_harmonics.convolution import DiscreteContinuousConv
+from paddle_harmonics.convolution import _get_longitude_blocks
+from paddle_harmonics.convolution import _precompute_convolution_tensor_s2
+from paddle_harmonics.convolution import _precompute_latitude_bands
+from paddle_harmonics.quadrature import _precompute_latitudes
+
+from .primitives import _comm_scope
+from .primitives import compute_split_shapes
+from .primitives import distributed_halo_exchange_polar
+from .primitives import distributed_transpose_azimuth
+from .utils import azimuth_group_rank
+from .utils import azimuth_group_size
+from .utils import polar_group_rank
+from .utils import polar_group_size
+
+
+class DistributedDiscreteContinuousConvS2(DiscreteContinuousConv):
+    """
+    Distributed version of the discrete-continuous convolutions (DISCO) on the 2-Sphere as described in [1]. Input
+    and output are split into latitude bands over the polar group and into longitude slabs over the azimuth group,
+    following compute_split_shapes.
+
+    As the filters have a compact support of theta_cutoff, each rank only needs the input latitudes within
+    theta_cutoff of its output latitudes. These are obtained by a halo exchange with the ranks owning them. The
+    input is then contracted with the weights, and the output channels are transposed over the azimuth group, which
+    makes the longitudes local for the contraction with the filter basis. Each rank only holds the part of the basis
+    which belongs to its output latitudes.
+
+    [1] Ocampo, Price, McEwen, Scalable and equivariant spherical CNNs by discrete-continuous (DISCO) convolutions, ICLR (2023), arXiv:2209.13603
+    """
+
+    def __init__(
+        self,
+        in_channels: int,
+        out_channels: int,
+        in_shape: Tuple[int],
+        out_shape: Tuple[int],
+        kernel_shape: Union[int, List[int]],
+        groups: Optional[int] = 1,
+        grid_in: Optional[str] = "equiangular",
+        grid_out: Optional[str] = "equiangular",
+        bias: Optional[bool] = True,
+        theta_cutoff: Optional[float] = None,
+        precision: Optional[str] = None,
+    ):
+        super().__init__(in_channels, out_channels, kernel_shape, groups, bias, precision)
+
+        self.nlat_in, self.nlon_in = in_shape
+        self.nlat_out, self.nlon_out = out_shape
+        self.lon_blocks = _get_longitude_blocks(self.nlon_in, self.nlon_out)
+
+        # the weights are applied before the transpose, which only requires local channels
+        self.contraction_order = "weights_first"
+
+        # get the comms grid:
+        self.comm_size_polar = polar_group_size()
+        self.comm_rank_polar = polar_group_rank()
+        self.comm_size_azimuth = azimuth_group_size()
+        self.comm_rank_azimuth = azimuth_group_rank()
+
+        if out_channels < self.comm_size_azimuth:
+            raise ValueError(
+                "Error, the number of output channels has to be at least the size of the azimuth group"
+            )
+
+        # compute theta cutoff based on the bandlimit of the input field
+        if theta_cutoff is None:
+            theta_cutoff = (self.kernel_shape[0] + 1) * np.pi / float(self.nlat_in - 1)
+
+        if theta_cutoff <= 0.0:
+            raise ValueError("Error, theta_cutoff has to be positive.")
+
+        # compute splits
+        self.lat_in_shapes = compute_split_shapes(self.nlat_in, self.comm_size_polar)
+        self.lon_in_shapes = compute_split_shapes(self.nlon_in, self.comm_size_azimuth)
+        self.lat_out_shapes = compute_split_shapes(self.nlat_out, self.comm_size_polar)
+        self.lon_out_shapes = compute_split_shapes(self.nlon_out, self.comm_size_azimuth)
+        self.out_chan_shapes = compute_split_shapes(out_channels, self.comm_size_azimuth)
+
+        # the band of input latitudes which can be reached from the output latitudes of each rank
+        lats_in, wgl = _precompute_latitudes(self.nlat_in, grid=grid_in)
+        lats_out, _ = _precompute_latitudes(self.nlat_out, grid=grid_out)
+        lat_start, lat_end = _precompute_latitude_bands(lats_in, lats_out, theta_cutoff)
+
+        lat_out_offsets = np.cumsum([0] + self.lat_out_shapes)
+        self.lat_in_bands = []
+        for t0, t1 in zip(lat_out_offsets[:-1], lat_out_offsets[1:]):
+            self.lat_in_bands.append((int(lat_start[t0:t1].min()), int(lat_end[t0:t1].max())))
+        self.lat_out_start = int(lat_out_offsets[self.comm_rank_polar])
+        self.lat_out_end = int(lat_out_offsets[self.comm_rank_polar + 1])
+        band_start, band_end = self.lat_in_bands[self.comm_rank_polar]
+
+        # integration weights of the local band
+        quad_weights = (
+            2.0
+            * np.pi
+            * paddle.to_tensor(wgl[band_start:band_end]).astype(dtype="float32").reshape([-1, 1])
+            / self.nlon_in
+        )
+        self.register_buffer("quad_weights", quad_weights, persistable=False)
+
+        # only the filters of the local output latitudes are computed, and re-indexed relative to the local band
+        idx, vals = _precompute_convolution_tensor_s2(
+            in_shape,
+            out_shape,
+            self.kernel_shape,
+            grid_in=grid_in,
+            grid_out=grid_out,
+            theta_cutoff=theta_cutoff,
+            lat_range_out=(self.lat_out_start, self.lat_out_end),
+        )
+        idx = paddle.stack(
+            [
+                idx[0],
+                idx[1] - self.lat_out_start * self.lon_blocks,
+                idx[2] - band_start * self.nlon_in,
+            ],
+            axis=0,
+        )
+
+        self.register_buffer("psi_idx", idx, persistable=False)
+        self.register_buffer("psi_vals", vals.astype(self.get_basis_dtype()), persistable=False)
+        self.psi_lat_offsets = _get_latitude_offsets(
+            idx[1].numpy(), (self.lat_out_end - self.lat_out_start) * self.lon_blocks
+        )
+
+    def extra_repr(self):
+        """
+        Pretty print module
+        """
+        return (
+            f"in_shape={(self.nlat_in, self.nlon_in)}, out_shape={(self.nlat_out, self.nlon_out)},\n"
+            f"lat_in_bands={self.lat_in_bands}, kernel_shape={self.kernel_shape}"
+        )
+
+    def get_psi_vals(self):
+        """
+        Returns the values of the local filter basis with the quadrature weights of the input grid folded in.
+        """
+        vals = _to_dtype(self.psi_vals, paddle.float32)
+        vals = vals * self.quad_weights.reshape([-1])[self.psi_idx[2] // self.nlon_in]
+        return _to_dtype(vals, self.psi_vals.dtype)
+
+    def get_psi_shape(self):
+        """
+        Returns the dense shape of the local filter basis, whose columns are the points of the local latitude band.
+        """
+        band_start, band_end = self.lat_in_bands[self.comm_rank_polar]
+        return (
+            self.kernel_size,
+            (self.lat_out_end - self.lat_out_start) * self.lon_blocks,
+            (band_end - band_start) * self.nlon_in,
+        )
+
+    def _get_problem_size(self):
+        # the work of the local latitudes, summed over the azimuth group which shares it
+        band_start, band_end = self.lat_in_bands[self.comm_rank_polar]
+        return (
+            self.nlon_out // self.lon_blocks,
+            (band_end - band_start) * self.nlon_in,
+            (self.lat_out_end - self.lat_out_start) * self.nlon_out,
+        )
+
+    @_comm_scope
+    def forward(self, x: paddle.Tensor) -> paddle.Tensor:
+        x = self._cast_input(x)
+
+        # get the input latitudes within reach of the local output latitudes
+        if self.comm_size_polar > 1:
+            x = distributed_halo_exchange_polar.apply(x, -2, self.lat_in_shapes, self.lat_in_bands)
+        else:
+            band_start, band_end = self.lat_in_bands[0]
+            x = x[..., band_start:band_end, :]
+
+        # contract with the weights, which only requires local channels
+        B, C, H, W = x.shape
+        x = self._weight_contraction(
+            "bgcxy,gock->bgokxy",
+            x.reshape([B, self.groups, self.groupsize, H, W]),
+            self.weight.reshape([self.groups, -1, self.weight.shape[1], self.weight.shape[2]]),
+        )
+        x = x.reshape([B, -1, self.kernel_size * H, W])
+
+        # transpose: after this, the output channels are split and the longitudes are local
+        if self.comm_size_azimuth > 1:
+            x = distributed_transpose_azimuth.apply(x, (1, -1), self.lon_in_shapes)
+
+        nlat_out = (self.lat_out_end - self.lat_out_start) * self.lon_blocks
+        nlon_out = self.nlon_out // self.lon_blocks
+        x = x.reshape([B, -1, self.kernel_size, H, self.nlon_in])
+        out = _disco_s2_contraction_ksum(
+            x, self.psi_idx, self.get_psi_vals(), nlat_out, nlon_out, self.psi_lat_offsets
+        )
+
+        # interleave the longitude blocks
+        if self.lon_blocks > 1:
+            C = out.shape[1]
+            out = out.reshape([B, C, -1, self.lon_blocks, nlon_out])
+            out = out.transpose([0, 1, 2, 4, 3]).reshape([B, C, -1, self.nlon_out])
+
+        # transpose: after this, the output channels are local and the longitudes are split
+        if self.comm_size_azimuth > 1:
+            out = distributed_transpose_azimuth.apply(out, (-1, 1), self.out_chan_shapes)
+
+        return self._add_bias(out)
@@ -29,6 +29,8 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 #
 
+from collections import OrderedDict
+
 import numpy as np
 import paddle
 import paddle.fft
@@ -41,15 +43,230 @@ from paddle_harmonics.quadrature import clenshaw_curtiss_weights
 from paddle_harmonics.quadrature import legendre_gauss_weights
 from paddle_harmonics.quadrature import lobatto_weights
 
+from .primitives import PendingTranspose
+from .primitives import _check_wire_dtype
+from .primitives import _comm_scope
+from .primitives import _reorder
+from .primitives import _transpose
 from .primitives import compute_split_shapes
+from .primitives import distributed_all_gather_polar
+from .primitives import distributed_transpose_async
 from .primitives import distributed_transpose_azimuth
+from .primitives import distributed_reduce_scatter_polar
 from .primitives import distributed_transpose_polar
-from .primitives import split_tensor_along_dim
+from .utils import azimuth_group
 from .utils import azimuth_group_rank
 from .utils import azimuth_group_size
+from .utils import polar_group
 from .utils import polar_group_rank
 from .utils import polar_group_size
 
+# Legendre polynomials of the local wavenumbers, shared by all transforms of the process
+_LOCAL_LEGPOLY_CACHE = OrderedDict()
+_LOCAL_LEGPOLY_CACHE_SIZE = 8
+
+_TRANSPOSES = {
+    "azimuth": (azimuth_group, azimuth_group_size, distributed_transpose_azimuth),
+    "polar": (polar_group, polar_group_size, distributed_transpose_polar),
+}
+
+
+def _run_pipeline(x: paddle.Tensor, stages, micro_batches: int, num_transform_dims: int = 2):
+    """
+    Applies the stages of a distributed transform to x. Transposes are given as tuples (group, dims, split_shapes),
+    optionally followed by dim0_order and wire_dtype, where group is "azimuth" or "polar", split_shapes returns the
+    split sizes for a given number of channels, dim0_order is the distribution order of dims[0] and wire_dtype is the
+    format of the payloads, all other stages are callables. All dimensions of x in front of the last
+    num_transform_dims ones are flattened into a single channel axis 0, which the transposes split over the groups.
+    If there are fewer channels than ranks in a group, the channel axis is padded with zeros. The padding is dropped
+    and the leading dimensions are restored on the result.
+    """
+
+    # transposes within a single rank are no-ops
+    stages = [stage for stage in stages if callable(stage) or _TRANSPOSES[stage[0]][1]() > 1]
+    comm_size = max([1] + [_TRANSPOSES[stage[0]][1]() for stage in stages if not callable(stage)])
+
+    # flatten the leading dimensions into the channel axis
+    lead_shape = x.shape[:-num_transform_dims]
+    x = x.reshape([-1] + x.shape[-num_transform_dims:])
+    num_chans = x.shape[0]
+
+    # every rank has to hold at least one channel
+    if num_chans < comm_size:
+        pad_shape = [comm_size - num_chans] + x.shape[1:]
+        x = paddle.concat([x, paddle.zeros(pad_shape, dtype=x.dtype)], axis=0)
+
+    x = _run_stages(x, stages, micro_batches, comm_size)
+
+    if num_chans < comm_size:
+        x = x[:num_chans]
+    return x.reshape(lead_shape + x.shape[1:])
+
+
+def _run_stages(x: paddle.Tensor, stages, micro_batches: int, comm_size: int):
+    """
+    Applies the stages to x, whose channels are stored along axis 0. For more than one micro-batch, the channels are
+    split into micro-batches which pass through the stages as a wavefront: in every step, the transposes of some
+    micro-batches are started before the computations on the others and are only waited for before the next stage of
+    their micro-batch. On backends with asynchronous all-to-all, this overlaps the communication of one micro-batch
+    with the computation on another.
+    """
+
+    # every micro-batch has to hold at least one channel per rank
+    num_chans = x.shape[0]
+    num_chunks = max(min(micro_batches, num_chans // comm_size), 1)
+
+    if num_chunks == 1:
+        # without autograd, the results of the transposes which are consumed by the following stage do not outlive it
+        # and can be received into pooled buffers
+        pool = not paddle.is_grad_enabled()
+        for i, stage in enumerate(stages):
+            if callable(stage):
+                x = stage(x)
+            else:
+                group, dims, split_shapes, *options = stage
+                dim0_order, wire_dtype = (options + [None, None])[:2]
+                if pool and i + 1 < len(stages) and callable(stages[i + 1]):
+                    # the result is a view of a pooled buffer, which the next transpose with the same key overwrites
+                    x, _, _ = _transpose(
+                        x,
+                        dims[0],
+                        dims[1],
+                        split_shapes(num_chans),
+                        group=_TRANSPOSES[group][0](),
+                        dim0_order=dim0_order,
+                        wire_dtype=_check_wire_dtype(wire_dtype),
+                        recv_pool=True,
+                    )
+                else:
+                    x = _TRANSPOSES[group][2].apply(
+                        x, dims, split_shapes(num_chans), dim0_order, wire_dtype
+                    )
+        return x
+
+    chunk_chans = compute_split_shapes(num_chans, num_chunks)
+    xs = list(paddle.split(x, chunk_chans, axis=0))
+    for step in range(num_chunks + len(stages) - 1):
+        active = [(i, step - i) for i in range(num_chunks) if 0 <= step - i < len(stages)]
+
+        # start the transposes first, such that they overlap with the computations of this step
+        active.sort(key=lambda chunk_stage: callable(stages[chunk_stage[1]]))
+        for i, s in active:
+            if isinstance(xs[i], PendingTranspose):
+                xs[i] = xs[i].wait()
+            if callable(stages[s]):
+                xs[i] = stages[s](xs[i])
+            else:
+                group, dims, split_shapes, *options = stages[s]
+                xs[i] = distributed_transpose_async(
+                    xs[i], dims, split_shapes(chunk_chans[i]), _TRANSPOSES[group][0](), *options
+                )
+
+    xs = [xi.wait() if isinstance(xi, PendingTranspose) else xi for xi in xs]
+    return paddle.concat(xs, axis=0)
+
+
+def _set_wire_dtype(stages, wire_dtype):
+    """
+    Sets the format of the payloads of all transposes among the stages.
+    """
+    if wire_dtype is None:
+        return stages
+    result = []
+    for stage in stages:
+        if not callable(stage):
+            group, dims, split_shapes, *dim0_order = stage
+            dim0_order = dim0_order[0] if dim0_order else None
+            stage = (group, dims, split_shapes, dim0_order, wire_dtype)
+        result.append(stage)
+    return result
+
+
+def _get_m_order(mmax: int, comm_size: int, m_distribution: str):
+    """
+    Returns the wavenumbers in the order of their layout over the azimuth group, where rank r holds the chunk r of
+    compute_split_shapes(mmax, comm_size). "contiguous" assigns consecutive wavenumbers to every rank. Since the
+    Legendre contraction of a wavenumber m involves the lmax - m degrees l >= m, this leaves most of the work to the
+    first ranks. "zigzag" deals the wavenumbers out in the order 0, 1, ..., p-1, p-1, ..., 1, 0, 0, 1, ..., skipping
+    ranks which hold their share already, which gives every rank a balanced mix of low and high wavenumbers.
+    """
+    if m_distribution == "contiguous":
+        return list(range(mmax))
+    elif m_distribution == "zigzag":
+        m_shapes = compute_split_shapes(mmax, comm_size)
+        sweep = list(range(comm_size)) + list(reversed(range(comm_size)))
+        owned = [[] for _ in range(comm_size)]
+        step = 0
+        for m in range(mmax):
+            while len(owned[sweep[step % len(sweep)]]) == m_shapes[sweep[step % len(sweep)]]:
+                step += 1
+            owned[sweep[step % len(sweep)]].append(m)
+            step += 1
+        return sum(owned, [])
+    else:
+        raise ValueError(f"Unknown m distribution {m_distribution}")
+
+
+def _get_m_blocks(local_m, lmax: int, num_blocks: int = 8):
+    """
+    Splits the local wavenumbers into at most num_blocks blocks of consecutive entries and returns the blocks as
+    (start, end, lmin), where the Legendre polynomials of the block vanish for all degrees below lmin.
+    """
+    blocks = []
+    start = 0
+    for size in compute_split_shapes(len(local_m), min(num_blocks, len(local_m))):
+        blocks.append((start, start + size, min(local_m[start], lmax)))
+        start += size
+    return blocks
+
+
+def _get_local_legpoly(mmax, lmax, t, local_m, norm, inverse, csphase, vector=False):
+    """
+    Returns the associated Legendre polynomials, or for the vector transforms their derivatives, of the wavenumbers in
+    local_m at the colatitudes t. Only these orders are computed, such that the cost and the memory of the
+    precomputation on every rank scale with its share of the wavenumbers. The results are kept in a cache of bounded
+    size, from which the least recently used entry is evicted, such that transforms with the same resolution, e.g. the
+    forward and inverse transforms of the layers of a network, compute them only once per process.
+    """
+    key = (mmax, lmax, t.tobytes(), tuple(local_m), norm, inverse, csphase, vector)
+    if key in _LOCAL_LEGPOLY_CACHE:
+        _LOCAL_LEGPOLY_CACHE.move_to_end(key)
+        return _LOCAL_LEGPOLY_CACHE[key]
+
+    precompute = _precompute_dlegpoly if vector else _precompute_legpoly
+    pct = precompute(mmax, lmax, t, norm=norm, inverse=inverse, csphase=csphase, m_index=local_m)
+    pct.flags.writeable = False
+
+    _LOCAL_LEGPOLY_CACHE[key] = pct
+    if len(_LOCAL_LEGPOLY_CACHE) > _LOCAL_LEGPOLY_CACHE_SIZE:
+        _LOCAL_LEGPOLY_CACHE.popitem(last=False)
+
+    return pct
+
+
+def _get_polar_comm_volume(nlat: int, lmax: int, comm_size: int):
+    """
+    Returns the number of elements which every rank of the polar group sends per channel and local wavenumber for the
+    two decompositions of the Legendre contraction. "transpose" moves the latitudes and then the degrees between the
+    channels with two transposes, in which every rank sends all but its own chunk of its slab. "local" contracts the
+    locally owned latitudes and reduce-scatters (or, in the inverse transform, all-gathers) the partial sums over all
+    lmax degrees, which amounts to (comm_size - 1) / comm_size of the full spectrum per rank.
+    """
+    return {
+        "transpose": (nlat + lmax) * (comm_size - 1) / comm_size**2,
+        "local": lmax * (comm_size - 1) / comm_size,
+    }
+
+
+def _get_polar_strategy(polar_strategy: str, nlat: int, lmax: int, comm_size: int):
+    if polar_strategy == "auto":
+        volume = _get_polar_comm_volume(nlat, lmax, comm_size)
+        return "local" if volume["local"] < volume["transpose"] else "transpose"
+    elif polar_strategy in ["transpose", "local"]:
+        return polar_strategy
+    else:
+        raise ValueError(f"Unknown polar strategy {polar_strategy}")
+
 
 class DistributedRealSHT(nn.Layer):
     """
@@ -70,6 +287,10 @@ class DistributedRealSHT(nn.Layer):
         grid="lobatto",
         norm="ortho",
         csphase=True,
+        micro_batches=1,
+        polar_strategy="auto",
+        m_distribution="contiguous",
+        wire_dtype=None,
     ):
         """
         Initializes the SHT Layer, precomputing the necessary quadrature weights
@@ -78,6 +299,13 @@ class DistributedRealSHT(nn.Layer):
         nlat: input grid resolution in the latitudinal direction
         nlon: input grid resolution in the longitudinal direction
         grid: grid in the latitude direction (for now only tensor product grids are supported)
+        micro_batches: number of micro-batches of channels, whose transposes overlap with the computation on each other
+        polar_strategy: "transpose" makes the latitudes local for the Legendre contraction, "local" contracts the local
+            latitudes and reduce-scatters the partial sums, "auto" picks the one which communicates less
+        m_distribution: "contiguous" splits the wavenumbers into consecutive chunks, "zigzag" deals them out in a
+            serpentine order and skips the vanishing degrees l < m in the contraction, which balances its cost
+        wire_dtype: if "float16", "bfloat16" or "int8", the payloads of the transposes are sent in this reduced
+            precision, int8 scaled by the maximum magnitude of every chunk
         """
 
         super().__init__()
@@ -87,6 +315,8 @@ class DistributedRealSHT(nn.Layer):
         self.grid = grid
         self.norm = norm
         self.csphase = csphase
+        self.micro_batches = micro_batches
+        self.wire_dtype = _check_wire_dtype(wire_dtype)
 
         # TODO: include assertions regarding the dimensions
 
@@ -121,18 +351,34 @@ class DistributedRealSHT(nn.Layer):
         self.lon_shapes = compute_split_shapes(self.nlon, self.comm_size_azimuth)
         self.l_shapes = compute_split_shapes(self.lmax, self.comm_size_polar)
         self.m_shapes = compute_split_shapes(self.mmax, self.comm_size_azimuth)
+        self.polar_strategy = _get_polar_strategy(
+            polar_strategy, self.nlat, self.lmax, self.comm_size_polar
+        )
 
-        # combine quadrature weights with the legendre weights
+        # distribution of the wavenumbers over the azimuth group
+        self.m_distribution = m_distribution
+        m_order = _get_m_order(self.mmax, self.comm_size_azimuth, self.m_distribution)
+        m_start = sum(self.m_shapes[: self.comm_rank_azimuth])
+        self.local_m = m_order[m_start : m_start + self.m_shapes[self.comm_rank_azimuth]]
+        self.m_order = None if self.m_distribution == "contiguous" else m_order
+        self.m_blocks = (
+            _get_m_blocks(self.local_m, self.lmax) if self.m_distribution == "zigzag" else None
+        )
+
+        # the local strategy contracts the local latitudes only
+        if self.polar_strategy == "local":
+            lat_start = sum(self.lat_shapes[: self.comm_rank_polar])
+            lat_end = lat_start + self.lat_shapes[self.comm_rank_polar]
+            tq, w = tq[lat_start:lat_end], w[lat_start:lat_end]
+
+        # combine quadrature weights with the legendre weights of the local wavenumbers
         weights = paddle.to_tensor(w)
-        pct = _precompute_legpoly(self.mmax, self.lmax, tq, norm=self.norm, csphase=self.csphase)
+        pct = _get_local_legpoly(
+            self.mmax, self.lmax, tq, self.local_m, self.norm, False, self.csphase
+        )
         pct = paddle.to_tensor(pct)
         weights = paddle.einsum("mlk,k->mlk", pct, weights)
 
-        # split weights
-        weights = split_tensor_along_dim(weights, dim=0, num_chunks=self.comm_size_azimuth)[
-            self.comm_rank_azimuth
-        ]
-
         # remember quadrature weights
         self.register_buffer("weights", weights, persistable=False)
 
@@ -142,45 +388,76 @@ class DistributedRealSHT(nn.Layer):
         """
         return f"nlat={self.nlat}, nlon={self.nlon},\n lmax={self.lmax}, mmax={self.mmax},\n grid={self.grid}, csphase={self.csphase}"
 
-    def forward(self, x: paddle.Tensor):
-
-        # we need to ensure that we can split the channels evenly
-        num_chans = x.shape[1]
-
-        # h and w is split. First we make w local by transposing into channel dim
-        if self.comm_size_azimuth > 1:
-            x = distributed_transpose_azimuth.apply(x, (1, -1), self.lon_shapes)
-
+    def _rfft(self, x: paddle.Tensor):
         # apply real fft in the longitudinal direction: make sure to truncate to nlon
         x = 2.0 * np.pi * paddle.fft.rfft(x, n=self.nlon, axis=-1, norm="forward")
 
         # truncate
-        x = x[..., : self.mmax]
-
-        # transpose: after this, m is split and c is local
-        if self.comm_size_azimuth > 1:
-            chan_shapes = compute_split_shapes(num_chans, self.comm_size_azimuth)
-            x = distributed_transpose_azimuth.apply(x, (-1, 1), chan_shapes)
-
-        # transpose: after this, c is split and h is local
-        if self.comm_size_polar > 1:
-            x = distributed_transpose_polar.apply(x, (1, -2), self.lat_shapes)
+        return x[..., : self.mmax]
 
+    def _quadrature(self, x: paddle.Tensor):
         # do the Legendre-Gauss quadrature
         x = paddle.as_real(x)
 
         # contraction
-        xs = paddle.einsum("...kmr,mlk->...lmr", x, self.weights.to(x.dtype)).contiguous()
+        if self.m_blocks is None:
+            xs = paddle.einsum("...kmr,mlk->...lmr", x, self.weights.to(x.dtype)).contiguous()
+        else:
+            # contract the non-vanishing degrees l >= m of every block of wavenumbers only
+            out_shape = list(x.shape)
+            out_shape[-3] = self.lmax
+            xs = paddle.zeros(out_shape, dtype=x.dtype)
+            for start, end, lmin in self.m_blocks:
+                if lmin < self.lmax:
+                    xs[..., lmin:, start:end, :] = paddle.einsum(
+                        "...kmr,mlk->...lmr",
+                        x[..., start:end, :],
+                        self.weights[start:end, lmin:].to(x.dtype),
+                    )
 
         # cast to complex
-        x = paddle.as_complex(xs)
+        return paddle.as_complex(xs)
+
+    def _get_stages(self):
+
+        stages = [
+            # h and w is split. First we make w local by transposing into channel dim
+            ("azimuth", (0, -1), lambda num_chans: self.lon_shapes),
+            self._rfft,
+            # transpose: after this, m is split and c is local
+            (
+                "azimuth",
+                (-1, 0),
+                lambda num_chans: compute_split_shapes(num_chans, self.comm_size_azimuth),
+                self.m_order,
+            ),
+        ]
 
-        # transpose: after this, l is split and c is local
-        if self.comm_size_polar > 1:
-            chan_shapes = compute_split_shapes(num_chans, self.comm_size_polar)
-            x = distributed_transpose_polar.apply(x, (-2, 1), chan_shapes)
+        if self.polar_strategy == "local":
+            stages += [
+                # contract the local latitudes, then sum the partial results: after this, l is split
+                self._quadrature,
+                lambda x: distributed_reduce_scatter_polar.apply(x, -2, self.l_shapes),
+            ]
+        else:
+            stages += [
+                # transpose: after this, c is split and h is local
+                ("polar", (0, -2), lambda num_chans: self.lat_shapes),
+                self._quadrature,
+                # transpose: after this, l is split and c is local
+                (
+                    "polar",
+                    (-2, 0),
+                    lambda num_chans: compute_split_shapes(num_chans, self.comm_size_polar),
+                ),
+            ]
+
+        return _set_wire_dtype(stages, self.wire_dtype)
+
+    @_comm_scope
+    def forward(self, x: paddle.Tensor):
 
-        return x
+        return _run_pipeline(x, self._get_stages(), self.micro_batches)
 
 
 class DistributedInverseRealSHT(nn.Layer):
@@ -203,6 +480,10 @@ class DistributedInverseRealSHT(nn.Layer):
         grid="lobatto",
         norm="ortho",
         csphase=True,
+        micro_batches=1,
+        polar_strategy="auto",
+        m_distribution="contiguous",
+        wire_dtype=None,
     ):
 
         super().__init__()
@@ -212,6 +493,8 @@ class DistributedInverseRealSHT(nn.Layer):
         self.grid = grid
         self.norm = norm
         self.csphase = csphase
+        self.micro_batches = micro_batches
+        self.wire_dtype = _check_wire_dtype(wire_dtype)
 
         # compute quadrature points
         if self.grid == "legendre-gauss":
@@ -243,17 +526,30 @@ class DistributedInverseRealSHT(nn.Layer):
         self.lon_shapes = compute_split_shapes(self.nlon, self.comm_size_azimuth)
         self.l_shapes = compute_split_shapes(self.lmax, self.comm_size_polar)
         self.m_shapes = compute_split_shapes(self.mmax, self.comm_size_azimuth)
+        self.polar_strategy = _get_polar_strategy(
+            polar_strategy, self.nlat, self.lmax, self.comm_size_polar
+        )
 
-        # compute legende polynomials
-        pct = _precompute_legpoly(
-            self.mmax, self.lmax, t, norm=self.norm, inverse=True, csphase=self.csphase
+        # distribution of the wavenumbers over the azimuth group
+        self.m_distribution = m_distribution
+        m_order = _get_m_order(self.mmax, self.comm_size_azimuth, self.m_distribution)
+        m_start = sum(self.m_shapes[: self.comm_rank_azimuth])
+        self.local_m = m_order[m_start : m_start + self.m_shapes[self.comm_rank_azimuth]]
+        self.m_order = None if self.m_distribution == "contiguous" else m_order
+        self.m_blocks = (
+            _get_m_blocks(self.local_m, self.lmax) if self.m_distribution == "zigzag" else None
         )
-        pct = paddle.to_tensor(pct)
 
-        # split in m
-        pct = split_tensor_along_dim(pct, dim=0, num_chunks=self.comm_size_azimuth)[
-            self.comm_rank_azimuth
-        ]
+        # the local strategy evaluates the local latitudes only
+        if self.polar_strategy == "local":
+            lat_start = sum(self.lat_shapes[: self.comm_rank_polar])
+            t = t[lat_start : lat_start + self.lat_shapes[self.comm_rank_polar]]
+
+        # compute legende polynomials of the local wavenumbers
+        pct = _get_local_legpoly(
+            self.mmax, self.lmax, t, self.local_m, self.norm, True, self.csphase
+        )
+        pct = paddle.to_tensor(pct)
 
         # register
         self.register_buffer("pct", pct, persistable=False)
@@ -264,44 +560,76 @@ class DistributedInverseRealSHT(nn.Layer):
         """
         return f"nlat={self.nlat}, nlon={self.nlon},\n lmax={self.lmax}, mmax={self.mmax},\n grid={self.grid}, csphase={self.csphase}"
 
-    def forward(self, x: paddle.Tensor):
-
-        # we need to ensure that we can split the channels evenly
-        num_chans = x.shape[1]
-
-        # transpose: after that, channels are split, l is local:
-        if self.comm_size_polar > 1:
-            x = distributed_transpose_polar.apply(x, (1, -2), self.l_shapes)
-
+    def _legendre(self, x: paddle.Tensor):
         # Evaluate associated Legendre functions on the output nodes
         x = paddle.as_real(x)
 
         # einsum
-        xs = paddle.einsum("...lmr, mlk->...kmr", x, self.pct.to(x.dtype)).contiguous()
+        if self.m_blocks is None:
+            xs = paddle.einsum("...lmr, mlk->...kmr", x, self.pct.to(x.dtype)).contiguous()
+        else:
+            # contract the non-vanishing degrees l >= m of every block of wavenumbers only
+            out_shape = list(x.shape)
+            out_shape[-3] = self.pct.shape[-1]
+            xs = paddle.zeros(out_shape, dtype=x.dtype)
+            for start, end, lmin in self.m_blocks:
+                if lmin < self.lmax:
+                    xs[..., start:end, :] = paddle.einsum(
+                        "...lmr,mlk->...kmr",
+                        x[..., lmin:, start:end, :],
+                        self.pct[start:end, lmin:].to(x.dtype),
+                    )
         # rl = paddle.einsum('...lm, mlk->...km', x[..., 0], self.pct.to(x.dtype) )
         # im = paddle.einsum('...lm, mlk->...km', x[..., 1], self.pct.to(x.dtype) )
         # xs = paddle.stack((rl, im), -1).contiguous()
 
-        # inverse FFT
-        x = paddle.as_complex(xs)
-
-        if self.comm_size_polar > 1:
-            chan_shapes = compute_split_shapes(num_chans, self.comm_size_polar)
-            x = distributed_transpose_polar.apply(x, (-2, 1), chan_shapes)
+        return paddle.as_complex(xs)
 
-        # transpose: after this, channels are split and m is local
-        if self.comm_size_azimuth > 1:
-            x = distributed_transpose_azimuth.apply(x, (1, -1), self.m_shapes)
+    def _irfft(self, x: paddle.Tensor):
+        # bring the wavenumbers back into their natural order
+        x = _reorder(x, -1, self.m_order)
 
         # apply the inverse (real) FFT
-        x = paddle.fft.irfft(x, n=self.nlon, axis=-1, norm="forward")
+        return paddle.fft.irfft(x, n=self.nlon, axis=-1, norm="forward")
 
-        # transpose: after this, m is split and channels are local
-        if self.comm_size_azimuth > 1:
-            chan_shapes = compute_split_shapes(num_chans, self.comm_size_azimuth)
-            x = distributed_transpose_azimuth.apply(x, (-1, 1), chan_shapes)
+    def _get_stages(self):
 
-        return x
+        if self.polar_strategy == "local":
+            stages = [
+                # gather l, then evaluate the local latitudes: after this, h is split
+                lambda x: distributed_all_gather_polar.apply(x, -2, self.l_shapes),
+                self._legendre,
+            ]
+        else:
+            stages = [
+                # transpose: after that, channels are split, l is local:
+                ("polar", (0, -2), lambda num_chans: self.l_shapes),
+                self._legendre,
+                (
+                    "polar",
+                    (-2, 0),
+                    lambda num_chans: compute_split_shapes(num_chans, self.comm_size_polar),
+                ),
+            ]
+
+        stages += [
+            # transpose: after this, channels are split and m is local
+            ("azimuth", (0, -1), lambda num_chans: self.m_shapes),
+            self._irfft,
+            # transpose: after this, m is split and channels are local
+            (
+                "azimuth",
+                (-1, 0),
+                lambda num_chans: compute_split_shapes(num_chans, self.comm_size_azimuth),
+            ),
+        ]
+
+        return _set_wire_dtype(stages, self.wire_dtype)
+
+    @_comm_scope
+    def forward(self, x: paddle.Tensor):
+
+        return _run_pipeline(x, self._get_stages(), self.micro_batches)
 
 
 class DistributedRealVectorSHT(nn.Layer):
@@ -323,6 +651,9 @@ class DistributedRealVectorSHT(nn.Layer):
         grid="lobatto",
         norm="ortho",
         csphase=True,
+        micro_batches=1,
+        polar_strategy="auto",
+        wire_dtype=None,
     ):
         """
         Initializes the vector SHT Layer, precomputing the necessary quadrature weights
@@ -340,6 +671,8 @@ class DistributedRealVectorSHT(nn.Layer):
         self.grid = grid
         self.norm = norm
         self.csphase = csphase
+        self.micro_batches = micro_batches
+        self.wire_dtype = _check_wire_dtype(wire_dtype)
 
         # compute quadrature points
         if self.grid == "legendre-gauss":
@@ -372,10 +705,25 @@ class DistributedRealVectorSHT(nn.Layer):
         self.lon_shapes = compute_split_shapes(self.nlon, self.comm_size_azimuth)
         self.l_shapes = compute_split_shapes(self.lmax, self.comm_size_polar)
         self.m_shapes = compute_split_shapes(self.mmax, self.comm_size_azimuth)
+        self.polar_strategy = _get_polar_strategy(
+            polar_strategy, self.nlat, self.lmax, self.comm_size_polar
+        )
+
+        # the wavenumbers of this rank
+        m_start = sum(self.m_shapes[: self.comm_rank_azimuth])
+        self.local_m = list(range(m_start, m_start + self.m_shapes[self.comm_rank_azimuth]))
+
+        # the local strategy contracts the local latitudes only
+        if self.polar_strategy == "local":
+            lat_start = sum(self.lat_shapes[: self.comm_rank_polar])
+            lat_end = lat_start + self.lat_shapes[self.comm_rank_polar]
+            tq, w = tq[lat_start:lat_end], w[lat_start:lat_end]
 
-        # compute weights
+        # compute weights of the local wavenumbers
         weights = paddle.to_tensor(w)
-        dpct = _precompute_dlegpoly(self.mmax, self.lmax, tq, norm=self.norm, csphase=self.csphase)
+        dpct = _get_local_legpoly(
+            self.mmax, self.lmax, tq, self.local_m, self.norm, False, self.csphase, vector=True
+        )
         dpct = paddle.to_tensor(dpct)
 
         # combine integration weights, normalization factor in to one:
@@ -386,11 +734,6 @@ class DistributedRealVectorSHT(nn.Layer):
         # since the second component is imaginary, we need to take complex conjugation into account
         weights[1] = -1 * weights[1]
 
-        # we need to split in m, pad before:
-        weights = split_tensor_along_dim(weights, dim=1, num_chunks=self.comm_size_azimuth)[
-            self.comm_rank_azimuth
-        ]
-
         # remember quadrature weights
         self.register_buffer("weights", weights, persistable=False)
 
@@ -400,37 +743,21 @@ class DistributedRealVectorSHT(nn.Layer):
         """
         return f"nlat={self.nlat}, nlon={self.nlon},\n lmax={self.lmax}, mmax={self.mmax},\n grid={self.grid}, csphase={self.csphase}"
 
-    def forward(self, x: paddle.Tensor):
-
-        assert len(x.shape) >= 3
-
-        # we need to ensure that we can split the channels evenly
-        num_chans = x.shape[1]
-
-        # h and w is split. First we make w local by transposing into channel dim
-        if self.comm_size_azimuth > 1:
-            x = distributed_transpose_azimuth.apply(x, (1, -1), self.lon_shapes)
-
+    def _rfft(self, x: paddle.Tensor):
         # apply real fft in the longitudinal direction: make sure to truncate to nlon
         x = 2.0 * np.pi * paddle.fft.rfft(x, n=self.nlon, axis=-1, norm="forward")
 
         # truncate
-        x = x[..., : self.mmax]
-
-        # transpose: after this, m is split and c is local
-        if self.comm_size_azimuth > 1:
-            chan_shapes = compute_split_shapes(num_chans, self.comm_size_azimuth)
-            x = distributed_transpose_azimuth.apply(x, (-1, 1), chan_shapes)
-
-        # transpose: after this, c is split and h is local
-        if self.comm_size_polar > 1:
-            x = distributed_transpose_polar.apply(x, (1, -2), self.lat_shapes)
+        return x[..., : self.mmax]
 
+    def _quadrature(self, x: paddle.Tensor):
         # do the Legendre-Gauss quadrature
         x = paddle.as_real(x)
 
         # create output array
-        xs = paddle.zeros_like(x, dtype=x.dtype)
+        out_shape = list(x.shape)
+        out_shape[-3] = self.lmax
+        xs = paddle.zeros(out_shape, dtype=x.dtype)
 
         # contraction - spheroidal component
         # real component
@@ -453,14 +780,49 @@ class DistributedRealVectorSHT(nn.Layer):
         ) - paddle.einsum("...km,mlk->...lm", x[..., 1, :, :, 1], self.weights[0].to(xs.dtype))
 
         # pad if required
-        x = paddle.as_complex(xs)
+        return paddle.as_complex(xs)
+
+    def _get_stages(self):
+
+        stages = [
+            # h and w is split. First we make w local by transposing into channel dim
+            ("azimuth", (0, -1), lambda num_chans: self.lon_shapes),
+            self._rfft,
+            # transpose: after this, m is split and c is local
+            (
+                "azimuth",
+                (-1, 0),
+                lambda num_chans: compute_split_shapes(num_chans, self.comm_size_azimuth),
+            ),
+        ]
+
+        if self.polar_strategy == "local":
+            stages += [
+                # contract the local latitudes, then sum the partial results: after this, l is split
+                self._quadrature,
+                lambda x: distributed_reduce_scatter_polar.apply(x, -2, self.l_shapes),
+            ]
+        else:
+            stages += [
+                # transpose: after this, c is split and h is local
+                ("polar", (0, -2), lambda num_chans: self.lat_shapes),
+                self._quadrature,
+                # transpose: after this, l is split and c is local
+                (
+                    "polar",
+                    (-2, 0),
+                    lambda num_chans: compute_split_shapes(num_chans, self.comm_size_polar),
+                ),
+            ]
+
+        return _set_wire_dtype(stages, self.wire_dtype)
+
+    @_comm_scope
+    def forward(self, x: paddle.Tensor):
 
-        # transpose: after this, l is split and c is local
-        if self.comm_size_polar > 1:
-            chan_shapes = compute_split_shapes(num_chans, self.comm_size_polar)
-            x = distributed_transpose_polar.apply(x, (-2, 1), chan_shapes)
+        assert len(x.shape) >= 3
 
-        return x
+        return _run_pipeline(x, self._get_stages(), self.micro_batches, num_transform_dims=3)
 
 
 class DistributedInverseRealVectorSHT(nn.Layer):
@@ -481,6 +843,9 @@ class DistributedInverseRealVectorSHT(nn.Layer):
         grid="lobatto",
         norm="ortho",
         csphase=True,
+        micro_batches=1,
+        polar_strategy="auto",
+        wire_dtype=None,
     ):
 
         super().__init__()
@@ -490,6 +855,8 @@ class DistributedInverseRealVectorSHT(nn.Layer):
         self.grid = grid
         self.norm = norm
         self.csphase = csphase
+        self.micro_batches = micro_batches
+        self.wire_dtype = _check_wire_dtype(wire_dtype)
 
         # compute quadrature points
         if self.grid == "legendre-gauss":
@@ -520,18 +887,25 @@ class DistributedInverseRealVectorSHT(nn.Layer):
         self.lon_shapes = compute_split_shapes(self.nlon, self.comm_size_azimuth)
         self.l_shapes = compute_split_shapes(self.lmax, self.comm_size_polar)
         self.m_shapes = compute_split_shapes(self.mmax, self.comm_size_azimuth)
+        self.polar_strategy = _get_polar_strategy(
+            polar_strategy, self.nlat, self.lmax, self.comm_size_polar
+        )
 
-        # compute legende polynomials
-        dpct = _precompute_dlegpoly(
-            self.mmax, self.lmax, t, norm=self.norm, inverse=True, csphase=self.csphase
+        # the wavenumbers of this rank
+        m_start = sum(self.m_shapes[: self.comm_rank_azimuth])
+        self.local_m = list(range(m_start, m_start + self.m_shapes[self.comm_rank_azimuth]))
+
+        # the local strategy evaluates the local latitudes only
+        if self.polar_strategy == "local":
+            lat_start = sum(self.lat_shapes[: self.comm_rank_polar])
+            t = t[lat_start : lat_start + self.lat_shapes[self.comm_rank_polar]]
+
+        # compute legende polynomials of the local wavenumbers
+        dpct = _get_local_legpoly(
+            self.mmax, self.lmax, t, self.local_m, self.norm, True, self.csphase, vector=True
         )
         dpct = paddle.to_tensor(dpct)
 
-        # split in m
-        dpct = split_tensor_along_dim(dpct, dim=1, num_chunks=self.comm_size_azimuth)[
-            self.comm_rank_azimuth
-        ]
-
         # register buffer
         self.register_buffer("dpct", dpct, persistable=False)
 
@@ -541,15 +915,7 @@ class DistributedInverseRealVectorSHT(nn.Layer):
         """
         return f"nlat={self.nlat}, nlon={self.nlon},\n lmax={self.lmax}, mmax={self.mmax},\n grid={self.grid}, csphase={self.csphase}"
 
-    def forward(self, x: paddle.Tensor):
-
-        # store num channels
-        num_chans = x.shape[1]
-
-        # transpose: after that, channels are split, l is local:
-        if self.comm_size_polar > 1:
-            x = distributed_transpose_polar.apply(x, (1, -2), self.l_shapes)
-
+    def _legendre(self, x: paddle.Tensor):
         # Evaluate associated Legendre functions on the output nodes
         x = paddle.as_real(x)
 
@@ -579,22 +945,49 @@ class DistributedInverseRealVectorSHT(nn.Layer):
         xs = paddle.stack((s, t), -4)
 
         # convert to complex
-        x = paddle.as_complex(xs)
+        return paddle.as_complex(xs)
 
-        if self.comm_size_polar > 1:
-            chan_shapes = compute_split_shapes(num_chans, self.comm_size_polar)
-            x = distributed_transpose_polar.apply(x, (-2, 1), chan_shapes)
+    def _irfft(self, x: paddle.Tensor):
+        # apply the inverse (real) FFT
+        return paddle.fft.irfft(x, n=self.nlon, axis=-1, norm="forward")
 
-        # transpose: after this, channels are split and m is local
-        if self.comm_size_azimuth > 1:
-            x = distributed_transpose_azimuth.apply(x, (1, -1), self.m_shapes)
+    def _get_stages(self):
 
-        # apply the inverse (real) FFT
-        x = paddle.fft.irfft(x, n=self.nlon, axis=-1, norm="forward")
+        if self.polar_strategy == "local":
+            stages = [
+                # gather l, then evaluate the local latitudes: after this, h is split
+                lambda x: distributed_all_gather_polar.apply(x, -2, self.l_shapes),
+                self._legendre,
+            ]
+        else:
+            stages = [
+                # transpose: after that, channels are split, l is local:
+                ("polar", (0, -2), lambda num_chans: self.l_shapes),
+                self._legendre,
+                (
+                    "polar",
+                    (-2, 0),
+                    lambda num_chans: compute_split_shapes(num_chans, self.comm_size_polar),
+                ),
+            ]
+
+        stages += [
+            # transpose: after this, channels are split and m is local
+            ("azimuth", (0, -1), lambda num_chans: self.m_shapes),
+            self._irfft,
+            # transpose: after this, m is split and channels are local
+            (
+                "azimuth",
+                (-1, 0),
+                lambda num_chans: compute_split_shapes(num_chans, self.comm_size_azimuth),
+            ),
+        ]
 
-        # transpose: after this, m is split and channels are local
-        if self.comm_size_azimuth > 1:
-            chan_shapes = compute_split_shapes(num_chans, self.comm_size_azimuth)
-            x = distributed_transpose_azimuth.apply(x, (-1, 1), chan_shapes)
+        return _set_wire_dtype(stages, self.wire_dtype)
 
-        return x
+    @_comm_scope
+    def forward(self, x: paddle.Tensor):
+
+        assert len(x.shape) >= 3
+
+        return _run_pipeline(x, self._get_stages(), self.micro_batches, num_transform_dims=3)
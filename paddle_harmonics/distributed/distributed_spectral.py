@@ -0,0 +1,185 @@
+# coding=utf-8
+
+# SPDX-FileCopyrightText: Copyright (c) 2022 The torch-harmonics Authors. All rights reserved.
+# SPDX-License-Identifier: BSD-3-Clause
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this
+# list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its
+# contributors may be used to endorse or promote products derived from
+# this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE
+# DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE
+# FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL
+# DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR
+# SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER
+# CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY,
+# OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
+# OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+
+import math
+
+import paddle
+import paddle.nn as nn
+
+from .distributed_sht import DistributedInverseRealVectorSHT
+from .distributed_sht import DistributedRealVectorSHT
+from .distributed_sht import _run_pipeline
+from .primitives import _comm_scope
+
+
+def _is_polar_transpose(stage):
+    return not callable(stage) and stage[0] == "polar"
+
+
+class DistributedDriscollHealyContraction(nn.Layer):
+    """
+    Driscoll & Healy contraction of spherical harmonic coefficients, which mixes the channels with weights depending on
+    the degree l only. It is applied to the coefficients in the decomposition returned by a distributed forward
+    transform, where the degrees are split over the polar group, the orders over the azimuth group and all channels
+    are local, such that the contraction of every rank only requires the weights of its degrees and no communication.
+    The channels are stored in the third to last dimension of the input. The weights are replicated on all ranks.
+    """
+
+    def __init__(self, transform, in_channels, out_channels, gain=2.0):
+        super().__init__()
+
+        self.lmax = transform.lmax
+        self.l_shapes = transform.l_shapes
+        self.comm_rank_polar = transform.comm_rank_polar
+
+        # same initialization as the Driscoll-Healy weights of the spectral convolutions
+        scale = math.sqrt(gain / in_channels) * paddle.ones([self.lmax, 2])
+        scale[0] *= math.sqrt(2)
+        self.weight = paddle.base.framework.EagerParamBase.from_tensor(
+            scale
+            * paddle.as_real(
+                paddle.randn([out_channels, in_channels, self.lmax], dtype="complex64")
+            )
+        )
+
+    def forward(self, x: paddle.Tensor):
+
+        # weights of the local degrees
+        l_start = sum(self.l_shapes[: self.comm_rank_polar])
+        weight = self.weight[:, :, l_start : l_start + self.l_shapes[self.comm_rank_polar]]
+        weight = paddle.as_complex(weight.astype(paddle.as_real(x).dtype))
+
+        return paddle.einsum("...ixy,kix->...kxy", x, weight)
+
+
+class DistributedSpectralMultiply(nn.Layer):
+    """
+    Multiplies spherical harmonic coefficients pointwise with a spectral filter of shape [lmax] or [lmax, mmax], e.g.
+    a function of the degree such as a hyperdiffusion. In the "degree" layout, which the distributed forward transform
+    returns, the degrees are split over the polar group. In the "channel" layout, which DistributedSpectralFilterS2
+    uses between the transforms, the channels are split instead and all degrees are local. The orders are split over
+    the azimuth group in both layouts.
+    """
+
+    def __init__(self, transform, spectral_filter):
+        super().__init__()
+
+        self.lmax = transform.lmax
+        self.mmax = transform.mmax
+        self.l_shapes = transform.l_shapes
+        self.comm_rank_polar = transform.comm_rank_polar
+
+        spectral_filter = paddle.to_tensor(spectral_filter)
+        if spectral_filter.dim() == 1:
+            spectral_filter = spectral_filter.unsqueeze(-1)
+        else:
+            spectral_filter = paddle.index_select(
+                spectral_filter, paddle.to_tensor(transform.local_m, dtype="int64"), axis=1
+            )
+
+        self.register_buffer("spectral_filter", spectral_filter, persistable=False)
+
+    def extra_repr(self):
+        """
+        Pretty print module
+        """
+        return f"lmax={self.lmax}, mmax={self.mmax}"
+
+    def forward(self, x: paddle.Tensor, spectral_layout="degree"):
+
+        spectral_filter = self.spectral_filter
+        if spectral_layout == "degree":
+            l_start = sum(self.l_shapes[: self.comm_rank_polar])
+            spectral_filter = spectral_filter[
+                l_start : l_start + self.l_shapes[self.comm_rank_polar]
+            ]
+        elif spectral_layout != "channel":
+            raise ValueError(f"Unknown spectral layout {spectral_layout}")
+
+        return x * spectral_filter.astype(x.dtype)
+
+
+class DistributedSpectralFilterS2(nn.Layer):
+    """
+    Applies a pointwise spectral filter between a distributed forward and inverse transform. Since the filter does not
+    mix channels, it is applied while the coefficients are split over the channels with all degrees local, which skips
+    the trailing polar transpose of the forward and the leading polar transpose of the inverse transform. The stages of
+    both transforms run as a single pipeline with the micro-batches of the forward transform. If a transform contracts
+    the local latitudes instead of transposing, the filter is applied in the degree layout.
+    """
+
+    def __init__(self, forward_transform, inverse_transform, spectral_filter):
+        super().__init__()
+
+        if (forward_transform.lmax != inverse_transform.lmax) or (
+            forward_transform.mmax != inverse_transform.mmax
+        ):
+            raise ValueError("Error, the transforms have to share the same spectral truncation")
+        if getattr(forward_transform, "m_distribution", "contiguous") != getattr(
+            inverse_transform, "m_distribution", "contiguous"
+        ):
+            raise ValueError(
+                "Error, the transforms have to share the same distribution of the orders"
+            )
+
+        self.forward_transform = forward_transform
+        self.inverse_transform = inverse_transform
+        self.multiply = DistributedSpectralMultiply(forward_transform, spectral_filter)
+
+        vector = isinstance(forward_transform, DistributedRealVectorSHT)
+        if vector != isinstance(inverse_transform, DistributedInverseRealVectorSHT):
+            raise ValueError(
+                "Error, the transforms have to be both scalar or both vector transforms"
+            )
+        self.num_transform_dims = 3 if vector else 2
+
+    @_comm_scope
+    def forward(self, x: paddle.Tensor):
+
+        stages_fwd = self.forward_transform._get_stages()
+        stages_inv = self.inverse_transform._get_stages()
+
+        if _is_polar_transpose(stages_fwd[-1]) and _is_polar_transpose(stages_inv[0]):
+            # the coefficients stay split over the channels, with all degrees local
+            stages = (
+                stages_fwd[:-1]
+                + [lambda x: self.multiply(x, spectral_layout="channel")]
+                + stages_inv[1:]
+            )
+        else:
+            stages = stages_fwd + [self.multiply] + stages_inv
+
+        return _run_pipeline(
+            x,
+            stages,
+            self.forward_transform.micro_batches,
+            num_transform_dims=self.num_transform_dims,
+        )
@@ -28,7 +28,16 @@
 # OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 #
+import json
+import math
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import partial
+from functools import wraps
 from typing import List
+from typing import Optional
+from typing import Tuple
 
 import paddle
 import paddle.distributed as dist
@@ -38,6 +47,7 @@ from paddle_harmonics.utils import paddle_aux
 from .utils import azimuth_group
 from .utils import is_initialized  # noqa
 from .utils import polar_group
+from .utils import polar_group_size
 
 
 # helper routine to compute uneven splitting in balanced way:
@@ -82,44 +92,532 @@ def split_tensor_along_dim(tensor, dim, num_chunks):
     return tensor_list
 
 
-def _transpose(tensor, dim0, dim1, dim1_split_sizes, group=None, async_op=False):
-    # get input format
-
-    # get comm params
+def _get_global_rank(group_rank: int, group=None) -> int:
+    return group_rank if group is None else group.ranks[group_rank]
+
+
+def _synchronize():
+    if paddle.is_compiled_with_cuda():
+        paddle.device.synchronize()
+
+
+class CommProfiler:
+    """
+    Records the communication of the distributed primitives while enabled. Every transpose, halo exchange,
+    reduce-scatter and all-gather appends a record with the operation, the innermost module scope it was issued in,
+    whether it belongs to the backward pass, the size of the group, the bytes sent to and received from other ranks,
+    the number of non-empty messages and the time blocked in the communication. Asynchronous transposes are blocked
+    until they are waited for. The device is synchronized around every operation, which serializes the execution and
+    should be kept out of production runs. The bytes are those of the payloads, fallbacks of backends without
+    all-to-all or reduce-scatter may move more.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.records = []
+        self._scopes = []
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        self.records = []
+
+    @contextmanager
+    def scope(self, module: Optional[str], backward: bool = False):
+        """
+        Attributes the communication issued within the context to the given module.
+        """
+        self._scopes.append((module, backward))
+        try:
+            yield
+        finally:
+            self._scopes.pop()
+
+    def current_scope(self):
+        return self._scopes[-1] if self._scopes else (None, False)
+
+    def summary(self):
+        """
+        Aggregates the records by module and operation.
+        """
+        summary = {}
+        for record in self.records:
+            entry = summary.setdefault(
+                (record["module"], record["op"]),
+                {"calls": 0, "messages": 0, "bytes_sent": 0, "bytes_recv": 0, "time": 0.0},
+            )
+            entry["calls"] += 1
+            for field in ["messages", "bytes_sent", "bytes_recv", "time"]:
+                entry[field] += record[field]
+        return summary
+
+    def get_imbalance(self, group=None):
+        """
+        Gathers the summaries of all ranks of the group and returns the maximum and mean time blocked over the ranks
+        and their ratio for every module and operation. Has to be called on all ranks of the group.
+        """
+        summaries = []
+        dist.all_gather_object(summaries, self.summary(), group=group)
+
+        imbalance = {}
+        for key in sorted(set().union(*summaries), key=str):
+            times = [summary[key]["time"] if key in summary else 0.0 for summary in summaries]
+            time_mean = sum(times) / len(times)
+            imbalance[key] = {
+                "time_max": max(times),
+                "time_mean": time_mean,
+                "imbalance": max(times) / time_mean if time_mean > 0 else 1.0,
+            }
+        return imbalance
+
+    def export_chrome_trace(self, path: str, gather: bool = True):
+        """
+        Writes the records as complete events in the chrome trace format, with one process per rank. If gather is
+        set, the records of all ranks are gathered and written by rank 0, which has to be called on all ranks.
+        """
+        rank = dist.get_rank() if dist.is_initialized() else 0
+        records = [(rank, self.records)]
+        if gather and dist.is_initialized() and dist.get_world_size() > 1:
+            records = []
+            dist.all_gather_object(records, (rank, self.records))
+            if rank != 0:
+                return
+
+        events = []
+        for record_rank, rank_records in records:
+            for record in rank_records:
+                events.append(
+                    {
+                        "name": record["op"],
+                        "cat": str(record["module"]),
+                        "ph": "X",
+                        "ts": record["timestamp"] * 1e6,
+                        "dur": record["time"] * 1e6,
+                        "pid": record_rank,
+                        "tid": "backward" if record["backward"] else "forward",
+                        "args": {
+                            field: record[field]
+                            for field in ["group_size", "messages", "bytes_sent", "bytes_recv"]
+                        },
+                    }
+                )
+
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events}, f)
+
+
+comm_profiler = CommProfiler()
+
+
+def _comm_scope(forward):
+    """
+    Attributes the communication of a forward method to the class of its layer.
+    """
+
+    @wraps(forward)
+    def wrapper(self, *args, **kwargs):
+        with comm_profiler.scope(type(self).__name__):
+            return forward(self, *args, **kwargs)
+
+    return wrapper
+
+
+@contextmanager
+def _profile_comm(op, group, bytes_sent, bytes_recv, messages):
+    """
+    Times the communication within the context and records it in the profiler, if enabled. Yields the record, which
+    is None while the profiler is disabled.
+    """
+    if not comm_profiler.enabled:
+        yield None
+        return
+
+    module, backward = comm_profiler.current_scope()
+    record = {
+        "op": op,
+        "module": module,
+        "backward": backward,
+        "group_size": dist.get_world_size(group=group),
+        "bytes_sent": bytes_sent,
+        "bytes_recv": bytes_recv,
+        "messages": messages,
+        "timestamp": time.time(),
+    }
+    _synchronize()
+    start = time.perf_counter()
+    yield record
+    _synchronize()
+    record["time"] = time.perf_counter() - start
+    comm_profiler.records.append(record)
+
+
+def _get_exchange_volume(send_sizes, recv_sizes, comm_rank, element_size):
+    """
+    Returns the bytes sent to and received from other ranks and the number of non-empty messages of an exchange with
+    the given numbers of elements per rank.
+    """
+    bytes_sent = sum(size for r, size in enumerate(send_sizes) if r != comm_rank) * element_size
+    bytes_recv = sum(size for r, size in enumerate(recv_sizes) if r != comm_rank) * element_size
+    messages = sum(1 for r, size in enumerate(send_sizes) if r != comm_rank and size > 0)
+    return bytes_sent, bytes_recv, messages
+
+
+def _scatter_all_to_all(x_recv, x_send, group=None):
+    """
+    All-to-all exchange built from one scatter per rank of the group, for backends which do not implement all-to-all
+    and only order point-to-point messages reliably between two ranks (e.g. gloo). The chunk sizes are gathered first
+    so that every rank can pad the chunks of a round to a common size, as required by the scatter.
+    """
     comm_size = dist.get_world_size(group=group)
     comm_rank = dist.get_rank(group=group)
 
-    # split and local transposition
-    tsplit = split_tensor_along_dim(tensor, num_chunks=comm_size, dim=dim0)
-    x_send = [y.contiguous() for y in tsplit]
-    x_send_shapes = [x.shape for x in x_send]
-    x_recv = []
-    x_shape = list(x_send_shapes[comm_rank])
-    for dim1_len in dim1_split_sizes:
-        x_shape[dim1] = dim1_len
-        x_recv.append(paddle.empty(x_shape, dtype=tensor.dtype))
+    def _flatten(x):
+        return (paddle.as_real(x) if x.is_complex() else x).flatten()
+
+    numels = paddle.to_tensor([_flatten(x).shape[0] for x in x_send], dtype="int64")
+    sizes = []
+    dist.all_gather(sizes, numels, group=group)
+    sizes = paddle.stack(sizes).numpy()
+
+    # the chunks are written into the receive buffers, which may be views of a larger workspace
+    if x_recv[comm_rank].numel() > 0:
+        paddle.assign(x_send[comm_rank].reshape(x_recv[comm_rank].shape), output=x_recv[comm_rank])
+    for src in range(comm_size):
+        chunk_size = int(sizes[src].max())
+        if chunk_size == 0:
+            continue
+        out = paddle.empty([chunk_size], dtype=_flatten(x_recv[comm_rank]).dtype)
+        tensor_list = None
+        if src == comm_rank:
+            tensor_list = []
+            for x in x_send:
+                x = _flatten(x)
+                pad = paddle.zeros([chunk_size - x.shape[0]], dtype=x.dtype)
+                tensor_list.append(paddle.concat([x, pad]))
+        dist.scatter(out, tensor_list, src=_get_global_rank(src, group), group=group)
+        if src != comm_rank and x_recv[src].numel() > 0:
+            shape = list(x_recv[src].shape)
+            if x_recv[src].is_complex():
+                chunk = paddle.as_complex(out[: 2 * x_recv[src].numel()].reshape(shape + [2]))
+            else:
+                chunk = out[: x_recv[src].numel()].reshape(shape)
+            paddle.assign(chunk, output=x_recv[src])
+
+
+def _all_to_all(x_recv, x_send, group=None, async_op=False):
+    try:
+        return dist.alltoall(x_recv, x_send, group=group, sync_op=not async_op)
+    except NotImplementedError:
+        # the backend does not implement all-to-all (e.g. gloo), exchange the chunks with scatters instead
+        _scatter_all_to_all(x_recv, x_send, group=group)
+        return None
+
+
+def _all_to_all_single(
+    x_recv, x_send, recv_split_sizes, send_split_sizes, group=None, async_op=False
+):
+    try:
+        return dist.alltoall_single(
+            x_recv, x_send, send_split_sizes, recv_split_sizes, group=group, sync_op=not async_op
+        )
+    except NotImplementedError:
+        # the backend does not implement all-to-all (e.g. gloo), exchange the chunks with scatters instead
+        def _split(x, split_sizes):
+            offsets = [sum(split_sizes[:r]) for r in range(len(split_sizes) + 1)]
+            return [x[offsets[r] : offsets[r + 1]] for r in range(len(split_sizes))]
+
+        _scatter_all_to_all(
+            _split(x_recv, recv_split_sizes), _split(x_send, send_split_sizes), group=group
+        )
+        return None
+
+
+class _WorkspacePool:
+    """
+    Persistent workspaces of the transposes, keyed by the shape and dtype of the transposed tensor, the transposed
+    dimensions and the group. A workspace is taken out of the pool while it is in use, such that concurrent transposes
+    of the same shape do not share it. The workspaces of at most max_keys keys are kept, those of the least recently
+    used keys are dropped first.
+    """
+
+    def __init__(self, max_keys: int = 64):
+        self.max_keys = max_keys
+        self._free = OrderedDict()
+
+    def acquire(self, key, numel: int, dtype):
+        free = self._free.get(key)
+        if free:
+            self._free.move_to_end(key)
+            return free.pop()
+        return paddle.empty([numel], dtype=dtype)
+
+    def release(self, key, workspace):
+        self._free.setdefault(key, []).append(workspace)
+        self._free.move_to_end(key)
+        while len(self._free) > self.max_keys:
+            self._free.popitem(last=False)
+
+    def clear(self):
+        self._free = OrderedDict()
+
+
+_send_workspaces = _WorkspacePool()
+_recv_workspaces = _WorkspacePool()
+
+
+class _PendingExchange:
+    """
+    Asynchronous all-to-all, which returns its send workspace to the pool once it has completed and then runs the
+    optional finish callback, which decodes compressed payloads, and the optional release callback, which returns
+    pooled receive buffers. The time spent waiting is added to the profiler record of the exchange, if any.
+    """
+
+    def __init__(self, task, key, workspace, finish=None, record=None, release=None):
+        self.task = task
+        self.key = key
+        self.workspace = workspace
+        self.finish = finish
+        self.record = record
+        self.release = release
+
+    def wait(self):
+        start = time.perf_counter()
+        self.task.wait()
+        if self.record is not None:
+            _synchronize()
+            self.record["time"] += time.perf_counter() - start
+        _send_workspaces.release(self.key, self.workspace)
+        if self.finish is not None:
+            self.finish()
+        if self.release is not None:
+            self.release()
+
+
+# reduced precision formats of the transpose payloads and their relative rounding errors. The int8 format is scaled by
+# the maximum magnitude of every chunk, such that its error is relative to this maximum.
+WIRE_DTYPES = {"float16": 2.0**-11, "bfloat16": 2.0**-8, "int8": 1.0 / 254.0}
+
+
+def _check_wire_dtype(wire_dtype):
+    if wire_dtype is not None and wire_dtype not in WIRE_DTYPES:
+        raise ValueError(
+            f"Unknown wire dtype {wire_dtype}, expected None or one of {list(WIRE_DTYPES.keys())}"
+        )
+    return wire_dtype
+
+
+def _encode_wire(chunk, wire_dtype):
+    """
+    Casts a chunk to the wire format. Returns the cast chunk and its scale, which is None unless the format is int8.
+    """
+    if wire_dtype != "int8":
+        return chunk.astype(wire_dtype), None
+    scale = paddle.clip(chunk.abs().max(), min=1e-30) / 127.0
+    return paddle.round(chunk / scale).astype("int8"), scale
+
+
+def _decode_wire(x_wire, x_out, split_sizes, scales=None):
+    """
+    Restores the chunks of x_wire, which are split according to split_sizes, into x_out. The chunk from rank r is
+    multiplied with scales[r] if scales are given.
+    """
+    if scales is None:
+        paddle.assign(x_wire.astype(x_out.dtype), output=x_out)
+        return
+    offset = 0
+    for src, size in enumerate(split_sizes):
+        if size > 0:
+            chunk = x_wire[offset : offset + size].astype(x_out.dtype) * scales[src]
+            paddle.assign(chunk, output=x_out[offset : offset + size])
+        offset += size
+
+
+def _release_recv_workspaces(workspaces):
+    for key, workspace in workspaces:
+        _recv_workspaces.release(key, workspace)
+
+
+def _transpose(
+    tensor,
+    dim0,
+    dim1,
+    dim1_split_sizes,
+    group=None,
+    async_op=False,
+    dim0_order=None,
+    wire_dtype=None,
+    recv_pool=False,
+):
+    """
+    Moves the split of tensor over the group from dim1 to dim0. The tensor is split along dim0 into one chunk per rank
+    and the chunks received from all ranks are concatenated along dim1, which is split according to dim1_split_sizes.
+    If dim0_order is given, the entries of dim0 are taken in this order while packing, such that rank r receives the
+    entries dim0_order[offset_r : offset_r + dim0_split_sizes[r]].
+    The chunks are packed into a persistent send workspace with dim1 leading, such that the received chunks are stacked
+    along dim1 in a single receive buffer and the concatenated result is a view of it. The receive buffer is allocated
+    per call, unless recv_pool is set. Then it is taken from a persistent pool and returned to it once the exchange has
+    completed, such that the result is only valid until the next transpose with the same key and must be consumed
+    before, neither kept nor saved for the backward pass. The transpose layers therefore never pool, only the
+    distributed transforms do so for results which their next stage consumes right away without autograd.
+    Returns the result, the split sizes of dim0 and the pending exchange, which is None unless async_op is set and the
+    backend supports asynchronous all-to-all.
+    If wire_dtype is one of WIRE_DTYPES, the chunks are cast to it while packing, complex tensors as their real views,
+    and the received chunks are cast back into a buffer of the original precision, of which the result is a view.
+    """
 
-    # global transposition
-    req = dist.all_to_all(x_recv, x_send, group=group, async_op=async_op)
+    # get comm params
+    comm_size = dist.get_world_size(group=group)
+    comm_rank = dist.get_rank(group=group)
 
-    # get dim0 split sizes
-    dim0_split_sizes = [x[dim0] for x in x_send_shapes]
+    ndim = tensor.dim()
+    dim0 = dim0 % ndim
+    dim1 = dim1 % ndim
+
+    # compressed payloads are real, the real and imaginary parts become a trailing dimension
+    is_complex = wire_dtype is not None and tensor.is_complex()
+    if is_complex:
+        tensor = paddle.as_real(tensor)
+        ndim += 1
+
+    dim0_split_sizes = compute_split_shapes(tensor.shape[dim0], comm_size)
+
+    # layout of the chunks: dim1, dim0 and the remaining dimensions in their order
+    perm = [dim1, dim0] + [d for d in range(ndim) if d not in (dim0, dim1)]
+    inv_perm = [perm.index(d) for d in range(ndim)]
+    rest_shape = [tensor.shape[d] for d in perm[2:]]
+    rest_numel = 1
+    for size in rest_shape:
+        rest_numel *= size
+    send_split_sizes = [tensor.shape[dim1] * size * rest_numel for size in dim0_split_sizes]
+    recv_split_sizes = [
+        size * dim0_split_sizes[comm_rank] * rest_numel for size in dim1_split_sizes
+    ]
+
+    # pack the chunks into the send workspace
+    send_dtype = tensor.dtype if wire_dtype is None else wire_dtype
+    key = (
+        tuple(tensor.shape),
+        tensor.dtype,
+        send_dtype,
+        dim0,
+        dim1,
+        0 if group is None else group.id,
+    )
+    x_send = _send_workspaces.acquire(key, sum(send_split_sizes), send_dtype)
+
+    # only int8 payloads are sent together with the scales of their chunks
+    with_scales = wire_dtype == "int8"
+    scales = []
+    offset = 0
+    start = 0
+    for size, chunk_size in zip(send_split_sizes, dim0_split_sizes):
+        scale = None
+        if size > 0:
+            if dim0_order is None:
+                chunk = paddle.slice(tensor, [dim0], [start], [start + chunk_size])
+            else:
+                index = paddle.to_tensor(dim0_order[start : start + chunk_size], dtype="int64")
+                chunk = paddle.index_select(tensor, index, axis=dim0)
+            chunk = chunk.transpose(perm)
+            if wire_dtype is not None:
+                chunk, scale = _encode_wire(chunk, wire_dtype)
+            paddle.assign(chunk, output=x_send[offset : offset + size].reshape(chunk.shape))
+        if with_scales:
+            scales.append(paddle.ones([], dtype=tensor.dtype) if scale is None else scale)
+        offset += size
+        start += chunk_size
+
+    bytes_sent, bytes_recv, messages = _get_exchange_volume(
+        send_split_sizes, recv_split_sizes, comm_rank, x_send.element_size()
+    )
+    if with_scales:
+        bytes_sent += (comm_size - 1) * scales[0].element_size()
+        bytes_recv += (comm_size - 1) * scales[0].element_size()
+
+    with _profile_comm("transpose", group, bytes_sent, bytes_recv, messages) as record:
+        # the receivers of int8 payloads need the scales of their chunks
+        recv_scales = None
+        if with_scales:
+            recv_scales = paddle.empty([comm_size], dtype=tensor.dtype)
+            _all_to_all_single(
+                recv_scales, paddle.stack(scales), [1] * comm_size, [1] * comm_size, group=group
+            )
+
+        # global transposition
+        recv_key = key + (tuple(dim1_split_sizes),)
+        if recv_pool:
+            x_recv = _recv_workspaces.acquire(recv_key, sum(recv_split_sizes), send_dtype)
+        else:
+            x_recv = paddle.empty([sum(recv_split_sizes)], dtype=send_dtype)
+        task = _all_to_all_single(
+            x_recv, x_send, recv_split_sizes, send_split_sizes, group=group, async_op=async_op
+        )
 
-    return x_recv, dim0_split_sizes, req
+    # compressed payloads are decoded into a buffer of the original precision once they have arrived
+    release = None
+    if wire_dtype is None:
+        x_out, finish = x_recv, None
+        if recv_pool:
+            release = partial(_recv_workspaces.release, recv_key, x_recv)
+    else:
+        out_key = recv_key + ("decoded",)
+        if recv_pool:
+            x_out = _recv_workspaces.acquire(out_key, sum(recv_split_sizes), tensor.dtype)
+            release = partial(_release_recv_workspaces, [(recv_key, x_recv), (out_key, x_out)])
+        else:
+            x_out = paddle.empty([sum(recv_split_sizes)], dtype=tensor.dtype)
+        finish = partial(_decode_wire, x_recv, x_out, recv_split_sizes, recv_scales)
+
+    if async_op and task is not None:
+        req = _PendingExchange(task, key, x_send, finish, record, release)
+    else:
+        req = None
+        _send_workspaces.release(key, x_send)
+        if finish is not None:
+            finish()
+        if release is not None:
+            release()
+
+    recv_shape = [sum(dim1_split_sizes), dim0_split_sizes[comm_rank]] + rest_shape
+    x = x_out.reshape(recv_shape).transpose(inv_perm)
+
+    return (paddle.as_complex(x) if is_complex else x), dim0_split_sizes, req
+
+
+def _reorder(x, dim, order):
+    """
+    Undoes the ordering of a transpose with dim0_order on the gathered dimension dim.
+    """
+    if order is None:
+        return x
+    inverse = [0] * len(order)
+    for i, j in enumerate(order):
+        inverse[j] = i
+    return paddle.index_select(x, paddle.to_tensor(inverse, dtype="int64"), axis=dim)
 
 
 class distributed_transpose_azimuth(paddle.autograd.PyLayer):
     @staticmethod
-    def forward(ctx, x, dims, dim1_split_sizes):
-
-        # WAR for a potential contiguous check bug for channels last contiguous tensors
-        x = x.contiguous()
-        xlist, dim0_split_sizes, _ = _transpose(
-            x, dims[0], dims[1], dim1_split_sizes, group=azimuth_group()
+    def forward(ctx, x, dims, dim1_split_sizes, dim0_order=None, wire_dtype=None):
+
+        x, dim0_split_sizes, _ = _transpose(
+            x,
+            dims[0],
+            dims[1],
+            dim1_split_sizes,
+            group=azimuth_group(),
+            dim0_order=dim0_order,
+            wire_dtype=_check_wire_dtype(wire_dtype),
         )
-        x = paddle.concat(xlist, axis=dims[1]).contiguous()
         ctx.dims = dims
         ctx.dim0_split_sizes = dim0_split_sizes
+        ctx.dim0_order = dim0_order
+        ctx.wire_dtype = wire_dtype
+        ctx.module = comm_profiler.current_scope()[0]
         return x
 
     @staticmethod
@@ -127,25 +625,37 @@ class distributed_transpose_azimuth(paddle.autograd.PyLayer):
 
         dims = ctx.dims
         dim0_split_sizes = ctx.dim0_split_sizes
-        # WAR for a potential contiguous check bug for channels last contiguous tensors
-        go = go.contiguous()
-        gilist, _, _ = _transpose(go, dims[1], dims[0], dim0_split_sizes, group=azimuth_group())
-        gi = paddle.concat(gilist, axis=dims[0]).contiguous()
-        return gi, None, None
+        with comm_profiler.scope(ctx.module, backward=True):
+            gi, _, _ = _transpose(
+                go,
+                dims[1],
+                dims[0],
+                dim0_split_sizes,
+                group=azimuth_group(),
+                wire_dtype=ctx.wire_dtype,
+            )
+        gi = _reorder(gi, dims[0], ctx.dim0_order)
+        return gi
 
 
 class distributed_transpose_polar(paddle.autograd.PyLayer):
     @staticmethod
-    def forward(ctx, x, dim, dim1_split_sizes):
-
-        # WAR for a potential contiguous check bug for channels last contiguous tensors
-        x = x.contiguous()
-        xlist, dim0_split_sizes, _ = _transpose(
-            x, dim[0], dim[1], dim1_split_sizes, group=polar_group()
+    def forward(ctx, x, dim, dim1_split_sizes, dim0_order=None, wire_dtype=None):
+
+        x, dim0_split_sizes, _ = _transpose(
+            x,
+            dim[0],
+            dim[1],
+            dim1_split_sizes,
+            group=polar_group(),
+            dim0_order=dim0_order,
+            wire_dtype=_check_wire_dtype(wire_dtype),
         )
-        x = paddle.concat(xlist, axis=dim[1]).contiguous()
         ctx.dim = dim
         ctx.dim0_split_sizes = dim0_split_sizes
+        ctx.dim0_order = dim0_order
+        ctx.wire_dtype = wire_dtype
+        ctx.module = comm_profiler.current_scope()[0]
         return x
 
     @staticmethod
@@ -153,8 +663,334 @@ class distributed_transpose_polar(paddle.autograd.PyLayer):
 
         dim = ctx.dim
         dim0_split_sizes = ctx.dim0_split_sizes
-        # WAR for a potential contiguous check bug for channels last contiguous tensors
-        go = go.contiguous()
-        gilist, _, _ = _transpose(go, dim[1], dim[0], dim0_split_sizes, group=polar_group())
-        gi = paddle.concat(gilist, axis=dim[0]).contiguous()
-        return gi, None, None
+        with comm_profiler.scope(ctx.module, backward=True):
+            gi, _, _ = _transpose(
+                go, dim[1], dim[0], dim0_split_sizes, group=polar_group(), wire_dtype=ctx.wire_dtype
+            )
+        gi = _reorder(gi, dim[0], ctx.dim0_order)
+        return gi
+
+
+def _get_halo_plan(lat_shapes: List[int], lat_bands: List[Tuple[int, int]], comm_rank: int):
+    """
+    Computes which rows of the locally owned latitudes every rank needs and which rows of the band of this rank are
+    owned by which rank. Rows are given relative to the owned slab of the sender and the band of the receiver.
+    """
+    offsets = [sum(lat_shapes[:r]) for r in range(len(lat_shapes) + 1)]
+    own_start, own_end = offsets[comm_rank], offsets[comm_rank + 1]
+    band_start, band_end = lat_bands[comm_rank]
+
+    sends = {}
+    recvs = {}
+    for peer in range(len(lat_shapes)):
+        # rows of this rank needed by the peer
+        start, end = max(own_start, lat_bands[peer][0]), min(own_end, lat_bands[peer][1])
+        if start < end:
+            sends[peer] = (start - own_start, end - own_start)
+        # rows of the peer needed by this rank
+        start, end = max(offsets[peer], band_start), min(offsets[peer + 1], band_end)
+        if start < end:
+            recvs[peer] = (start - band_start, end - band_start)
+
+    return sends, recvs
+
+
+def _exchange_rows(x, dim, sends, recvs, group, op="halo_exchange"):
+    """
+    Sends the rows sends[peer] = (start, end) of x to every peer and returns the list of the rows received from every
+    rank, which have the extents given by recvs. Ranks which do not exchange rows send and receive empty chunks. The
+    exchange is recorded as op by the profiler.
+    """
+    comm_size = dist.get_world_size(group=group)
+    comm_rank = dist.get_rank(group=group)
+    x_send = []
+    x_recv = []
+    shape = list(x.shape)
+    for peer in range(comm_size):
+        start, end = sends.get(peer, (0, 0))
+        x_send.append(paddle.slice(x, [dim], [start], [end]).contiguous())
+        start, end = recvs.get(peer, (0, 0))
+        shape[dim] = end - start
+        x_recv.append(paddle.empty(shape, dtype=x.dtype))
+
+    volume = _get_exchange_volume(
+        [math.prod(xs.shape) for xs in x_send],
+        [math.prod(xr.shape) for xr in x_recv],
+        comm_rank,
+        x.element_size(),
+    )
+    with _profile_comm(op, group, *volume):
+        _all_to_all(x_recv, x_send, group=group)
+    return x_recv
+
+
+def _halo_exchange(x, dim, lat_shapes, lat_bands, group):
+    comm_rank = dist.get_rank(group=group)
+    sends, recvs = _get_halo_plan(lat_shapes, lat_bands, comm_rank)
+    dim = dim % x.dim()
+
+    x_recv = _exchange_rows(x, dim, sends, recvs, group)
+
+    # the owned slabs partition the latitudes, so the pieces of the band come in the order of the ranks
+    return paddle.concat([x_recv[peer] for peer in sorted(recvs.keys())], axis=dim)
+
+
+def _halo_reduce(go, dim, lat_shapes, lat_bands, group):
+    comm_rank = dist.get_rank(group=group)
+    sends, recvs = _get_halo_plan(lat_shapes, lat_bands, comm_rank)
+    dim = dim % go.dim()
+
+    # the transposed exchange returns the gradient of every halo row to its owner
+    go_recv = _exchange_rows(go, dim, recvs, sends, group, op="halo_reduce")
+
+    shape = list(go.shape)
+    shape[dim] = lat_shapes[comm_rank]
+    gi = paddle.zeros(shape, dtype=go.dtype)
+    for peer, (start, end) in sends.items():
+        index = paddle.arange(start, end)
+        gi = paddle.index_add(gi, index, dim, go_recv[peer])
+
+    return gi
+
+
+class distributed_halo_exchange_polar(paddle.autograd.PyLayer):
+    """
+    Gathers the band of latitudes lat_bands[rank] = (start, end) on every rank of the polar group, where the latitudes
+    are split according to lat_shapes. The rows outside of the owned slab are received from the ranks which own
+    them. In the backward pass, the gradients of these rows are sent back to their owners and accumulated.
+    """
+
+    @staticmethod
+    def forward(ctx, x, dim, lat_shapes, lat_bands):
+        ctx.dim = dim
+        ctx.lat_shapes = lat_shapes
+        ctx.lat_bands = lat_bands
+        ctx.module = comm_profiler.current_scope()[0]
+        return _halo_exchange(x, dim, lat_shapes, lat_bands, polar_group())
+
+    @staticmethod
+    def backward(ctx, go):
+        with comm_profiler.scope(ctx.module, backward=True):
+            gi = _halo_reduce(go, ctx.dim, ctx.lat_shapes, ctx.lat_bands, polar_group())
+        return gi
+
+
+def _reduce_scatter_all_reduce(x, dim, split_sizes, group=None):
+    # reduce everything and keep the chunk of this rank
+    x = x.clone()
+    dist.all_reduce(x, group=group)
+    return paddle.split(x, split_sizes, axis=dim)[dist.get_rank(group=group)]
+
+
+def _reduce_scatter(x, dim, split_sizes, group=None):
+    """
+    Sums x over the group and returns the chunk of the sum along dim which belongs to this rank, where dim is split
+    according to split_sizes. Complex tensors are reduced as their real views.
+    """
+    comm_rank = dist.get_rank(group=group)
+    dim = dim % x.dim()
+
+    is_complex = x.is_complex()
+    if is_complex:
+        x = paddle.as_real(x)
+
+    chunks = [chunk.contiguous() for chunk in paddle.split(x, split_sizes, axis=dim)]
+    out = paddle.empty_like(chunks[comm_rank])
+
+    numels = [math.prod(chunk.shape) for chunk in chunks]
+    volume = _get_exchange_volume(
+        numels, [numels[comm_rank]] * len(numels), comm_rank, x.element_size()
+    )
+    with _profile_comm("reduce_scatter", group, *volume):
+        if len(set(split_sizes)) > 1 or dist.get_backend(group).lower() == "gloo":
+            # reduce-scatter needs even chunks and is not available with gloo
+            out = _reduce_scatter_all_reduce(x, dim, split_sizes, group=group)
+        else:
+            try:
+                dist.reduce_scatter(out, chunks, group=group)
+            except NotImplementedError:
+                # the backend does not implement reduce-scatter
+                out = _reduce_scatter_all_reduce(x, dim, split_sizes, group=group)
+
+    return paddle.as_complex(out) if is_complex else out
+
+
+def _all_gather(x, dim, split_sizes, group=None):
+    """
+    Gathers the chunks of all ranks of the group and concatenates them along dim, where the chunk of rank r has
+    split_sizes[r] entries along dim. The chunks are padded to a common size for the gather.
+    """
+    comm_rank = dist.get_rank(group=group)
+    dim = dim % x.dim()
+
+    is_complex = x.is_complex()
+    if is_complex:
+        x = paddle.as_real(x)
+
+    row_numel = math.prod(x.shape) // max(x.shape[dim], 1)
+    volume = _get_exchange_volume(
+        [x.shape[dim] * row_numel] * len(split_sizes),
+        [size * row_numel for size in split_sizes],
+        comm_rank,
+        x.element_size(),
+    )
+
+    chunk_size = max(split_sizes)
+    if x.shape[dim] < chunk_size:
+        pad_shape = list(x.shape)
+        pad_shape[dim] = chunk_size - x.shape[dim]
+        x = paddle.concat([x, paddle.zeros(pad_shape, dtype=x.dtype)], axis=dim)
+
+    chunks = []
+    with _profile_comm("all_gather", group, *volume):
+        dist.all_gather(chunks, x.contiguous(), group=group)
+    out = paddle.concat(
+        [paddle.slice(chunk, [dim], [0], [size]) for chunk, size in zip(chunks, split_sizes)],
+        axis=dim,
+    )
+
+    return paddle.as_complex(out) if is_complex else out
+
+
+class distributed_reduce_scatter_polar(paddle.autograd.PyLayer):
+    """
+    Sums the partial results of the ranks of the polar group and splits the sum along dim according to split_sizes.
+    The gradient is gathered from all ranks in the backward pass.
+    """
+
+    @staticmethod
+    def forward(ctx, x, dim, split_sizes):
+        ctx.dim = dim
+        ctx.split_sizes = split_sizes
+        ctx.module = comm_profiler.current_scope()[0]
+        if polar_group_size() == 1:
+            return x.view(x.shape)
+        return _reduce_scatter(x, dim, split_sizes, group=polar_group())
+
+    @staticmethod
+    def backward(ctx, go):
+        if polar_group_size() == 1:
+            return go
+        with comm_profiler.scope(ctx.module, backward=True):
+            gi = _all_gather(go, ctx.dim, ctx.split_sizes, group=polar_group())
+        return gi
+
+
+class distributed_all_gather_polar(paddle.autograd.PyLayer):
+    """
+    Gathers a tensor, which is split along dim across the polar group according to split_sizes, on every rank of the
+    group. In the backward pass, the gradients of all ranks are summed and split again.
+    """
+
+    @staticmethod
+    def forward(ctx, x, dim, split_sizes):
+        ctx.dim = dim
+        ctx.split_sizes = split_sizes
+        ctx.module = comm_profiler.current_scope()[0]
+        if polar_group_size() == 1:
+            return x.view(x.shape)
+        return _all_gather(x, dim, split_sizes, group=polar_group())
+
+    @staticmethod
+    def backward(ctx, go):
+        if polar_group_size() == 1:
+            return go
+        with comm_profiler.scope(ctx.module, backward=True):
+            gi = _reduce_scatter(go, ctx.dim, ctx.split_sizes, group=polar_group())
+        return gi
+
+
+class _TransposeHandle:
+    """
+    Carries the pending communication of an asynchronous transpose from distributed_transpose_start to
+    distributed_transpose_wait.
+    """
+
+    def __init__(self, group):
+        self.group = group
+        self.task = None
+
+
+class distributed_transpose_start(paddle.autograd.PyLayer):
+    """
+    Starts the transpose of x over the group of the handle without waiting for its completion and returns the
+    result, which must not be used before it is passed through distributed_transpose_wait.
+    """
+
+    @staticmethod
+    def forward(ctx, x, dims, dim1_split_sizes, handle, dim0_order=None, wire_dtype=None):
+
+        x, dim0_split_sizes, handle.task = _transpose(
+            x,
+            dims[0],
+            dims[1],
+            dim1_split_sizes,
+            group=handle.group,
+            async_op=True,
+            dim0_order=dim0_order,
+            wire_dtype=_check_wire_dtype(wire_dtype),
+        )
+        ctx.dims = dims
+        ctx.dim0_split_sizes = dim0_split_sizes
+        ctx.dim0_order = dim0_order
+        ctx.wire_dtype = wire_dtype
+        ctx.group = handle.group
+        ctx.module = comm_profiler.current_scope()[0]
+        return x
+
+    @staticmethod
+    def backward(ctx, go):
+
+        dims = ctx.dims
+        with comm_profiler.scope(ctx.module, backward=True):
+            gi, _, _ = _transpose(
+                go,
+                dims[1],
+                dims[0],
+                ctx.dim0_split_sizes,
+                group=ctx.group,
+                wire_dtype=ctx.wire_dtype,
+            )
+        gi = _reorder(gi, dims[0], ctx.dim0_order)
+        return gi
+
+
+class distributed_transpose_wait(paddle.autograd.PyLayer):
+    """
+    Completes a transpose started by distributed_transpose_start.
+    """
+
+    @staticmethod
+    def forward(ctx, x, handle):
+        if handle.task is not None:
+            handle.task.wait()
+        return x.view(x.shape)
+
+    @staticmethod
+    def backward(ctx, go):
+        return go
+
+
+class PendingTranspose:
+    """
+    Result of an asynchronous transpose, which becomes available with wait().
+    """
+
+    def __init__(self, x, dims, dim1_split_sizes, group, dim0_order=None, wire_dtype=None):
+        self._handle = _TransposeHandle(group)
+        self._x = distributed_transpose_start.apply(
+            x, dims, dim1_split_sizes, self._handle, dim0_order, wire_dtype
+        )
+
+    def wait(self):
+        return distributed_transpose_wait.apply(self._x, self._handle)
+
+
+def distributed_transpose_async(x, dims, dim1_split_sizes, group, dim0_order=None, wire_dtype=None):
+    """
+    Starts the transpose of x from dims[0] to dims[1] over the given group, where dims[1] is split according to
+    dim1_split_sizes and the entries of dims[0] are distributed in dim0_order, and returns a PendingTranspose.
+    Computations issued before its wait() overlap with the communication on backends which support asynchronous
+    all-to-all. The payloads are sent in wire_dtype, if given.
+    """
+    return PendingTranspose(x, dims, dim1_split_sizes, group, dim0_order, wire_dtype)
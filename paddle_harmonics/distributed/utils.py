@@ -30,6 +30,7 @@
 #
 
 # we need this in order to enable distributed
+import paddle
 import paddle.distributed as dist
 
 # those need to be global
@@ -49,6 +50,7 @@ def azimuth_group():
 def init(polar_process_group, azimuth_process_group):
     global _POLAR_PARALLEL_GROUP
     global _AZIMUTH_PARALLEL_GROUP
+    global _IS_INITIALIZED
     _POLAR_PARALLEL_GROUP = polar_process_group
     _AZIMUTH_PARALLEL_GROUP = azimuth_process_group
     _IS_INITIALIZED = True
@@ -92,3 +94,66 @@ def azimuth_group_rank() -> int:
         return 0
     else:
         return dist.get_rank(group=_AZIMUTH_PARALLEL_GROUP)
+
+
+def init_process_grid(grid_size_polar: int, grid_size_azimuth: int):
+    """
+    Initializes the parallel environment if required, creates the polar and azimuth groups of a grid_size_polar x
+    grid_size_azimuth process grid and registers them with init. The azimuth groups are formed by consecutive world
+    ranks, the polar groups by the ranks with the same position in their azimuth group. Groups of a single rank are
+    not created. Returns the ranks of this process in the polar and the azimuth group.
+    """
+    if not dist.is_initialized():
+        dist.init_parallel_env()
+
+    world_rank = dist.get_rank()
+    world_size = dist.get_world_size()
+    if grid_size_polar * grid_size_azimuth != world_size:
+        raise ValueError(
+            f"Error, a process grid of {grid_size_polar} x {grid_size_azimuth} does not match the world size {world_size}"
+        )
+
+    # all processes have to take part in the creation of every group. The barriers keep gloo from connecting to
+    # ranks which are still starting up or setting up the previous group
+    if world_size > 1:
+        dist.barrier()
+    azimuth_ranks = [
+        list(range(start, start + grid_size_azimuth))
+        for start in range(0, world_size, grid_size_azimuth)
+    ]
+    polar_ranks = [list(ranks) for ranks in zip(*azimuth_ranks)]
+    groups = {}
+    for name, ranks in [("azimuth", azimuth_ranks), ("polar", polar_ranks)]:
+        if len(ranks[0]) == 1:
+            continue
+        for grp in ranks:
+            group = dist.new_group(ranks=grp)
+            dist.barrier()
+            if world_rank in grp:
+                groups[name] = group
+
+    init(groups.get("polar"), groups.get("azimuth"))
+
+    return world_rank // grid_size_azimuth, world_rank % grid_size_azimuth
+
+
+def _spawn_worker(func, grid_size_polar, grid_size_azimuth, seed, args):
+    init_process_grid(grid_size_polar, grid_size_azimuth)
+    if seed is not None:
+        paddle.seed(seed)
+    func(*args)
+
+
+def spawn(func, grid_size_polar: int, grid_size_azimuth: int, args=(), seed=None, backend="gloo"):
+    """
+    Runs func(*args) in grid_size_polar * grid_size_azimuth processes on the local host, which form a process grid
+    set up by init_process_grid. With gloo, this runs distributed transforms on a single CPU host, e.g. for tests and
+    scaling experiments. If a seed is given, it is set on all ranks after the setup of the grid, such that all ranks
+    draw the same random numbers.
+    """
+    return dist.spawn(
+        _spawn_worker,
+        args=(func, grid_size_polar, grid_size_azimuth, seed, tuple(args)),
+        nprocs=grid_size_polar * grid_size_azimuth,
+        backend=backend,
+    )
@@ -41,11 +41,12 @@ def clm(l, m):
     )
 
 
-def legpoly(mmax, lmax, x, norm="ortho", inverse=False, csphase=True):
+def legpoly(mmax, lmax, x, norm="ortho", inverse=False, csphase=True, m_index=None):
     r"""
     Computes the values of (-1)^m c^l_m P^l_m(x) at the positions specified by x.
     The resulting tensor has shape (mmax, lmax, len(x)). The Condon-Shortley Phase (-1)^m
-    can be turned off optionally.
+    can be turned off optionally. If m_index is given, only the orders m in m_index are
+    computed and the resulting tensor has shape (len(m_index), lmax, len(x)).
 
     method of computation follows
     [1] Schaeffer, N.; Efficient spherical harmonic transforms aimed at pseudospectral numerical simulations, G3: Geochemistry, Geophysics, Geosystems.
@@ -54,51 +55,53 @@ def legpoly(mmax, lmax, x, norm="ortho", inverse=False, csphase=True):
     [3] Schrama, E.; Orbit integration based upon interpolated gravitational gradients
     """
 
-    # compute the tensor P^m_n:
-    nmax = max(mmax, lmax)
-    vdm = np.zeros((nmax, nmax, len(x)), dtype=np.float64)
+    m_index = list(range(mmax)) if m_index is None else list(m_index)
 
     norm_factor = 1.0 if norm == "ortho" else np.sqrt(4 * np.pi)
     norm_factor = 1.0 / norm_factor if inverse else norm_factor
 
-    # initial values to start the recursion
-    vdm[0, 0, :] = norm_factor / np.sqrt(4 * np.pi)
-
-    # fill the diagonal and the lower diagonal
-    for l in range(1, nmax):
-        vdm[l - 1, l, :] = np.sqrt(2 * l + 1) * x * vdm[l - 1, l - 1, :]
-        vdm[l, l, :] = np.sqrt((2 * l + 1) * (1 + x) * (1 - x) / 2 / l) * vdm[l - 1, l - 1, :]
-
-    # fill the remaining values on the upper triangle and multiply b
-    for l in range(2, nmax):
-        for m in range(0, l - 1):
-            vdm[m, l, :] = (
-                x * np.sqrt((2 * l - 1) / (l - m) * (2 * l + 1) / (l + m)) * vdm[m, l - 1, :]
+    # the diagonal P^m_m, which starts the recursion in l of every order m
+    diag = np.zeros((max(m_index, default=0) + 1, len(x)), dtype=np.float64)
+    diag[0] = norm_factor / np.sqrt(4 * np.pi)
+    for l in range(1, diag.shape[0]):
+        diag[l] = np.sqrt((2 * l + 1) * (1 + x) * (1 - x) / 2 / l) * diag[l - 1]
+
+    # compute the tensor P^m_n of the requested orders, the orders are independent of each other
+    vdm = np.zeros((len(m_index), lmax, len(x)), dtype=np.float64)
+    for i, m in enumerate(m_index):
+        if m < lmax:
+            vdm[i, m] = diag[m]
+        # fill the lower diagonal
+        if m + 1 < lmax:
+            vdm[i, m + 1] = np.sqrt(2 * m + 3) * x * diag[m]
+        # fill the remaining values on the upper triangle
+        for l in range(m + 2, lmax):
+            vdm[i, l] = (
+                x * np.sqrt((2 * l - 1) / (l - m) * (2 * l + 1) / (l + m)) * vdm[i, l - 1]
                 - np.sqrt((l + m - 1) / (l - m) * (2 * l + 1) / (2 * l - 3) * (l - m - 1) / (l + m))
-                * vdm[m, l - 2, :]
+                * vdm[i, l - 2]
             )
 
     if norm == "schmidt":
-        for l in range(0, nmax):
+        for l in range(0, lmax):
             if inverse:
                 vdm[:, l, :] = vdm[:, l, :] * np.sqrt(2 * l + 1)
             else:
                 vdm[:, l, :] = vdm[:, l, :] / np.sqrt(2 * l + 1)
 
-    vdm = vdm[:mmax, :lmax]
-
     if csphase:
-        for m in range(1, mmax, 2):
-            vdm[m] *= -1
+        for i, m in enumerate(m_index):
+            if m % 2 == 1:
+                vdm[i] *= -1
 
     return vdm
 
 
-def _precompute_legpoly(mmax, lmax, t, norm="ortho", inverse=False, csphase=True):
+def _precompute_legpoly(mmax, lmax, t, norm="ortho", inverse=False, csphase=True, m_index=None):
     r"""
     Computes the values of (-1)^m c^l_m P^l_m(\cos \theta) at the positions specified by t (theta).
     The resulting tensor has shape (mmax, lmax, len(x)). The Condon-Shortley Phase (-1)^m
-    can be turned off optionally.
+    can be turned off optionally. If m_index is given, only these orders are computed.
 
     method of computation follows
     [1] Schaeffer, N.; Efficient spherical harmonic transforms aimed at pseudospectral numerical simulations, G3: Geochemistry, Geophysics, Geosystems.
@@ -107,57 +110,65 @@ def _precompute_legpoly(mmax, lmax, t, norm="ortho", inverse=False, csphase=True
     [3] Schrama, E.; Orbit integration based upon interpolated gravitational gradients
     """
 
-    return legpoly(mmax, lmax, np.cos(t), norm=norm, inverse=inverse, csphase=csphase)
+    return legpoly(
+        mmax, lmax, np.cos(t), norm=norm, inverse=inverse, csphase=csphase, m_index=m_index
+    )
 
 
-def _precompute_dlegpoly(mmax, lmax, t, norm="ortho", inverse=False, csphase=True):
+def _precompute_dlegpoly(mmax, lmax, t, norm="ortho", inverse=False, csphase=True, m_index=None):
     r"""
     Computes the values of the derivatives $\frac{d}{d \theta} P^m_l(\cos \theta)$
     at the positions specified by t (theta), as well as $\frac{1}{\sin \theta} P^m_l(\cos \theta)$,
     needed for the computation of the vector spherical harmonics. The resulting tensor has shape
-    (2, mmax, lmax, len(t)).
+    (2, mmax, lmax, len(t)). If m_index is given, only these orders are computed and the
+    resulting tensor has shape (2, len(m_index), lmax, len(t)).
 
     computation follows
     [2] Wang, B., Wang, L., Xie, Z.; Accurate calculation of spherical and vector spherical harmonic expansions via spectral element grids; Adv Comput Math.
     """
 
-    pct = _precompute_legpoly(mmax + 1, lmax + 1, t, norm=norm, inverse=inverse, csphase=False)
-
-    dpct = np.zeros((2, mmax, lmax, len(t)), dtype=np.float64)
+    m_index = list(range(mmax)) if m_index is None else list(m_index)
 
-    # fill the derivative terms wrt theta
-    for l in range(0, lmax):
+    # the neighbouring orders m - 1 and m + 1 of the requested ones are needed
+    orders = sorted({k for m in m_index for k in (m - 1, m, m + 1) if 0 <= k <= mmax})
+    pct = _precompute_legpoly(
+        mmax + 1, lmax + 1, t, norm=norm, inverse=inverse, csphase=False, m_index=orders
+    )
+    pct = {k: pct[i] for i, k in enumerate(orders)}
 
-        # m = 0
-        dpct[0, 0, l] = -np.sqrt(l * (l + 1)) * pct[1, l]
+    dpct = np.zeros((2, len(m_index), lmax, len(t)), dtype=np.float64)
 
-        # 0 < m < l
-        for m in range(1, min(l, mmax)):
-            dpct[0, m, l] = 0.5 * (
-                np.sqrt((l + m) * (l - m + 1)) * pct[m - 1, l]
-                - np.sqrt((l - m) * (l + m + 1)) * pct[m + 1, l]
-            )
+    for i, m in enumerate(m_index):
+        for l in range(0, lmax):
 
-        # m == l
-        if mmax > l:
-            dpct[0, l, l] = np.sqrt(l / 2) * pct[l - 1, l]
-
-        # fill the - 1j m P^m_l / sin(phi). as this component is purely imaginary,
-        # we won't store it explicitly in a complex array
-        for m in range(1, min(l + 1, mmax)):
-            # this component is implicitly complex
-            # we do not divide by m here as this cancels with the derivative of the exponential
-            dpct[1, m, l] = (
-                0.5
-                * np.sqrt((2 * l + 1) / (2 * l + 3))
-                * (
-                    np.sqrt((l - m + 1) * (l - m + 2)) * pct[m - 1, l + 1]
-                    + np.sqrt((l + m + 1) * (l + m + 2)) * pct[m + 1, l + 1]
+            # fill the derivative terms wrt theta
+            if m == 0:
+                dpct[0, i, l] = -np.sqrt(l * (l + 1)) * pct[1][l]
+            elif m < l:
+                dpct[0, i, l] = 0.5 * (
+                    np.sqrt((l + m) * (l - m + 1)) * pct[m - 1][l]
+                    - np.sqrt((l - m) * (l + m + 1)) * pct[m + 1][l]
+                )
+            elif m == l:
+                dpct[0, i, l] = np.sqrt(l / 2) * pct[l - 1][l]
+
+            # fill the - 1j m P^m_l / sin(phi). as this component is purely imaginary,
+            # we won't store it explicitly in a complex array
+            if 1 <= m <= l:
+                # this component is implicitly complex
+                # we do not divide by m here as this cancels with the derivative of the exponential
+                dpct[1, i, l] = (
+                    0.5
+                    * np.sqrt((2 * l + 1) / (2 * l + 3))
+                    * (
+                        np.sqrt((l - m + 1) * (l - m + 2)) * pct[m - 1][l + 1]
+                        + np.sqrt((l + m + 1) * (l + m + 2)) * pct[m + 1][l + 1]
+                    )
                 )
-            )
 
     if csphase:
-        for m in range(1, mmax, 2):
-            dpct[:, m] *= -1
+        for i, m in enumerate(m_index):
+            if m % 2 == 1:
+                dpct[:, i] *= -1
 
     return dpct
@@ -30,16 +30,38 @@
 #
 
 import math
+import os
+import tempfile
 import unittest
 from functools import partial
+from unittest import mock
 
 import numpy as np
 import paddle
 from parameterized import parameterized
 
+from paddle_harmonics import DiscreteContinuousConv2d
 from paddle_harmonics import DiscreteContinuousConvS2
 from paddle_harmonics import DiscreteContinuousConvTransposeS2
+from paddle_harmonics import MultiResolutionDiscreteContinuousConvS2
 from paddle_harmonics import quadrature
+from paddle_harmonics._disco_convolution import _disco_s2_contraction_bwd
+from paddle_harmonics._disco_convolution import _disco_s2_contraction_bwd_deterministic
+from paddle_harmonics._disco_convolution import _disco_s2_contraction_bwd_gather_paddle
+from paddle_harmonics._disco_convolution import _DiscoAutotuner
+from paddle_harmonics._disco_convolution import _disco_s2_contraction_cpu
+from paddle_harmonics._disco_convolution import _disco_s2_contraction_fused
+from paddle_harmonics._disco_convolution import _disco_s2_contraction_paddle
+from paddle_harmonics._disco_convolution import _disco_s2_contraction_triton_chunked
+from paddle_harmonics._disco_convolution import _disco_s2_transpose_contraction_fused
+from paddle_harmonics._disco_convolution import _disco_s2_transpose_contraction_paddle
+from paddle_harmonics._disco_convolution import _get_psi_chunks
+from paddle_harmonics.convolution import _compute_norm_factor
+from paddle_harmonics.convolution import _get_contraction_memory
+from paddle_harmonics.convolution import _get_contraction_order
+from paddle_harmonics.convolution import _get_longitude_blocks
+from paddle_harmonics.convolution import _precompute_convolution_tensor_s2
+from paddle_harmonics.convolution import _precompute_latitude_bands
 from paddle_harmonics.utils import paddle_aux  # noqa, for reshape
 
 
@@ -197,16 +219,85 @@ def _precompute_convolution_tensor_dense(
     return out
 
 
-@unittest.skip(
-    "Skipping TestDiscreteContinuousConvolution tests for triton and torch are required"
-)
+def _precompute_convolution_tensor_2d_dense(
+    grid_in, grid_out, kernel_shape, radius_cutoff=0.01, periodic=False
+):
+    """
+    helper routine to compute the planar filter basis densely on all pairs of points
+    """
+
+    diffs = grid_in.reshape([2, 1, -1]) - grid_out.reshape([2, -1, 1])
+    if periodic:
+        periodic_diffs = paddle.where(diffs > 0.0, diffs - 1, diffs + 1)
+        diffs = paddle.where(diffs.abs() < periodic_diffs.abs(), diffs, periodic_diffs)
+
+    r = paddle.sqrt(diffs[0] ** 2 + diffs[1] ** 2)
+    phi = paddle.atan2(diffs[1], diffs[0]) + np.pi
+
+    if len(kernel_shape) == 1:
+        out = _compute_vals_isotropic(r, phi, ntheta=kernel_shape[0], theta_cutoff=radius_cutoff)
+    else:
+        out = _compute_vals_anisotropic(
+            r, phi, ntheta=kernel_shape[0], nphi=kernel_shape[1], theta_cutoff=radius_cutoff
+        )
+
+    # the helpers use the normalization on the sphere
+    s2_norm = _compute_norm_factor(kernel_shape[0], radius_cutoff, norm="s2")
+    return out * s2_norm / _compute_norm_factor(kernel_shape[0], radius_cutoff, norm="2d")
+
+
+def _check_disco_mixed_precision(test, precision, transpose, contraction_order, tol):
+    """
+    Compares a DISCO convolution with low precision activations against the single precision convolution.
+    """
+    conv_cls = DiscreteContinuousConvTransposeS2 if transpose else DiscreteContinuousConvS2
+    in_shape, out_shape = ((8, 16), (16, 32)) if transpose else ((16, 32), (8, 16))
+
+    conv = conv_cls(
+        4, 6, in_shape, out_shape, [3], contraction_order=contraction_order, precision=precision
+    )
+    conv_ref = conv_cls(4, 6, in_shape, out_shape, [3], contraction_order=contraction_order)
+    conv_ref.weight.set_value(conv.weight)
+    conv_ref.bias.set_value(paddle.randn(conv_ref.bias.shape))
+    conv.bias.set_value(conv_ref.bias)
+
+    # the basis is stored in the low precision, the weights stay in single precision
+    test.assertEqual(conv.psi_vals.dtype, getattr(paddle, precision))
+    test.assertEqual(conv.weight.dtype, paddle.float32)
+
+    x = paddle.randn(shape=[2, 4, *in_shape])
+    x.stop_gradient = False
+    x_ref = x.detach().clone()
+    x_ref.stop_gradient = False
+
+    y = conv(x)
+    y_ref = conv_ref(x_ref)
+    test.assertEqual(y.dtype, getattr(paddle, precision))
+
+    # errors are relative to the largest entry, as the low precision rounds the activations
+    def _rel_err(a, b):
+        return ((a.astype("float32") - b).abs().max() / b.abs().max()).item()
+
+    test.assertLess(_rel_err(y, y_ref), tol)
+
+    grad_input = paddle.randn(shape=y_ref.shape)
+    y.backward(grad_input.astype(y.dtype))
+    y_ref.backward(grad_input)
+
+    test.assertEqual(x.grad.dtype, paddle.float32)
+    test.assertLess(_rel_err(x.grad, x_ref.grad), tol)
+    test.assertLess(_rel_err(conv.weight.grad, conv_ref.weight.grad), tol)
+
+
 class TestDiscreteContinuousConvolution(unittest.TestCase):
     def setUp(self):
-        if paddle.device.cuda.device_count() >= 1:
-            self.device = paddle.CUDAPlace(0)
-        else:
-            self.device = paddle.CPUPlace()
-        # self.device = paddle.CPUPlace()
+        # the references are computed on the CPU, the triton kernels are tested in TestDiscoContractionTriton
+        self._default_device = paddle.get_device()
+        paddle.set_device("cpu")
+        self.device = paddle.CPUPlace()
+
+    def tearDown(self):
+        paddle.set_device(self._default_device)
 
     @parameterized.expand(
         [
@@ -358,6 +449,55 @@ class TestDiscreteContinuousConvolution(unittest.TestCase):
                 True,
                 1e-5,
             ],
+            # non-integer ratios of the longitudes
+            [
+                8,
+                4,
+                2,
+                (16, 32),
+                (12, 24),
+                [3],
+                "equiangular",
+                "equiangular",
+                False,
+                1e-5,
+            ],
+            [
+                8,
+                4,
+                2,
+                (12, 24),
+                (16, 32),
+                [2, 3],
+                "equiangular",
+                "legendre-gauss",
+                False,
+                1e-5,
+            ],
+            [
+                8,
+                4,
+                2,
+                (12, 24),
+                (16, 32),
+                [3],
+                "equiangular",
+                "equiangular",
+                True,
+                1e-5,
+            ],
+            [
+                8,
+                4,
+                2,
+                (16, 32),
+                (12, 24),
+                [2, 3],
+                "legendre-gauss",
+                "equiangular",
+                True,
+                1e-5,
+            ],
         ]
     )
     def test_disco_convolution(
@@ -413,12 +553,18 @@ class TestDiscreteContinuousConvolution(unittest.TestCase):
             psi = paddle.sparse.sparse_coo_tensor(
                 conv.psi_idx,
                 conv.psi_vals,
-                shape=(conv.kernel_size, conv.nlat_out, conv.nlat_in * conv.nlon_in),
+                shape=(
+                    conv.kernel_size,
+                    conv.nlat_out * conv.lon_blocks,
+                    conv.nlat_in * conv.nlon_in,
+                ),
             ).to_dense()
 
-            self.assertTrue(
-                paddle.allclose(psi, psi_dense[:, :, 0].reshape(-1, nlat_out, nlat_in * nlon_in))
+            # the basis holds the filters of the first lon_blocks output longitudes
+            psi_dense_blocks = psi_dense[:, :, : conv.lon_blocks].reshape(
+                [-1, nlat_out * conv.lon_blocks, nlat_in * nlon_in]
             )
+            self.assertTrue(paddle.allclose(psi, psi_dense_blocks))
 
         # create a copy of the weight
         w_ref = conv.weight.detach().clone()
@@ -455,6 +601,714 @@ class TestDiscreteContinuousConvolution(unittest.TestCase):
         self.assertTrue(paddle.allclose(x.grad, x_ref.grad, rtol=tol, atol=tol))
         self.assertTrue(paddle.allclose(conv.weight.grad, w_ref.grad, rtol=tol, atol=tol))
 
+    @parameterized.expand(
+        [
+            [4, 4, 4, 1, (16, 32), (16, 32), [3], 1],
+            [4, 4, 8, 2, (16, 32), (8, 16), [2, 3], 4],
+            [2, 6, 6, 6, (18, 36), (6, 12), [4], 3],
+        ]
+    )
+    def test_disco_contraction_cpu(
+        self,
+        batch_size,
+        in_channels,
+        out_channels,
+        groups,
+        in_shape,
+        out_shape,
+        kernel_shape,
+        num_threads,
+    ):
+        conv = DiscreteContinuousConvS2(
+            in_channels, out_channels, in_shape, out_shape, kernel_shape, groups=groups, bias=False
+        )
+        psi_vals = conv.get_psi_vals()
+
+        x = paddle.randn(shape=[batch_size, in_channels, *in_shape])
+        x.stop_gradient = False
+        w = conv.weight.detach().clone()
+        w.stop_gradient = False
+        y = _disco_s2_contraction_cpu(
+            x, w, conv.psi_idx, psi_vals, *out_shape, groups, num_threads=num_threads
+        )
+
+        x_ref = x.detach().clone()
+        x_ref.stop_gradient = False
+        w_ref = conv.weight.detach().clone()
+        w_ref.stop_gradient = False
+        y_ref = _disco_s2_contraction_fused(
+            x_ref, w_ref, conv.psi_idx, psi_vals, *out_shape, groups
+        )
+
+        self.assertTrue(paddle.allclose(y, y_ref, rtol=1e-5, atol=1e-5))
+
+        grad_input = paddle.randn(shape=y.shape, dtype=y.dtype)
+        y.backward(grad_input)
+        y_ref.backward(grad_input)
+
+        self.assertTrue(paddle.allclose(x.grad, x_ref.grad, rtol=1e-5, atol=1e-5))
+        # the weight gradient accumulates over the whole grid and batch in a different order
+        self.assertTrue(paddle.allclose(w.grad, w_ref.grad, rtol=1e-4, atol=1e-4))
+
+    @parameterized.expand(
+        [
+            [2, 3, (16, 32), (16, 32), [3]],
+            [2, 2, (16, 32), (8, 16), [2, 3]],
+            [1, 3, (18, 36), (6, 12), [4]],
+        ]
+    )
+    def test_disco_contraction_bwd_deterministic(
+        self, batch_size, in_channels, in_shape, out_shape, kernel_shape
+    ):
+        conv = DiscreteContinuousConvS2(
+            in_channels, in_channels, in_shape, out_shape, kernel_shape, deterministic=True
+        )
+
+        x = paddle.randn(shape=[batch_size, in_channels, *in_shape])
+        x.stop_gradient = False
+        y = _disco_s2_contraction_paddle(x, conv.get_psi(), out_shape[1])
+
+        grad_input = paddle.randn(shape=y.shape, dtype=y.dtype)
+        y.backward(grad_input)
+
+        # gather the gradient using the transposed psi
+        grad_x = _disco_s2_contraction_bwd_gather_paddle(
+            grad_input, conv.psi_t_ptr, conv.psi_t_idx, conv.get_psi_t_vals(), *in_shape
+        )
+
+        self.assertTrue(paddle.allclose(grad_x, x.grad, rtol=1e-5, atol=1e-5))
+
+    @parameterized.expand(
+        [
+            [2, 4, (16, 32), (16, 32), [3]],
+            [2, 4, (8, 16), (16, 32), [2, 3]],
+            [1, 3, (6, 12), (18, 36), [4]],
+        ]
+    )
+    def test_disco_transpose_contraction_fused(
+        self, batch_size, in_channels, in_shape, out_shape, kernel_shape
+    ):
+        conv = DiscreteContinuousConvTransposeS2(
+            in_channels, in_channels, in_shape, out_shape, kernel_shape, bias=False
+        )
+
+        x = paddle.randn(shape=[batch_size, in_channels, conv.kernel_size, *in_shape])
+        x.stop_gradient = False
+        y = _disco_s2_transpose_contraction_fused(
+            x, conv.psi_mod_idx, conv.get_psi_mod_vals(), *out_shape
+        )
+
+        x_ref = x.detach().clone()
+        x_ref.stop_gradient = False
+        y_ref = _disco_s2_transpose_contraction_paddle(x_ref, conv.get_psi(), out_shape[1])
+
+        self.assertTrue(paddle.allclose(y, y_ref, rtol=1e-5, atol=1e-5))
+
+        grad_input = paddle.randn(shape=y.shape, dtype=y.dtype)
+        y.backward(grad_input)
+        y_ref.backward(grad_input)
+
+        self.assertTrue(paddle.allclose(x.grad, x_ref.grad, rtol=1e-5, atol=1e-5))
+
+    @parameterized.expand(
+        [
+            [(16, 32), (16, 32), "equiangular", "equiangular"],
+            [(16, 32), (8, 16), "equiangular", "legendre-gauss"],
+            [(8, 16), (24, 48), "legendre-gauss", "equiangular"],
+        ]
+    )
+    def test_latitude_bands(self, in_shape, out_shape, grid_in, grid_out):
+        theta_cutoff = 4 * np.pi / float(in_shape[0] - 1)
+
+        lats_in, _ = quadrature._precompute_latitudes(in_shape[0], grid=grid_in)  # noqa
+        lats_out, _ = quadrature._precompute_latitudes(out_shape[0], grid=grid_out)  # noqa
+        lat_start, lat_end = _precompute_latitude_bands(lats_in, lats_out, theta_cutoff)
+
+        idx, _ = _precompute_convolution_tensor_s2(
+            in_shape, out_shape, [3], grid_in=grid_in, grid_out=grid_out, theta_cutoff=theta_cutoff
+        )
+        tout = idx[1].numpy() // _get_longitude_blocks(in_shape[1], out_shape[1])
+        tin = idx[2].numpy() // in_shape[1]
+
+        # all non-zeros have to lie within the band of their output latitude
+        self.assertTrue(np.all(tin >= lat_start[tout]))
+        self.assertTrue(np.all(tin < lat_end[tout]))
+
+    @parameterized.expand(
+        [
+            [200, 150, [3], 0.2, False],
+            [200, 150, [3, 4], 0.2, True],
+            [300, 100, [2, 2], 0.6, True],
+        ]
+    )
+    def test_disco_convolution_2d(self, n_in, n_out, kernel_shape, radius_cutoff, periodic):
+        grid_in = paddle.rand([2, n_in])
+        grid_out = paddle.rand([2, n_out])
+
+        conv = DiscreteContinuousConv2d(
+            4,
+            6,
+            grid_in,
+            grid_out,
+            kernel_shape,
+            periodic=periodic,
+            groups=2,
+            radius_cutoff=radius_cutoff,
+        )
+
+        # the neighbour search has to find the same basis as the all-pairs computation
+        psi_dense = _precompute_convolution_tensor_2d_dense(
+            grid_in, grid_out, kernel_shape, radius_cutoff=radius_cutoff, periodic=periodic
+        )
+        psi = paddle.sparse.sparse_coo_tensor(
+            conv.psi_idx, conv.psi_vals, shape=psi_dense.shape
+        ).to_dense()
+        self.assertTrue(paddle.allclose(psi, psi_dense, rtol=1e-4, atol=1e-4))
+
+        x = paddle.randn(shape=[2, 4, n_in])
+        x.stop_gradient = False
+        y = conv(x)
+
+        x_ref = x.detach().clone()
+        x_ref.stop_gradient = False
+        y_ref = paddle.einsum("kon,bcn->bcko", psi_dense / n_in, x_ref)
+        y_ref = y_ref.reshape([2, 2, 2, -1, n_out])
+        y_ref = paddle.einsum(
+            "bgcko,gdck->bgdo", y_ref, conv.weight.reshape([2, 3, 2, -1])
+        ).reshape([2, 6, n_out])
+        y_ref = y_ref + conv.bias.reshape([1, -1, 1])
+
+        self.assertTrue(paddle.allclose(y, y_ref, rtol=1e-4, atol=1e-4))
+
+        grad_input = paddle.randn(shape=y.shape, dtype=y.dtype)
+        y.backward(grad_input)
+        y_ref.backward(grad_input)
+
+        self.assertTrue(paddle.allclose(x.grad, x_ref.grad, rtol=1e-4, atol=1e-4))
+
+    @parameterized.expand(
+        [
+            [2, 4, 4, 1, (16, 32), (8, 16), [3], False],
+            [2, 6, 3, 3, (16, 32), (16, 32), [2, 3], False],
+            [2, 4, 8, 4, (8, 16), (16, 32), [3], True],
+            [1, 6, 2, 2, (6, 12), (18, 36), [2, 2], True],
+        ]
+    )
+    def test_disco_contraction_order(
+        self,
+        batch_size,
+        in_channels,
+        out_channels,
+        groups,
+        in_shape,
+        out_shape,
+        kernel_shape,
+        transpose,
+    ):
+        conv_cls = DiscreteContinuousConvTransposeS2 if transpose else DiscreteContinuousConvS2
+
+        conv = conv_cls(
+            in_channels,
+            out_channels,
+            in_shape,
+            out_shape,
+            kernel_shape,
+            groups=groups,
+            contraction_order="psi_first",
+        )
+        conv_ref = conv_cls(
+            in_channels,
+            out_channels,
+            in_shape,
+            out_shape,
+            kernel_shape,
+            groups=groups,
+            contraction_order="weights_first",
+        )
+        conv_ref.weight.set_value(conv.weight)
+
+        x = paddle.randn(shape=[batch_size, in_channels, *in_shape])
+        x.stop_gradient = False
+        x_ref = x.detach().clone()
+        x_ref.stop_gradient = False
+
+        y = conv(x)
+        y_ref = conv_ref(x_ref)
+        self.assertTrue(paddle.allclose(y, y_ref, rtol=1e-5, atol=1e-5))
+
+        grad_input = paddle.randn(shape=y.shape, dtype=y.dtype)
+        y.backward(grad_input)
+        y_ref.backward(grad_input)
+
+        self.assertTrue(paddle.allclose(x.grad, x_ref.grad, rtol=1e-5, atol=1e-5))
+        self.assertTrue(
+            paddle.allclose(conv.weight.grad, conv_ref.weight.grad, rtol=1e-4, atol=1e-4)
+        )
+
+    @parameterized.expand(
+        [
+            ["bfloat16", False, "psi_first", 2e-2],
+            ["bfloat16", False, "weights_first", 2e-2],
+            ["bfloat16", True, "psi_first", 2e-2],
+            ["bfloat16", True, "weights_first", 2e-2],
+        ]
+    )
+    def test_disco_mixed_precision(self, precision, transpose, contraction_order, tol):
+        # float16 gathers are not available on CPU, see TestDiscoContractionTriton
+        _check_disco_mixed_precision(self, precision, transpose, contraction_order, tol)
+
+    def test_disco_multi_resolution(self):
+        theta_cutoff = 4 * math.pi / 15
+        conv = MultiResolutionDiscreteContinuousConvS2(
+            4, 6, [3], out_shape=(8, 16), theta_cutoff=theta_cutoff, max_cached_shapes=2
+        )
+        conv.bias.set_value(paddle.randn(conv.bias.shape))
+
+        # only the shared weight and bias are parameters of the layer
+        self.assertEqual([name for name, _ in conv.named_parameters()], ["weight", "bias"])
+
+        for in_shape in [(16, 32), (12, 24), (20, 40), (16, 32)]:
+            conv_ref = DiscreteContinuousConvS2(
+                4, 6, in_shape, (8, 16), [3], theta_cutoff=theta_cutoff
+            )
+            conv_ref.weight.set_value(conv.weight)
+            conv_ref.bias.set_value(conv.bias)
+
+            x = paddle.randn(shape=[2, 4, *in_shape])
+            self.assertTrue(paddle.allclose(conv(x), conv_ref(x), rtol=1e-5, atol=1e-5))
+
+        # the least recently used shapes are evicted first
+        self.assertEqual(conv.cached_shapes, [(20, 40), (16, 32)])
+
+        # the cached bases are sublayers which only hold non-persistable buffers
+        self.assertEqual(
+            [name for name, _ in conv.named_sublayers()], ["_bases", "_bases.20x40", "_bases.16x32"]
+        )
+        self.assertEqual(list(conv.state_dict().keys()), ["weight", "bias"])
+        self.assertEqual(conv.get_basis((16, 32)).psi_idx.shape, conv.psi_idx.shape)
+
+        # building a basis does not draw from the random number generator
+        paddle.seed(333)
+        conv.get_basis((24, 48))
+        drawn = paddle.randn([8])
+        paddle.seed(333)
+        self.assertTrue(paddle.equal_all(drawn, paddle.randn([8])).item())
+        self.assertEqual(conv.cached_shapes, [(16, 32), (24, 48)])
+
+        # inputs of different resolutions can be passed together
+        ys = conv([paddle.randn(shape=[1, 4, 16, 32]), paddle.randn(shape=[3, 4, 12, 24])])
+        self.assertEqual([y.shape for y in ys], [[1, 6, 8, 16], [3, 6, 8, 16]])
+        self.assertEqual(conv.cached_shapes, [(16, 32), (12, 24)])
+
+    def test_disco_profiling(self):
+        conv = DiscreteContinuousConvS2(4, 6, (16, 32), (8, 16), [3], contraction_order="auto")
+
+        stats = conv.get_basis_stats()
+        self.assertEqual(stats["nnz"], conv.psi_idx.shape[-1])
+        self.assertEqual(stats["nnz_per_row"].shape, (conv.kernel_size, 8))
+        self.assertEqual(stats["nnz_per_row"].sum(), stats["nnz"])
+        self.assertTrue(0.0 < stats["density"] <= 1.0)
+        self.assertLessEqual(stats["min_nnz_per_row"], stats["max_nnz_per_row"])
+
+        # the selected contraction order is the cheaper one, and the backward pass costs more than the forward pass
+        flops = conv.get_flops(2)
+        for order in ["psi_first", "weights_first"]:
+            self.assertLessEqual(flops["forward"], conv.get_flops(2, order)["forward"])
+        self.assertGreater(flops["backward"], flops["forward"])
+        self.assertEqual(conv.get_flops(4)["forward"], 2 * flops["forward"])
+        self.assertGreater(conv.get_bytes(2)["forward"], 0)
+
+        # only the calls between enabling and disabling the profiling are recorded
+        conv(paddle.randn(shape=[2, 4, 16, 32]))
+        conv.enable_profiling()
+        conv(paddle.randn(shape=[2, 4, 16, 32]))
+        conv(paddle.randn(shape=[3, 4, 16, 32]))
+        conv.disable_profiling()
+        conv(paddle.randn(shape=[2, 4, 16, 32]))
+
+        records = conv.profile_records
+        self.assertEqual(
+            [record["input_shape"] for record in records], [[2, 4, 16, 32], [3, 4, 16, 32]]
+        )
+        self.assertEqual(records[0]["flops"], flops["forward"])
+        self.assertTrue(all(record["time"] > 0.0 for record in records))
+
+        conv.reset_profiling()
+        self.assertEqual(conv.profile_records, [])
+
+    def test_disco_multi_resolution_profiling(self):
+        conv = MultiResolutionDiscreteContinuousConvS2(4, 6, [3], out_shape=(8, 16))
+
+        # the geometry is only known once the layer has seen an input shape
+        with self.assertRaises(RuntimeError):
+            conv.get_flops(2)
+
+        # the statistics refer to the most recently used input shape
+        for in_shape in [(16, 32), (12, 24)]:
+            conv_ref = DiscreteContinuousConvS2(4, 6, in_shape, (8, 16), [3])
+            conv(paddle.randn(shape=[2, 4, *in_shape]))
+            self.assertEqual(conv.get_psi_shape(), conv_ref.get_psi_shape())
+            self.assertEqual(conv.get_basis_stats()["nnz"], conv_ref.get_basis_stats()["nnz"])
+            self.assertEqual(conv.get_flops(2), conv_ref.get_flops(2))
+            self.assertEqual(conv.get_bytes(2), conv_ref.get_bytes(2))
+
+        # the work of a call is estimated for the input shape of every tensor passed to it
+        conv.enable_profiling()
+        conv([paddle.randn(shape=[2, 4, 16, 32]), paddle.randn(shape=[2, 4, 12, 24])])
+        conv.disable_profiling()
+
+        flops = [
+            DiscreteContinuousConvS2(4, 6, in_shape, (8, 16), [3]).get_flops(2)["forward"]
+            for in_shape in [(16, 32), (12, 24)]
+        ]
+        self.assertEqual([record["flops"] for record in conv.profile_records], [sum(flops)])
+
+        # estimating the work of a call neither reorders nor extends the cache
+        cached = [conv.get_basis(in_shape) for in_shape in [(12, 24), (16, 32)]]
+        for in_shape in [(12, 24), (8, 16)]:
+            conv_ref = DiscreteContinuousConvS2(4, 6, in_shape, (8, 16), [3])
+            work = conv._get_profiled_work(paddle.randn(shape=[2, 4, *in_shape]))
+            self.assertEqual(
+                work, (conv_ref.get_flops(2)["forward"], conv_ref.get_bytes(2)["forward"])
+            )
+            self.assertEqual(conv.cached_shapes, [(12, 24), (16, 32)])
+            self.assertTrue(all(a is b for a, b in zip(conv._bases.values(), cached)))
+
+    def test_contraction_order_selection(self):
+        # narrow outputs favour applying the weights first, wide outputs applying psi first
+        self.assertEqual(
+            _get_contraction_order(4, 64, 4, 1, 9, 10000, 64, 32 * 64, 32 * 64), "weights_first"
+        )
+        self.assertEqual(
+            _get_contraction_order(4, 4, 64, 1, 9, 10000, 64, 32 * 64, 32 * 64), "psi_first"
+        )
+        # for depthwise layers, the weights are preferably applied on the smaller grid
+        self.assertEqual(
+            _get_contraction_order(4, 16, 16, 16, 9, 10000, 32, 64 * 128, 32 * 64), "psi_first"
+        )
+        self.assertEqual(
+            _get_contraction_order(4, 16, 16, 16, 9, 10000, 64, 32 * 64, 64 * 128), "weights_first"
+        )
+
+        # the memory budget excludes orders with a large intermediate tensor, even if they are cheaper
+        args = (4, 64, 16, 1, 9, 10**6, 64, 128 * 256, 32 * 64)
+        memory = _get_contraction_memory(4, 64, 16, 9, 128 * 256, 32 * 64)
+        self.assertLess(memory["psi_first"], memory["weights_first"])
+        self.assertEqual(_get_contraction_order(*args), "weights_first")
+        self.assertEqual(
+            _get_contraction_order(*args, max_intermediate=memory["weights_first"]), "weights_first"
+        )
+        self.assertEqual(
+            _get_contraction_order(*args, max_intermediate=memory["psi_first"]), "psi_first"
+        )
+        # if no order fits, the one with the smaller intermediate tensor is selected
+        self.assertEqual(_get_contraction_order(*args, max_intermediate=1), "psi_first")
+
+        # layers select the order within their memory budget
+        conv = DiscreteContinuousConvS2(64, 16, (32, 64), (16, 32), [3], contraction_order="auto")
+        problem_size = (4,) + conv._get_problem_size()
+        conv.contraction_memory_budget = None
+        self.assertEqual(
+            conv.get_contraction_order(*problem_size),
+            _get_contraction_order(4, 64, 16, 1, 3, conv.psi_idx.shape[-1], *problem_size[1:]),
+        )
+        conv.contraction_memory_budget = 1
+        memory = _get_contraction_memory(4, 64, 16, 3, *problem_size[2:])
+        self.assertEqual(conv.get_contraction_order(*problem_size), min(memory, key=memory.get))
+
+    def test_autotune_benchmark(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache_path = os.path.join(tmpdir, "autotune.json")
+            tuner = _DiscoAutotuner(cache_path=cache_path, mode="benchmark")
+
+            # fake benchmark which favours one configuration and fails for another
+            calls = []
+
+            def benchmark(config):
+                calls.append(config)
+                if config == (1, 4, 8):
+                    raise RuntimeError("out of resources")
+                return 1.0 if config == (2, 16, 32) else 2.0
+
+            config = tuner.get_block_sizes("fwd", 8, 5000, 64, benchmark=benchmark, device="fake")
+            self.assertEqual(config, (2, 16, 32))
+            self.assertEqual(len(calls), len(tuner.candidates(8, 64)))
+            self.assertTrue(os.path.isfile(cache_path))
+
+            # shapes in the same bucket reuse the cached winner, also after reloading it from disk
+            def failing_benchmark(config):
+                raise AssertionError("should not benchmark cached shapes")
+
+            tuner = _DiscoAutotuner(cache_path=cache_path, mode="benchmark")
+            config = tuner.get_block_sizes(
+                "fwd", 7, 4500, 60, benchmark=failing_benchmark, device="fake"
+            )
+            self.assertEqual(config, (2, 16, 32))
+
+            # if no configuration can be benchmarked, the heuristic is used and nothing is cached
+            config = tuner.get_block_sizes(
+                "bwd", 8, 5000, 64, benchmark=failing_benchmark, device="fake"
+            )
+            self.assertEqual(config, _DiscoAutotuner.heuristic(8, 5000, 64))
+            self.assertEqual(len(tuner._load_cache()), 1)
+
+    def test_autotune_interpret(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tuner = _DiscoAutotuner(
+                cache_path=os.path.join(tmpdir, "autotune.json"), mode="interpret"
+            )
+
+            # a single channel does not benefit from batch blocking
+            config = tuner.get_block_sizes("fwd", 1, 100000, 720)
+            self.assertIn(config, tuner.candidates(1, 720))
+            self.assertEqual(config[0], 1)
+
+            # once the device is saturated, wide longitude blocks are favoured for coalesced accesses
+            config = tuner.get_block_sizes("fwd", 256, 100000, 720)
+            self.assertGreaterEqual(config[2], 32)
+
+            # the selection is deterministic and cached
+            self.assertEqual(tuner.get_block_sizes("fwd", 256, 100000, 720), config)
+            for batch_size, nlon_out in [(4, 16), (64, 360), (3, 8)]:
+                config = tuner.get_block_sizes(
+                    "bwd_gather", batch_size, 20000, nlon_out, num_rows=90
+                )
+                self.assertIn(config, tuner.candidates(batch_size, nlon_out))
+
+    def test_psi_sharing(self):
+        conv1 = DiscreteContinuousConvS2(4, 4, (16, 32), (8, 16), [3])
+        conv2 = DiscreteContinuousConvS2(2, 6, (16, 32), (8, 16), [3], bias=False)
+        conv3 = DiscreteContinuousConvS2(4, 4, (16, 32), (8, 16), [2, 3])
+
+        # identical geometry shares the basis, different kernels do not
+        self.assertTrue(conv1.psi_idx is conv2.psi_idx)
+        self.assertTrue(conv1.psi_vals is conv2.psi_vals)
+        self.assertFalse(conv1.psi_vals is conv3.psi_vals)
+
+        # a downsampling convolution and an upsampling transpose convolution share the same geometry
+        theta_cutoff = 4 * math.pi / 15
+        conv4 = DiscreteContinuousConvS2(4, 4, (16, 32), (8, 16), [3], theta_cutoff=theta_cutoff)
+        convt = DiscreteContinuousConvTransposeS2(
+            4, 4, (8, 16), (16, 32), [3], theta_cutoff=theta_cutoff
+        )
+        self.assertTrue(conv4.psi_vals is convt.psi_vals)
+
+        # layers built on another device do not share the basis
+        with mock.patch("paddle.get_device", return_value="gpu:0"):
+            conv5 = DiscreteContinuousConvS2(4, 4, (16, 32), (8, 16), [3])
+        self.assertFalse(conv1.psi_vals is conv5.psi_vals)
+
+    def test_psi_chunks(self):
+        conv = DiscreteContinuousConvS2(2, 2, (16, 32), (8, 16), [3])
+        psi_ref = conv.get_psi().to_dense()
+
+        # reassembling the chunks along the output latitudes recovers psi
+        psi = paddle.zeros(psi_ref.shape, dtype=psi_ref.dtype)
+        psi_vals = conv.get_psi_vals()
+        chunks = _get_psi_chunks(conv.psi_idx, conv.psi_lat_offsets, 3)
+        for t0, t1, s, e, idx, psi_t in chunks:
+            self.assertLessEqual(t1 - t0, 3)
+            self.assertIsNone(psi_t)
+            psi_chunk = paddle.sparse.sparse_coo_tensor(
+                idx, psi_vals[s:e], shape=[conv.kernel_size, t1 - t0, 16 * 32]
+            )
+            psi[:, t0:t1, :] += psi_chunk.to_dense()
+
+        self.assertEqual(len(chunks), 3)
+        self.assertTrue(paddle.allclose(psi, psi_ref))
+
+        # the chunks are built once and kept on the shared basis
+        self.assertTrue(conv.get_psi_chunks(3) is conv.get_psi_chunks(3))
+
+    def test_lat_offsets_reuse(self):
+        convs = [
+            DiscreteContinuousConvS2(4, 4, (16, 32), (8, 16), [3], contraction_order="psi_first"),
+            DiscreteContinuousConvS2(
+                4, 4, (16, 32), (8, 16), [3], contraction_order="weights_first"
+            ),
+            DiscreteContinuousConvTransposeS2(
+                4, 4, (8, 16), (16, 32), [3], contraction_order="psi_first"
+            ),
+            DiscreteContinuousConvTransposeS2(
+                4, 4, (8, 16), (16, 32), [3], contraction_order="weights_first"
+            ),
+        ]
+
+        # the latitude offsets are precomputed with the basis and must not be rebuilt from the indices per call
+        with mock.patch(
+            "paddle_harmonics._disco_convolution._get_latitude_offsets",
+            side_effect=AssertionError("latitude offsets recomputed"),
+        ):
+            for conv in convs:
+                x = paddle.randn(shape=[2, 4, conv.nlat_in, conv.nlon_in])
+                x.stop_gradient = False
+                conv(x).sum().backward()
+
+
+@unittest.skipIf(
+    paddle.device.cuda.device_count() == 0,
+    "Skipping TestDiscoContractionTriton tests without a GPU",
+)
+class TestDiscoContractionTriton(unittest.TestCase):
+    @parameterized.expand(
+        [
+            ["float16", False, "psi_first", 2e-3],
+            ["float16", True, "weights_first", 2e-3],
+        ]
+    )
+    def test_disco_mixed_precision_float16(self, precision, transpose, contraction_order, tol):
+        _check_disco_mixed_precision(self, precision, transpose, contraction_order, tol)
+
+    @parameterized.expand(
+        [
+            [2, 4, 4, 1, (16, 32), (8, 16), [3], False],
+            [2, 6, 3, 3, (16, 32), (16, 32), [2, 3], False],
+            [2, 4, 8, 4, (8, 16), (16, 32), [3], True],
+            [1, 6, 2, 2, (6, 12), (18, 36), [2, 2], True],
+        ]
+    )
+    def test_disco_contraction_order_triton(
+        self,
+        batch_size,
+        in_channels,
+        out_channels,
+        groups,
+        in_shape,
+        out_shape,
+        kernel_shape,
+        transpose,
+    ):
+        conv_cls = DiscreteContinuousConvTransposeS2 if transpose else DiscreteContinuousConvS2
+
+        convs = [
+            conv_cls(
+                in_channels,
+                out_channels,
+                in_shape,
+                out_shape,
+                kernel_shape,
+                groups=groups,
+                contraction_order=contraction_order,
+            )
+            for contraction_order in ["psi_first", "weights_first"]
+        ]
+        convs[1].weight.set_value(convs[0].weight)
+
+        # the explicit contraction order is honored with the triton kernels, both orders agree
+        x = paddle.randn(shape=[batch_size, in_channels, *in_shape])
+        grad_input = None
+        ys, grads = [], []
+        for conv in convs:
+            xi = x.detach().clone()
+            xi.stop_gradient = False
+            y = conv(xi, use_triton_kernel=True)
+            if grad_input is None:
+                grad_input = paddle.randn(shape=y.shape, dtype=y.dtype)
+            y.backward(grad_input)
+            ys.append(y)
+            grads.append((xi.grad, conv.weight.grad))
+
+        self.assertTrue(paddle.allclose(ys[0], ys[1], rtol=1e-5, atol=1e-5))
+        self.assertTrue(paddle.allclose(grads[0][0], grads[1][0], rtol=1e-5, atol=1e-5))
+        self.assertTrue(paddle.allclose(grads[0][1], grads[1][1], rtol=1e-4, atol=1e-4))
+
+    @parameterized.expand(
+        [
+            [2, 3, (16, 32), (16, 32), [3]],
+            [2, 2, (16, 32), (8, 16), [2, 3]],
+            [1, 3, (18, 36), (6, 12), [4]],
+        ]
+    )
+    def test_disco_contraction_bwd_gather_kernel(
+        self, batch_size, in_channels, in_shape, out_shape, kernel_shape
+    ):
+        conv = DiscreteContinuousConvS2(
+            in_channels, in_channels, in_shape, out_shape, kernel_shape, deterministic=True
+        )
+        psi_t = (conv.psi_t_ptr, conv.psi_t_idx, conv.get_psi_t_vals())
+
+        grad_y = paddle.randn(shape=[batch_size, in_channels, conv.kernel_size, *out_shape])
+        grad_x_ref = _disco_s2_contraction_bwd(grad_y, conv.get_psi(), in_shape[1])
+
+        # the gather kernel agrees with the atomic backward pass and its reference implementation
+        grad_x = _disco_s2_contraction_bwd_deterministic(grad_y, *psi_t, *in_shape)
+        self.assertTrue(paddle.allclose(grad_x, grad_x_ref, rtol=1e-5, atol=1e-5))
+        grad_x_paddle = _disco_s2_contraction_bwd_gather_paddle(grad_y, *psi_t, *in_shape)
+        self.assertTrue(paddle.allclose(grad_x, grad_x_paddle, rtol=1e-5, atol=1e-5))
+
+        # and is bitwise repeatable, in isolation and within the convolution
+        for _ in range(3):
+            grad_x_rep = _disco_s2_contraction_bwd_deterministic(grad_y, *psi_t, *in_shape)
+            self.assertTrue(paddle.equal_all(grad_x_rep, grad_x).item())
+
+        x = paddle.randn(shape=[batch_size, in_channels, *in_shape])
+        x.stop_gradient = False
+        grad_out = paddle.randn(shape=[batch_size, in_channels, *out_shape])
+        grads = []
+        for _ in range(3):
+            conv(x).backward(grad_out)
+            grads.append(x.grad.clone())
+            x.clear_gradient()
+        for grad in grads[1:]:
+            self.assertTrue(paddle.equal_all(grad, grads[0]).item())
+
+    @parameterized.expand(
+        [
+            [2, 4, 4, 1, (16, 32), (16, 32), [3], False],
+            [2, 4, 8, 2, (16, 32), (8, 16), [2, 3], False],
+            [2, 4, 4, 1, (16, 32), (16, 32), [3], True],
+            [1, 6, 6, 3, (18, 36), (6, 12), [4], True],
+        ]
+    )
+    def test_disco_contraction_triton_chunked(
+        self,
+        batch_size,
+        in_channels,
+        out_channels,
+        groups,
+        in_shape,
+        out_shape,
+        kernel_shape,
+        deterministic,
+    ):
+        conv = DiscreteContinuousConvS2(
+            in_channels,
+            out_channels,
+            in_shape,
+            out_shape,
+            kernel_shape,
+            groups=groups,
+            bias=False,
+            deterministic=deterministic,
+        )
+
+        x = paddle.randn(shape=[batch_size, in_channels, *in_shape])
+        x.stop_gradient = False
+        w = conv.weight.detach().clone()
+        w.stop_gradient = False
+
+        # force a few output latitudes per chunk
+        y = _disco_s2_contraction_triton_chunked(
+            x, w, conv.get_psi_vals(), conv.get_psi_chunks(2), *out_shape, groups
+        )
+
+        x_ref = x.detach().clone()
+        x_ref.stop_gradient = False
+        w_ref = conv.weight.detach().clone()
+        w_ref.stop_gradient = False
+        y_ref = _disco_s2_contraction_fused(
+            x_ref, w_ref, conv.psi_idx, conv.get_psi_vals(), *out_shape, groups
+        )
+
+        self.assertTrue(paddle.allclose(y, y_ref, rtol=1e-5, atol=1e-5))
+
+        grad_input = paddle.randn(shape=y.shape, dtype=y.dtype)
+        y.backward(grad_input)
+        y_ref.backward(grad_input)
+
+        self.assertTrue(paddle.allclose(x.grad, x_ref.grad, rtol=1e-5, atol=1e-5))
+        self.assertTrue(paddle.allclose(w.grad, w_ref.grad, rtol=1e-4, atol=1e-4))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -29,7 +29,10 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 #
 
+import functools
+import json
 import os
+import tempfile
 import unittest
 
 import paddle
@@ -39,6 +42,14 @@ from parameterized import parameterized
 
 import paddle_harmonics as harmonics
 import paddle_harmonics.distributed as thd
+from paddle_harmonics.distributed.distributed_sht import _get_m_order
+from paddle_harmonics.distributed.distributed_sht import _get_polar_strategy
+from paddle_harmonics.distributed.primitives import WIRE_DTYPES
+from paddle_harmonics.distributed.primitives import _decode_wire
+from paddle_harmonics.distributed.primitives import _encode_wire
+from paddle_harmonics.distributed.primitives import _recv_workspaces
+from paddle_harmonics.distributed.primitives import _send_workspaces
+from paddle_harmonics.distributed.primitives import _WorkspacePool
 from paddle_harmonics.utils import paddle_aux  # noqa
 
 
@@ -69,52 +80,18 @@ class TestDistributedSphericalHarmonicTransform(unittest.TestCase):
 
         dist.init_parallel_env()
 
-        cls.wrank = cls.world_rank % cls.grid_size_w
-        cls.hrank = cls.world_rank // cls.grid_size_w
-
-        # now set up the comm groups:
-        # set default
-        cls.w_group = None
-        cls.h_group = None
-
-        # do the init
-        wgroups = []
-        for w in range(0, cls.world_size, cls.grid_size_w):
-            start = w
-            end = w + cls.grid_size_w
-            wgroups.append(list(range(start, end)))
-
-        if cls.world_rank == 0:
-            print("w-groups:", wgroups)
-        for grp in wgroups:
-            if len(grp) == 1:
-                continue
-            tmp_group = dist.new_group(ranks=grp)
-            if cls.world_rank in grp:
-                cls.w_group = tmp_group
-
-        # transpose:
-        hgroups = [sorted(list(i)) for i in zip(*wgroups)]
-
-        if cls.world_rank == 0:
-            print("h-groups:", hgroups)
-        for grp in hgroups:
-            if len(grp) == 1:
-                continue
-            tmp_group = dist.new_group(ranks=grp)
-            if cls.world_rank in grp:
-                cls.h_group = tmp_group
-
-        # set seed
-        paddle.seed(seed=333)
-
         if cls.world_rank == 0:
             print(
                 f"Running distributed tests on grid H x W = {cls.grid_size_h} x {cls.grid_size_w}"
             )
 
-        # initializing sht
-        thd.init(cls.h_group, cls.w_group)
+        # create the comm groups and initialize sht
+        cls.hrank, cls.wrank = thd.init_process_grid(cls.grid_size_h, cls.grid_size_w)
+        cls.h_group = thd.polar_group()
+        cls.w_group = thd.azimuth_group()
+
+        # set seed
+        paddle.seed(seed=333)
 
     def _split_helper(self, tensor):
         with paddle.no_grad():
@@ -412,5 +389,616 @@ class TestDistributedSphericalHarmonicTransform(unittest.TestCase):
         self.assertTrue(err.item() <= tol)
 
 
+# The tests below spawn a process per rank of a process grid on the local host and run with gloo on CPU. To keep the
+# default suite fast and reliable, each of them spawns a single small grid, and the remaining cases only run if
+# PADDLE_HARMONICS_DISTRIBUTED_TESTS is set to "full".
+_FULL_DISTRIBUTED_TESTS = os.getenv("PADDLE_HARMONICS_DISTRIBUTED_TESTS", "") == "full"
+
+
+def _spawn_cases(cases, full_cases):
+    return cases + full_cases if _FULL_DISTRIBUTED_TESTS else cases
+
+
+def _process_grid_worker(grid_size_h, grid_size_w):
+    world_rank = dist.get_rank()
+    assert thd.is_initialized()
+    assert thd.polar_group_size() == grid_size_h
+    assert thd.azimuth_group_size() == grid_size_w
+    assert thd.polar_group_rank() == world_rank // grid_size_w
+    assert thd.azimuth_group_rank() == world_rank % grid_size_w
+
+    # the azimuth groups hold consecutive ranks
+    ranks = []
+    if grid_size_w > 1:
+        dist.all_gather_object(ranks, world_rank, group=thd.azimuth_group())
+        assert ranks == list(
+            range(
+                world_rank - world_rank % grid_size_w,
+                world_rank - world_rank % grid_size_w + grid_size_w,
+            )
+        )
+
+    # the seed of the launcher makes all ranks draw the same numbers
+    x = paddle.randn([4])
+    xs = []
+    dist.all_gather(xs, x)
+    assert all(paddle.equal_all(x, xi).item() for xi in xs)
+
+
+def _split_tensor(tensor, hrank, wrank, grid_size_h, grid_size_w):
+    tensor = thd.split_tensor_along_dim(tensor, dim=-1, num_chunks=grid_size_w)[wrank]
+    return thd.split_tensor_along_dim(tensor, dim=-2, num_chunks=grid_size_h)[hrank]
+
+
+def _disco_convolution_worker(grid_size_h, grid_size_w, in_shape, out_shape, kernel_shape, tol):
+    hrank, wrank = thd.polar_group_rank(), thd.azimuth_group_rank()
+
+    # identical seeds produce identical weights and inputs on all ranks
+    paddle.seed(seed=333)
+    conv_local = harmonics.DiscreteContinuousConvS2(4, 6, in_shape, out_shape, kernel_shape)
+    conv_dist = thd.DistributedDiscreteContinuousConvS2(4, 6, in_shape, out_shape, kernel_shape)
+    conv_dist.weight.set_value(conv_local.weight)
+    conv_local.bias.set_value(paddle.randn(conv_local.bias.shape))
+    conv_dist.bias.set_value(conv_local.bias)
+
+    inp_full = paddle.randn([2, 4, *in_shape])
+    inp_full.stop_gradient = False
+    out_full = conv_local(inp_full)
+    ograd_full = paddle.randn(out_full.shape)
+    out_full.backward(ograd_full)
+
+    inp_local = _split_tensor(inp_full.detach(), hrank, wrank, grid_size_h, grid_size_w)
+    inp_local.stop_gradient = False
+    out_local = conv_dist(inp_local)
+    out_local.backward(_split_tensor(ograd_full, hrank, wrank, grid_size_h, grid_size_w))
+
+    out_ref = _split_tensor(out_full, hrank, wrank, grid_size_h, grid_size_w)
+    igrad_ref = _split_tensor(inp_full.grad, hrank, wrank, grid_size_h, grid_size_w)
+    assert paddle.allclose(out_local, out_ref, rtol=tol, atol=tol).item()
+    assert paddle.allclose(inp_local.grad, igrad_ref, rtol=tol, atol=tol).item()
+
+    # the weight gradients are partial sums over the ranks
+    wgrad = conv_dist.weight.grad.clone()
+    dist.all_reduce(wgrad)
+    assert paddle.allclose(wgrad, conv_local.weight.grad, rtol=tol, atol=tol).item()
+
+    # the local bases partition the output latitudes, which every rank of an azimuth group shares
+    stats = []
+    dist.all_gather_object(
+        stats,
+        (conv_dist.get_psi_shape(), conv_dist.get_basis_stats()["nnz"], conv_dist.get_flops(2)),
+    )
+    kernel_size, nrows, _ = conv_local.get_psi_shape()
+    assert all(shape[0] == kernel_size for shape, _, _ in stats)
+    assert sum(shape[1] for shape, _, _ in stats) == grid_size_w * nrows
+    assert sum(nnz for _, nnz, _ in stats) == grid_size_w * conv_local.get_basis_stats()["nnz"]
+
+    # the halo rows of the bands are counted by all ranks which contract them
+    flops_ref = conv_local.get_flops(2, contraction_order="weights_first")
+    flops = sum(flops["forward"] for _, _, flops in stats) // grid_size_w
+    assert flops >= flops_ref["forward"]
+    assert conv_dist.get_bytes(2)["forward"] > 0
+
+
+def _sht_pipeline_worker(
+    grid_size_h,
+    grid_size_w,
+    nlat,
+    nlon,
+    micro_batches,
+    vector,
+    tol,
+    *,
+    lmax=None,
+    polar_strategy="auto",
+    m_distribution="contiguous",
+    lead_shape=(2, 6),
+    wire_dtype=None,
+):
+    hrank, wrank = thd.polar_group_rank(), thd.azimuth_group_rank()
+
+    def split(tensor):
+        return _split_tensor(tensor, hrank, wrank, grid_size_h, grid_size_w)
+
+    def split_coeffs(tensor):
+        # the wavenumbers are laid out in the order of their distribution
+        m_order = getattr(sht_dist, "m_order", None) or list(range(tensor.shape[-1]))
+        return split(paddle.index_select(tensor, paddle.to_tensor(m_order), axis=-1))
+
+    def allclose(a, b):
+        if a.is_complex():
+            a, b = paddle.as_real(a), paddle.as_real(b)
+        return paddle.allclose(a, b, rtol=tol, atol=tol).item()
+
+    def close(local, full, split_full, bound):
+        if wire_dtype is None:
+            return allclose(local, split_full(full))
+        # relative to the largest magnitude of the full tensor, as some local blocks only hold degrees l < m
+        return (paddle.abs(local - split_full(full)).max() / paddle.abs(full).max()).item() <= bound
+
+    paddle.seed(seed=333)
+    if vector:
+        sht = harmonics.RealVectorSHT(nlat, nlon, lmax=lmax, grid="equiangular")
+        isht = harmonics.InverseRealVectorSHT(nlat, nlon, lmax=lmax, grid="equiangular")
+        sht_dist = thd.DistributedRealVectorSHT(
+            nlat,
+            nlon,
+            lmax=lmax,
+            grid="equiangular",
+            micro_batches=micro_batches,
+            polar_strategy=polar_strategy,
+            wire_dtype=wire_dtype,
+        )
+        isht_dist = thd.DistributedInverseRealVectorSHT(
+            nlat,
+            nlon,
+            lmax=lmax,
+            grid="equiangular",
+            micro_batches=micro_batches,
+            polar_strategy=polar_strategy,
+            wire_dtype=wire_dtype,
+        )
+        inp_full = paddle.randn(list(lead_shape) + [2, nlat, nlon])
+    else:
+        sht = harmonics.RealSHT(nlat, nlon, lmax=lmax, grid="equiangular")
+        isht = harmonics.InverseRealSHT(nlat, nlon, lmax=lmax, grid="equiangular")
+        sht_dist = thd.DistributedRealSHT(
+            nlat,
+            nlon,
+            lmax=lmax,
+            grid="equiangular",
+            micro_batches=micro_batches,
+            polar_strategy=polar_strategy,
+            m_distribution=m_distribution,
+            wire_dtype=wire_dtype,
+        )
+        isht_dist = thd.DistributedInverseRealSHT(
+            nlat,
+            nlon,
+            lmax=lmax,
+            grid="equiangular",
+            micro_batches=micro_batches,
+            polar_strategy=polar_strategy,
+            m_distribution=m_distribution,
+            wire_dtype=wire_dtype,
+        )
+        inp_full = paddle.randn(list(lead_shape) + [nlat, nlon])
+
+    # the inverse transforms are applied to random coefficients
+    coeffs_full = sht(inp_full)
+    coeffs_full = paddle.randn(coeffs_full.shape, dtype=coeffs_full.dtype)
+
+    for transform, transform_dist, inp_full, split_inp, split_out in [
+        (sht, sht_dist, inp_full, split, split_coeffs),
+        (isht, isht_dist, coeffs_full, split_coeffs, split),
+    ]:
+        # compressed payloads are rounded once per transpose, relative to the largest magnitude of a chunk
+        bound = None
+        if wire_dtype is not None:
+            num_transposes = len(
+                [stage for stage in transform_dist._get_stages() if not callable(stage)]
+            )
+            bound = tol + 2 * num_transposes * WIRE_DTYPES[wire_dtype]
+
+        inp_full.stop_gradient = False
+        out_full = transform(inp_full)
+        ograd_full = paddle.randn(out_full.shape, dtype=out_full.dtype)
+        out_full.backward(ograd_full)
+
+        inp_local = split_inp(inp_full.detach())
+        inp_local.stop_gradient = False
+        out_local = transform_dist(inp_local)
+        out_local.backward(split_out(ograd_full))
+
+        assert out_local.dtype == out_full.dtype
+        assert close(out_local, out_full, split_out, bound)
+        assert close(inp_local.grad, inp_full.grad, split_inp, bound)
+
+        # repeated transforms reuse the send workspaces of the transposes
+        num_workspaces = sum(len(free) for free in _send_workspaces._free.values())
+        transform_dist(inp_local)
+        assert sum(len(free) for free in _send_workspaces._free.values()) == num_workspaces
+
+        # without autograd, the intermediate results are received into pooled buffers, which a repeated transform
+        # reuses without affecting the result of the previous one
+        with paddle.no_grad():
+            out_first = transform_dist(inp_local)
+            num_workspaces = sum(len(free) for free in _recv_workspaces._free.values())
+            out_second = transform_dist(2 * inp_local)
+        assert sum(len(free) for free in _recv_workspaces._free.values()) == num_workspaces
+        assert close(out_first, out_full, split_out, bound)
+        assert close(out_second, 2 * out_full, split_out, bound)
+
+
+class TestDistributedProcessGrid(unittest.TestCase):
+    """
+    Sets up process grids with the local launcher
+    """
+
+    @parameterized.expand(_spawn_cases([[2, 2]], [[3, 1], [1, 2]]))
+    def test_process_grid(self, grid_size_h, grid_size_w):
+        thd.spawn(
+            _process_grid_worker,
+            grid_size_h,
+            grid_size_w,
+            args=(grid_size_h, grid_size_w),
+            seed=333,
+        )
+
+
+class TestDistributedTransformPipeline(unittest.TestCase):
+    """
+    Runs the distributed SHT with the channels split into micro-batches
+    """
+
+    def test_workspace_pool(self):
+        pool = _WorkspacePool(max_keys=2)
+        workspaces = {key: pool.acquire(key, 4, "float32") for key in ["a", "b", "c"]}
+        pool.release("a", workspaces["a"])
+        pool.release("b", workspaces["b"])
+
+        # released workspaces are reused, the least recently used key is dropped once there are too many
+        self.assertIs(pool.acquire("a", 4, "float32"), workspaces["a"])
+        pool.release("a", workspaces["a"])
+        pool.release("c", workspaces["c"])
+        self.assertEqual(list(pool._free.keys()), ["a", "c"])
+        self.assertIsNot(pool.acquire("b", 4, "float32"), workspaces["b"])
+
+    @parameterized.expand(
+        _spawn_cases(
+            [[2, 2, 12, 24, 3, False, 1e-4]],
+            [
+                [2, 2, 12, 24, 2, True, 1e-4],
+                [1, 3, 12, 24, 6, False, 1e-4],
+            ],
+        )
+    )
+    def test_distributed_sht_pipeline(
+        self, grid_size_h, grid_size_w, nlat, nlon, micro_batches, vector, tol
+    ):
+        thd.spawn(
+            _sht_pipeline_worker,
+            grid_size_h,
+            grid_size_w,
+            args=(grid_size_h, grid_size_w, nlat, nlon, micro_batches, vector, tol),
+        )
+
+
+class TestDistributedTransformPolarStrategy(unittest.TestCase):
+    """
+    Runs the distributed SHT with the Legendre contraction over the local latitudes
+    """
+
+    def test_polar_strategy_cost_model(self):
+        # the local contraction pays off once the spectrum is small compared with the grid
+        self.assertEqual(_get_polar_strategy("auto", 721, 720, 4), "transpose")
+        self.assertEqual(_get_polar_strategy("auto", 721, 60, 4), "local")
+        self.assertEqual(_get_polar_strategy("auto", 721, 60, 1), "transpose")
+        self.assertEqual(_get_polar_strategy("local", 721, 720, 4), "local")
+        with self.assertRaises(ValueError):
+            _get_polar_strategy("scatter", 721, 720, 4)
+
+    @parameterized.expand(
+        _spawn_cases(
+            [[2, 1, 12, 24, 1, True, None, "local", 1e-4]],
+            [
+                [2, 2, 12, 24, 1, False, 4, "auto", 1e-4],
+                [3, 1, 12, 24, 2, False, 5, "local", 1e-4],
+            ],
+        )
+    )
+    def test_distributed_sht_polar_strategy(
+        self, grid_size_h, grid_size_w, nlat, nlon, micro_batches, vector, lmax, polar_strategy, tol
+    ):
+        thd.spawn(
+            functools.partial(_sht_pipeline_worker, lmax=lmax, polar_strategy=polar_strategy),
+            grid_size_h,
+            grid_size_w,
+            args=(grid_size_h, grid_size_w, nlat, nlon, micro_batches, vector, tol),
+        )
+
+
+class TestDistributedTransformMDistribution(unittest.TestCase):
+    """
+    Runs the distributed SHT with the wavenumbers dealt out in a zig-zag order
+    """
+
+    @parameterized.expand([[13, 13, 4], [25, 25, 3], [24, 13, 4], [64, 33, 8], [8, 8, 1]])
+    def test_m_order(self, lmax, mmax, comm_size):
+        m_shapes = thd.compute_split_shapes(mmax, comm_size)
+        m_offsets = [sum(m_shapes[:r]) for r in range(comm_size + 1)]
+        m_order = _get_m_order(mmax, comm_size, "zigzag")
+        self.assertEqual(sorted(m_order), list(range(mmax)))
+
+        # the contraction for wavenumber m covers the lmax - m degrees l >= m
+        def work(order):
+            return [
+                sum(max(lmax - m, 0) for m in order[m_offsets[r] : m_offsets[r + 1]])
+                for r in range(comm_size)
+            ]
+
+        work_zigzag = work(m_order)
+        work_contiguous = work(list(range(mmax)))
+        mean_work = sum(work_zigzag) / comm_size
+
+        # no rank exceeds the mean by more than the work of a single wavenumber
+        self.assertLessEqual(max(work_zigzag), mean_work + lmax)
+        if comm_size > 1:
+            self.assertLess(max(work_zigzag), max(work_contiguous))
+
+    @parameterized.expand(
+        _spawn_cases(
+            [[2, 2, 16, 32, 1, 12, "transpose", 1e-4]],
+            [
+                [1, 2, 12, 24, 1, None, "transpose", 1e-4],
+                [2, 3, 12, 24, 2, 8, "local", 1e-4],
+            ],
+        )
+    )
+    def test_distributed_sht_m_distribution(
+        self, grid_size_h, grid_size_w, nlat, nlon, micro_batches, lmax, polar_strategy, tol
+    ):
+        # the forward and inverse transforms and their gradients are compared with the serial transforms
+        thd.spawn(
+            functools.partial(
+                _sht_pipeline_worker,
+                lmax=lmax,
+                polar_strategy=polar_strategy,
+                m_distribution="zigzag",
+            ),
+            grid_size_h,
+            grid_size_w,
+            args=(grid_size_h, grid_size_w, nlat, nlon, micro_batches, False, tol),
+        )
+
+
+class TestDistributedTransformLeadingDims(unittest.TestCase):
+    """
+    Runs the distributed SHT on inputs with an arbitrary number of leading dimensions, which are not necessarily
+    divisible by the number of ranks
+    """
+
+    @parameterized.expand(
+        _spawn_cases(
+            [[1, 2, 12, 24, 2, False, [2, 2, 3], 1e-4]],
+            [
+                [2, 2, 12, 24, 1, False, [3], 1e-4],
+                [2, 1, 12, 24, 1, True, [1], 1e-4],
+                [2, 2, 12, 24, 1, False, [], 1e-4],
+            ],
+        )
+    )
+    def test_distributed_sht_leading_dims(
+        self, grid_size_h, grid_size_w, nlat, nlon, micro_batches, vector, lead_shape, tol
+    ):
+        thd.spawn(
+            functools.partial(_sht_pipeline_worker, lead_shape=lead_shape),
+            grid_size_h,
+            grid_size_w,
+            args=(grid_size_h, grid_size_w, nlat, nlon, micro_batches, vector, tol),
+        )
+
+
+class TestDistributedTransformWireDtype(unittest.TestCase):
+    """
+    Compares the distributed SHT with compressed transpose payloads against the serial SHT
+    """
+
+    @parameterized.expand(
+        _spawn_cases(
+            [["int8", 2, True]],
+            [
+                ["float16", 1, False],
+                ["bfloat16", 2, False],
+                ["int8", 1, False],
+                ["bfloat16", 1, True],
+            ],
+        )
+    )
+    def test_distributed_sht_wire_dtype(self, wire_dtype, micro_batches, vector):
+        thd.spawn(
+            functools.partial(_sht_pipeline_worker, wire_dtype=wire_dtype),
+            2,
+            2,
+            args=(2, 2, 12, 24, micro_batches, vector, 1e-4),
+        )
+
+    @parameterized.expand([[wire_dtype] for wire_dtype in WIRE_DTYPES.keys()])
+    def test_wire_round_trip(self, wire_dtype):
+        paddle.seed(seed=333)
+        chunks = [paddle.randn([3, 5, 2]), 100.0 * paddle.randn([4, 2]), paddle.zeros([6])]
+
+        encoded, scales = zip(*[_encode_wire(chunk, wire_dtype) for chunk in chunks])
+        if wire_dtype == "int8":
+            scales = paddle.stack(scales)
+        else:
+            self.assertTrue(all(scale is None for scale in scales))
+            scales = None
+
+        split_sizes = [chunk.numel().item() for chunk in chunks]
+        x_wire = paddle.concat([x.flatten() for x in encoded])
+        self.assertEqual(x_wire.dtype, paddle.to_tensor([], dtype=wire_dtype).dtype)
+        x_out = paddle.empty([sum(split_sizes)], dtype="float32")
+        _decode_wire(x_wire, x_out, split_sizes, scales)
+
+        # the error is bounded relative to the largest magnitude of every chunk
+        decoded = paddle.split(x_out, split_sizes)
+        for chunk, out in zip(chunks, decoded):
+            bound = WIRE_DTYPES[wire_dtype] * paddle.abs(chunk).max().item()
+            self.assertLessEqual(paddle.abs(out - chunk.flatten()).max().item(), bound)
+
+
+def _spectral_worker(grid_size_h, grid_size_w, nlat, nlon, micro_batches, polar_strategy, tol):
+    hrank, wrank = thd.polar_group_rank(), thd.azimuth_group_rank()
+
+    def split(tensor):
+        return _split_tensor(tensor, hrank, wrank, grid_size_h, grid_size_w)
+
+    def allclose(a, b):
+        if a.is_complex():
+            a, b = paddle.as_real(a), paddle.as_real(b)
+        return paddle.allclose(a, b, rtol=tol, atol=tol).item()
+
+    paddle.seed(seed=333)
+    sht = harmonics.RealSHT(nlat, nlon, grid="equiangular")
+    isht = harmonics.InverseRealSHT(nlat, nlon, grid="equiangular")
+    sht_dist = thd.DistributedRealSHT(
+        nlat, nlon, grid="equiangular", micro_batches=micro_batches, polar_strategy=polar_strategy
+    )
+    isht_dist = thd.DistributedInverseRealSHT(
+        nlat, nlon, grid="equiangular", micro_batches=micro_batches, polar_strategy=polar_strategy
+    )
+    spectral_filter = paddle.randn([sht.lmax, sht.mmax])
+    filter_dist = thd.DistributedSpectralFilterS2(sht_dist, isht_dist, spectral_filter)
+    dhconv_dist = thd.DistributedDriscollHealyContraction(sht_dist, 3, 4)
+    inp_full = paddle.randn([2, 3, nlat, nlon])
+
+    # filter between the transforms
+    inp_full.stop_gradient = False
+    out_full = isht(sht(inp_full) * spectral_filter.astype("complex64"))
+    ograd_full = paddle.randn(out_full.shape, dtype=out_full.dtype)
+    out_full.backward(ograd_full)
+
+    inp_local = split(inp_full.detach())
+    inp_local.stop_gradient = False
+    out_local = filter_dist(inp_local)
+    out_local.backward(split(ograd_full))
+
+    assert allclose(out_local, split(out_full))
+    assert allclose(inp_local.grad, split(inp_full.grad))
+
+    # pointwise ops and the Driscoll-Healy contraction in the decomposition of the forward transform
+    coeffs_full = sht(inp_full.detach())
+    coeffs_local = sht_dist(split(inp_full.detach()))
+    multiply_dist = thd.DistributedSpectralMultiply(sht_dist, spectral_filter)
+    assert allclose(
+        multiply_dist(coeffs_local), split(coeffs_full * spectral_filter.astype("complex64"))
+    )
+    out_full = paddle.einsum("bixy,kix->bkxy", coeffs_full, paddle.as_complex(dhconv_dist.weight))
+    assert allclose(dhconv_dist(coeffs_local), split(out_full))
+
+
+class TestDistributedSpectralOperators(unittest.TestCase):
+    """
+    Runs the distributed spectral operators
+    """
+
+    @parameterized.expand(
+        _spawn_cases(
+            [[2, 2, 12, 24, 1, "transpose", 1e-4]],
+            [
+                [3, 1, 12, 24, 2, "transpose", 1e-4],
+                [2, 1, 12, 24, 1, "local", 1e-4],
+            ],
+        )
+    )
+    def test_distributed_spectral_operators(
+        self, grid_size_h, grid_size_w, nlat, nlon, micro_batches, polar_strategy, tol
+    ):
+        thd.spawn(
+            _spectral_worker,
+            grid_size_h,
+            grid_size_w,
+            args=(grid_size_h, grid_size_w, nlat, nlon, micro_batches, polar_strategy, tol),
+        )
+
+
+class TestDistributedDiscreteContinuousConvolution(unittest.TestCase):
+    """
+    Runs the distributed DISCO convolution
+    """
+
+    @parameterized.expand(
+        _spawn_cases(
+            [[2, 2, (16, 32), (12, 24), [3], 1e-5]],
+            [
+                [2, 1, (16, 32), (8, 16), [3], 1e-5],
+                [3, 1, (24, 48), (24, 48), [2, 2], 1e-5],
+            ],
+        )
+    )
+    def test_distributed_disco_convolution(
+        self, grid_size_h, grid_size_w, in_shape, out_shape, kernel_shape, tol
+    ):
+        thd.spawn(
+            _disco_convolution_worker,
+            grid_size_h,
+            grid_size_w,
+            args=(grid_size_h, grid_size_w, in_shape, out_shape, kernel_shape, tol),
+        )
+
+
+def _comm_profiler_worker(grid_size_h, grid_size_w, trace_path):
+    hrank, wrank = thd.polar_group_rank(), thd.azimuth_group_rank()
+    profiler = thd.comm_profiler
+
+    def split(tensor):
+        return _split_tensor(tensor, hrank, wrank, grid_size_h, grid_size_w)
+
+    paddle.seed(seed=333)
+    nlat, nlon = 12, 24
+    sht = thd.DistributedRealSHT(nlat, nlon, grid="equiangular", polar_strategy="local")
+    isht = thd.DistributedInverseRealSHT(nlat, nlon, grid="equiangular", polar_strategy="transpose")
+    conv = thd.DistributedDiscreteContinuousConvS2(4, 4, (nlat, nlon), (nlat, nlon), [3])
+    inp = split(paddle.randn([2, 4, nlat, nlon]))
+    inp.stop_gradient = False
+
+    # nothing is recorded while the profiler is disabled
+    isht(sht(conv(inp)))
+    assert profiler.records == []
+
+    profiler.enable()
+    out = isht(sht(conv(inp)))
+    out.backward(paddle.ones_like(out))
+    profiler.disable()
+
+    summary = profiler.summary()
+    expected = {
+        ("DistributedDiscreteContinuousConvS2", "halo_exchange"),
+        ("DistributedDiscreteContinuousConvS2", "halo_reduce"),
+        ("DistributedDiscreteContinuousConvS2", "transpose"),
+        ("DistributedRealSHT", "transpose"),
+        ("DistributedRealSHT", "reduce_scatter"),
+        ("DistributedRealSHT", "all_gather"),
+        ("DistributedInverseRealSHT", "transpose"),
+    }
+    assert set(summary.keys()) == expected, summary.keys()
+    assert any(record["backward"] for record in profiler.records)
+    assert all(record["time"] >= 0 for record in profiler.records)
+
+    # all bytes sent within the group are received
+    summaries = []
+    dist.all_gather_object(summaries, summary)
+    for key in expected:
+        bytes_sent = sum(summary[key]["bytes_sent"] for summary in summaries)
+        bytes_recv = sum(summary[key]["bytes_recv"] for summary in summaries)
+        assert bytes_sent == bytes_recv > 0, key
+        assert sum(summary[key]["messages"] for summary in summaries) > 0, key
+
+    imbalance = profiler.get_imbalance()
+    assert set(imbalance.keys()) == expected
+    assert all(entry["imbalance"] >= 1.0 for entry in imbalance.values())
+
+    profiler.export_chrome_trace(trace_path)
+    if dist.get_rank() == 0:
+        with open(trace_path) as f:
+            events = json.load(f)["traceEvents"]
+        assert len(events) == sum(sum(s[key]["calls"] for key in s) for s in summaries)
+        assert {event["pid"] for event in events} == set(range(grid_size_h * grid_size_w))
+
+    profiler.reset()
+    assert profiler.records == []
+
+
+class TestDistributedCommProfiler(unittest.TestCase):
+    """
+    Profiles the communication of the distributed layers
+    """
+
+    def test_comm_profiler(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            thd.spawn(_comm_profiler_worker, 2, 2, args=(2, 2, os.path.join(tmpdir, "trace.json")))
+
+
 if __name__ == "__main__":
     unittest.main()
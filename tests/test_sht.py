@@ -79,6 +79,27 @@ class TestLegendrePolynomials(unittest.TestCase):
                 diff = vdm[m, l] / self.cml(m, l) - self.pml[(m, l)](t)
                 self.assertTrue(diff.max() <= self.tol)
 
+    def test_legendre_orders(self):
+        from paddle_harmonics.legendre import _precompute_dlegpoly
+        from paddle_harmonics.legendre import _precompute_legpoly
+
+        # the orders are computed independently, such that a subset matches the slices of the full tensors
+        t = np.linspace(0.1, 3.0, 17)
+        m_index = [7, 0, 3, 12]
+        for norm in ["ortho", "schmidt"]:
+            pct = _precompute_legpoly(13, 11, t, norm=norm)
+            dpct = _precompute_dlegpoly(13, 11, t, norm=norm)
+            self.assertTrue(
+                np.array_equal(
+                    _precompute_legpoly(13, 11, t, norm=norm, m_index=m_index), pct[m_index]
+                )
+            )
+            self.assertTrue(
+                np.array_equal(
+                    _precompute_dlegpoly(13, 11, t, norm=norm, m_index=m_index), dpct[:, m_index]
+                )
+            )
+
 
 class TestSphericalHarmonicTransform(unittest.TestCase):
     def setUp(self):